@@ -0,0 +1,299 @@
+# headless batch chart renderer
+# run with: python batch_render.py jobs.json [--workers N] [--blender path] [--output dir]
+# starts N `blender -b` workers that take jobs from one shared queue, renders every chart to
+# <output>/<name>.png and writes a per-job timing report to <output>/report.json
+#
+# jobs.json is a list of jobs:
+#   {"name": "sales_line", "dataset": "sample.csv", "chart": "line", "columns": [2, 1],
+#    "kwargs": {"point_budget": 500}, "frame": 120, "resolution": [1280, 720], "blend": false}
+# chart is one of line, bar, scatter, scatter_bar, histogram, pie; columns and kwargs are passed
+# to the matching DatasetHelper.create_* method the same way the panel operators pass them. A
+# histogram job with one column counts that column, with two it counts over both; a pie job
+# takes the names column, then the sizes column
+
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# the worker prints one line starting with this for every finished job
+RESULT_PREFIX = "BATCH_RESULT "
+
+# chart type -> (DatasetHelper method, arguments after the two columns and keyword arguments,
+# both as the panel operators pass them)
+CHARTS = {
+    'line': ('create_line_graph', ["$", 2, 20, 1, 2], {}),
+    'bar': ('create_bar_graph', ["", 2, 20, 1, 2], {}),
+    'scatter_bar': ('create_scatter_bar_graph', [2, 20], {}),
+    # instanced like the panel, large files switch to the density mode
+    'scatter': ('create_scatter_graph', [2, 20], {'instanced': True}),
+    'histogram': ('create_histogram', [], {'bins': 20}),
+    'pie': ('create_pie_chart', [], {'inner_radius': 0.0, 'explode': 0.3}),
+}
+
+
+########################################
+######### WORKER (inside blender) ######
+########################################
+
+def frame_scene(scene, resolution):
+    # sun light and a camera looking down at the bounding sphere of everything in the scene
+    import bpy
+    import math
+    from mathutils import Vector
+
+    bpy.context.view_layer.update()
+    corners = [ob.matrix_world @ Vector(corner) for ob in scene.objects for corner in ob.bound_box]
+    if corners:
+        low = Vector([min(c[i] for c in corners) for i in range(3)])
+        high = Vector([max(c[i] for c in corners) for i in range(3)])
+    else:
+        low, high = Vector((-1, -1, -1)), Vector((1, 1, 1))
+    center = (low + high) / 2
+    radius = max((high - low).length / 2, 1.0)
+
+    camera_data = bpy.data.cameras.new("batch_camera")
+    camera = bpy.data.objects.new("batch_camera", camera_data)
+    scene.collection.objects.link(camera)
+    distance = radius / math.tan(camera_data.angle / 2) * 1.1
+    camera.location = center + Vector((0.0, -1.0, 0.6)).normalized() * distance
+    camera.rotation_euler = (center - camera.location).to_track_quat('-Z', 'Y').to_euler()
+    camera_data.clip_end = distance + radius * 2
+    scene.camera = camera
+
+    light_data = bpy.data.lights.new("batch_sun", type='SUN')
+    light = bpy.data.objects.new("batch_sun", light_data)
+    light.rotation_euler = (math.radians(45), 0, math.radians(30))
+    scene.collection.objects.link(light)
+
+    scene.render.resolution_x, scene.render.resolution_y = resolution
+    scene.render.resolution_percentage = 100
+
+
+def run_job(myplugin, job, output, threads, engine, samples):
+    # build and render one job in a fresh scene, returns the phase timings
+    import bpy
+
+    timings = {}
+    start = time.perf_counter()
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    scene = bpy.context.scene
+    timings['reset'] = time.perf_counter() - start
+
+    method, defaults, default_kwargs = CHARTS[job['chart']]
+    start = time.perf_counter()
+    dataset = myplugin.get_dataset(job['dataset'])
+    timings['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    args = list(job.get('columns', [1, 2])) + list(job.get('args', defaults))
+    kwargs = dict(default_kwargs, **job.get('kwargs', {}))
+    getattr(dataset, method)(*args, **kwargs)
+    timings['build'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scene.frame_set(job.get('frame', scene.frame_end))
+    frame_scene(scene, job.get('resolution', (1280, 720)))
+    scene.render.engine = engine
+    if engine == 'CYCLES':
+        scene.cycles.samples = samples
+    # every worker gets its share of the cores instead of all of them
+    scene.render.threads_mode = 'FIXED'
+    scene.render.threads = threads
+    scene.render.filepath = os.path.join(output, job['name'] + ".png")
+    bpy.ops.render.render(write_still=True)
+    timings['render'] = time.perf_counter() - start
+
+    if job.get('blend'):
+        start = time.perf_counter()
+        bpy.ops.wm.save_as_mainfile(filepath=os.path.join(output, job['name'] + ".blend"), copy=True)
+        timings['save'] = time.perf_counter() - start
+
+    return {'objects': len(bpy.data.objects), 'timings': timings}
+
+
+def run_worker(argv):
+    # serve jobs from stdin, one JSON object per line, until stdin closes
+    parser = argparse.ArgumentParser(prog="batch_render.py --worker")
+    parser.add_argument("--worker", action="store_true")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--engine", default='CYCLES')
+    parser.add_argument("--samples", type=int, default=32)
+    options = parser.parse_args(argv)
+
+    sys.path.append(HERE)
+    import myplugin
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        start = time.perf_counter()
+        result = {'name': job['name'], 'status': 'ok'}
+        try:
+            result.update(run_job(myplugin, job, options.output, options.threads, options.engine, options.samples))
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['worker_seconds'] = time.perf_counter() - start
+        print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+########################################
+######### DISPATCHER ###################
+########################################
+
+class Worker:
+    ## One `blender -b` process fed jobs over stdin, restarted if it dies mid-job
+
+    def __init__(self, index, options, threads):
+        self.index = index
+        self.options = options
+        self.threads = threads
+        self.process = None
+        self.log = open(os.path.join(options.output, f"worker_{index}.log"), "a")
+
+    def start(self):
+        command = [self.options.blender, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--",
+                   "--worker", "--output", os.path.abspath(self.options.output), "--threads", str(self.threads),
+                   "--engine", self.options.engine, "--samples", str(self.options.samples)]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.STDOUT, text=True, bufsize=1)
+
+    def run(self, job):
+        # send one job and wait for its result line, blender's own output goes to the log
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+        except OSError:
+            pass
+        for line in self.process.stdout:
+            if line.startswith(RESULT_PREFIX):
+                return json.loads(line[len(RESULT_PREFIX):])
+            self.log.write(line)
+        # stdout closed before a result: blender crashed on this job
+        self.process.wait()
+        self.log.flush()
+        return {'name': job['name'], 'status': 'crashed', 'error': f"blender exited with code {self.process.returncode}"}
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.close()
+            for line in self.process.stdout:
+                self.log.write(line)
+            self.process.wait()
+        self.log.close()
+
+
+def serve(worker, jobs, results, lock):
+    # take jobs off the shared queue until it is empty
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except queue.Empty:
+            break
+        start = time.perf_counter()
+        result = worker.run(job)
+        result['chart'] = job['chart']
+        result['dataset'] = job['dataset']
+        result['worker'] = worker.index
+        result['seconds'] = time.perf_counter() - start
+        with lock:
+            results.append(result)
+            print(f"[{len(results)}] {result['name']:<30} {result['status']:<8} {result['seconds']:.2f} s (worker {worker.index})")
+    worker.stop()
+
+
+def load_jobs(path):
+    with open(path) as f:
+        jobs = json.load(f)
+    for i, job in enumerate(jobs):
+        if job.get('chart') not in CHARTS:
+            raise ValueError(f"Job {i}: unknown chart type {job.get('chart')!r}, expected one of {', '.join(CHARTS)}")
+        if 'dataset' not in job:
+            raise ValueError(f"Job {i}: missing dataset")
+        job.setdefault('name', f"{i:04d}_{job['chart']}")
+        # workers run from another directory, relative paths are relative to where we were started
+        job['dataset'] = os.path.abspath(job['dataset'])
+    return jobs
+
+
+def warm_sidecars(jobs):
+    # build the sidecar of every dataset once before the workers start, so they all map the
+    # same finished columns instead of each parsing the file; workers that still find a
+    # column missing wait for each other on the sidecar lock
+    try:
+        import sidecar
+    except ImportError as e:
+        print("Sidecar warm-up skipped:", e)
+        return
+    for path in sorted(set(job['dataset'] for job in jobs)):
+        start = time.perf_counter()
+        try:
+            sidecar.ensure(path)
+        except (OSError, ValueError) as e:
+            print("Sidecar warm-up failed for", path, e)
+            continue
+        print(f"Sidecar ready for {path} in {time.perf_counter() - start:.1f} s")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Render a list of chart jobs with a pool of headless Blender workers")
+    parser.add_argument("jobs", help="JSON file with the job list")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--blender", default="blender", help="Blender executable")
+    parser.add_argument("--output", default="renders")
+    parser.add_argument("--engine", default='CYCLES', help="render engine, CYCLES renders on the CPU without a display")
+    parser.add_argument("--samples", type=int, default=32)
+    options = parser.parse_args(argv)
+
+    jobs = load_jobs(options.jobs)
+    os.makedirs(options.output, exist_ok=True)
+    warm_sidecars(jobs)
+    shared = queue.Queue()
+    for job in jobs:
+        shared.put(job)
+
+    count = max(1, min(options.workers, len(jobs)))
+    threads = max(1, (os.cpu_count() or 1) // count)
+    results = []
+    lock = threading.Lock()
+    start = time.perf_counter()
+    pool = [threading.Thread(target=serve, args=(Worker(i, options, threads), shared, results, lock)) for i in range(count)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    busy = sum(result['seconds'] for result in results)
+    report = {
+        'workers': count,
+        'jobs': len(results),
+        'failed': sum(result['status'] != 'ok' for result in results),
+        'wall_seconds': wall,
+        'job_seconds': busy,
+        'parallel_speedup': busy / wall if wall > 0 else None,
+        'results': sorted(results, key=lambda result: result['name']),
+    }
+    report_path = os.path.join(options.output, "report.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"{report['jobs']} jobs ({report['failed']} failed) on {count} workers in {wall:.1f} s, report: {report_path}")
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    if "--worker" in sys.argv:
+        run_worker(sys.argv[sys.argv.index("--") + 1:])
+    else:
+        sys.exit(main(sys.argv[1:]))
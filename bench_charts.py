@@ -0,0 +1,263 @@
+# chart builder benchmark
+# run with: blender -b --python bench_charts.py -- [--cases line bar ...] [--sizes 10 1000 ...]
+#                                                  [--output bench.json] [--baseline old.json]
+# every (case, rows) pair runs in its own `blender -b` process on a synthetic dataset so the
+# peak RSS belongs to that run only. Wall time, peak RSS, datablock counts and the saved .blend
+# size go to --output; with --baseline the results are compared and slowdowns are flagged
+# the startup case times importing and registering the add-on in a fresh blender and fails the
+# run when it takes longer than --startup-budget or imports a heavy library
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# the child prints one line starting with this with its measurement
+RESULT_PREFIX = "BENCH_RESULT "
+
+DEFAULT_SIZES = [10, 1000, 100000, 1000000]
+
+# registering the add-on may take at most this long
+STARTUP_BUDGET_SECONDS = 0.1
+
+# libraries registration must not import, they load on the first data operation
+HEAVY_MODULES = ['numpy', 'pandas', 'openpyxl', 'sqlalchemy']
+
+# cases that create one object (or one pie slice) per row are capped, above this they are skipped
+MAX_ROWS = {
+    'scatter_objects': 10000,
+    'bar': 100000,
+    'pie': 100000,
+}
+
+########################################
+######### CASES (inside blender) #######
+########################################
+
+def dataset_path(rows):
+    # synthetic csv: label, value (positive, for the bar log scale), x, y
+    folder = os.path.join(tempfile.gettempdir(), "chart_bench")
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"rows_{rows}.csv")
+    if not os.path.exists(path):
+        import numpy as np
+        import pandas as pd
+        rng = np.random.default_rng(rows)
+        pd.DataFrame({
+            'label': [f"r{i}" for i in range(rows)],
+            'value': rng.lognormal(3.0, 1.0, rows),
+            'x': rng.normal(0.0, 1.0, rows),
+            'y': rng.normal(0.0, 1.0, rows),
+        }).to_csv(path, index=False)
+    return path
+
+
+def run_case(case, rows):
+    # build one chart, columns are passed the way the panel operators pass them
+    import myplugin
+
+    path = dataset_path(rows)
+    if case in ('line', 'bar', 'scatter', 'scatter_objects', 'scatter_bar', 'histogram', 'pie'):
+        # measure a cold load, not the columnar cache of an earlier run
+        myplugin.sidecar.clear(path)
+        dataset = myplugin.DatasetHelper(path)
+    if case == 'line':
+        dataset.create_line_graph(2, 1, "$", 2, 20, 1, 2)
+    elif case == 'bar':
+        dataset.create_bar_graph(0, 1, "", 2, 20, 1, 2)
+    elif case == 'scatter':
+        dataset.create_scatter_graph(3, 4, 2, 20, instanced=True)
+    elif case == 'scatter_objects':
+        dataset.create_scatter_graph(3, 4, 2, 20, instanced=False)
+    elif case == 'scatter_bar':
+        dataset.create_scatter_bar_graph(3, 4, 2, 20)
+    elif case == 'pie':
+        dataset.create_pie_chart(1, 2)
+    elif case == 'histogram':
+        dataset.create_histogram(3, 4)
+    else:
+        raise ValueError(f"Unknown case: {case}")
+
+
+CASES = ['startup', 'line', 'bar', 'scatter', 'scatter_objects', 'scatter_bar', 'pie', 'histogram']
+
+
+def peak_rss_mb():
+    # peak resident set size of this process, None where the resource module is missing (Windows)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def module_loaded(name):
+    # True once the code of a module has run; myplugin.lazy_import leaves unloaded placeholders
+    # in sys.modules, they turn into plain modules on their first attribute access
+    module = sys.modules.get(name)
+    return module is not None and type(module).__name__ != '_LazyModule'
+
+
+def measure_startup():
+    # import and register the add-on, noting the heavy libraries that came with it
+    before = set(sys.modules)
+    start = time.perf_counter()
+    sys.path.append(HERE)
+    import myplugin
+    myplugin.register()
+    seconds = time.perf_counter() - start
+    loaded = [name for name in HEAVY_MODULES if module_loaded(name) and name not in before]
+    myplugin.unregister()
+    return {'case': 'startup', 'rows': 0, 'register_seconds': seconds, 'wall_seconds': seconds, 'heavy_modules': loaded,
+            'peak_rss_mb': peak_rss_mb(), 'status': 'ok'}
+
+
+def measure(case, rows):
+    import bpy
+
+    if case == 'startup':
+        return measure_startup()
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    sys.path.append(HERE)
+    dataset_path(rows)
+    result = {'case': case, 'rows': rows, 'startup_rss_mb': peak_rss_mb()}
+
+    start = time.perf_counter()
+    run_case(case, rows)
+    result['build_seconds'] = time.perf_counter() - start
+
+    # geometry nodes work happens on evaluation, measure it separately
+    start = time.perf_counter()
+    scene = bpy.context.scene
+    scene.frame_set(scene.frame_end)
+    bpy.context.evaluated_depsgraph_get()
+    result['eval_seconds'] = time.perf_counter() - start
+    result['wall_seconds'] = result['build_seconds'] + result['eval_seconds']
+
+    result['objects'] = len(bpy.data.objects)
+    result['meshes'] = len(bpy.data.meshes)
+    result['materials'] = len(bpy.data.materials)
+    result['node_groups'] = len(bpy.data.node_groups)
+
+    blend = os.path.join(tempfile.gettempdir(), "chart_bench", f"{case}_{rows}.blend")
+    bpy.ops.wm.save_as_mainfile(filepath=blend, copy=True)
+    result['blend_bytes'] = os.path.getsize(blend)
+    os.remove(blend)
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    result['status'] = 'ok'
+    return result
+
+
+########################################
+######### DRIVER #######################
+########################################
+
+def run_child(case, rows, timeout):
+    # one fresh blender per measurement
+    import bpy
+
+    command = [bpy.app.binary_path, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--", "--run", case, str(rows)]
+    try:
+        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'case': case, 'rows': rows, 'status': 'timeout'}
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    tail = process.stdout.strip().splitlines()[-5:]
+    return {'case': case, 'rows': rows, 'status': 'failed', 'error': "\n".join(tail)}
+
+
+def compare(results, baseline, tolerance):
+    # (case, rows) pairs whose wall time or peak RSS grew by more than tolerance
+    old = {(entry['case'], entry['rows']): entry for entry in baseline['results'] if entry.get('status') == 'ok'}
+    regressions = []
+    for entry in results:
+        previous = old.get((entry['case'], entry['rows']))
+        if previous is None or entry.get('status') != 'ok':
+            continue
+        for key in ('wall_seconds', 'peak_rss_mb', 'objects', 'materials'):
+            before, after = previous.get(key), entry.get(key)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + tolerance) and after - before > 1e-3:
+                regressions.append((entry['case'], entry['rows'], key, before, after))
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="blender -b --python bench_charts.py --", description="Benchmark the chart builders")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--baseline", help="earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed growth before a result is flagged, 0.2 = 20%%")
+    parser.add_argument("--timeout", type=float, default=1800)
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_SECONDS, help="seconds registering the add-on may take")
+    options = parser.parse_args(argv)
+
+    import bpy
+
+    results = []
+    over_budget = False
+    if 'startup' in options.cases:
+        result = run_child('startup', 0, options.timeout)
+        results.append(result)
+        if result['status'] == 'ok':
+            print(f"{'startup':<16} register {result['register_seconds'] * 1000:8.1f} ms (budget {options.startup_budget * 1000:.0f} ms)  "
+                  f"heavy imports: {', '.join(result['heavy_modules']) or 'none'}")
+            over_budget = result['register_seconds'] > options.startup_budget or bool(result['heavy_modules'])
+        else:
+            print(f"{'startup':<16} {result['status']}")
+            over_budget = True
+        if over_budget:
+            print("STARTUP OVER BUDGET")
+
+    for case in options.cases:
+        if case == 'startup':
+            continue
+        for rows in options.sizes:
+            if rows > MAX_ROWS.get(case, rows):
+                results.append({'case': case, 'rows': rows, 'status': 'skipped'})
+                continue
+            result = run_child(case, rows, options.timeout)
+            results.append(result)
+            if result['status'] == 'ok':
+                print(f"{case:<16} {rows:>9,} rows {result['wall_seconds']:8.3f} s  "
+                      f"peak {result['peak_rss_mb'] or 0:8.1f} MB  {result['objects']:>7} objects  "
+                      f"{result['materials']:>5} materials  {result['blend_bytes'] / 1e6:8.2f} MB .blend")
+            else:
+                print(f"{case:<16} {rows:>9,} rows {result['status']}")
+
+    report = {'blender': bpy.app.version_string, 'created': time.strftime("%Y-%m-%d %H:%M:%S"), 'results': results}
+    with open(options.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("Results written to", options.output)
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, options.tolerance)
+        for case, rows, key, before, after in regressions:
+            growth = f" ({after / before - 1:+.0%})" if before else ""
+            print(f"SLOWER {case:<16} {rows:>9,} rows {key}: {before:.3f} -> {after:.3f}{growth}")
+        if regressions:
+            return 1
+        print("No regressions against", options.baseline)
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if argv[:1] == ["--run"]:
+        print(RESULT_PREFIX + json.dumps(measure(argv[1], int(argv[2]))), flush=True)
+    else:
+        sys.exit(main(argv))
@@ -0,0 +1,60 @@
+# keyframe writer benchmark
+# run with: blender -b --python bench_keyframes.py -- [objects]
+# compares keyframe_insert per key against keyframes.animate_many on the caption scale-in animation
+
+import bpy
+import os
+import sys
+import time
+import numpy as np
+
+# helper modules live next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import keyframes
+
+argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+object_count = int(argv[0]) if argv else 10000
+
+FRAMES = [1, 2, 12]
+SCALES = [(0, 0, 0), (0, 0.5, 0.5), (0.5, 0.5, 0.5)]
+
+
+def make_objects(count):
+    # empties keep the benchmark about animation, not mesh creation
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    objects = []
+    for i in range(count):
+        ob = bpy.data.objects.new(f"bench_{i}", None)
+        bpy.context.scene.collection.objects.link(ob)
+        objects.append(ob)
+    return objects
+
+
+def keyframe_insert_loop(objects):
+    for ob in objects:
+        for frame, scale in zip(FRAMES, SCALES):
+            ob.scale = scale
+            ob.keyframe_insert(data_path="scale", frame=frame)
+        for fcurve in ob.animation_data.action.fcurves:
+            for kf in fcurve.keyframe_points:
+                kf.interpolation = 'LINEAR'
+
+
+def bulk_writer(objects):
+    values = np.broadcast_to(np.array(SCALES, dtype=np.float32), (len(objects), len(FRAMES), 3))
+    keyframes.animate_many(objects, "scale", FRAMES, values, 'LINEAR')
+
+
+def timed(name, function):
+    objects = make_objects(object_count)
+    start = time.perf_counter()
+    function(objects)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {object_count} objects: {elapsed:.3f} s")
+    return elapsed
+
+
+if __name__ == "__main__":
+    slow = timed("keyframe_insert", keyframe_insert_loop)
+    fast = timed("keyframes.animate_many", bulk_writer)
+    print(f"speed-up: {slow / fast:.1f}x")
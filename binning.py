@@ -0,0 +1,85 @@
+# streaming histogram binning
+# counts are accumulated chunk by chunk over fixed bin edges, so a file of any size is binned
+# while only one chunk of it is in memory. Without a known range a first pass over the chunks
+# finds the finite min / max of every column, the second pass does the counting.
+
+import time
+import numpy as np
+
+DEFAULT_BINS = 20
+
+
+def bin_edges(low, high, bins):
+    # bins + 1 evenly spaced edges, a constant or empty column gets a unit wide range
+    if low is None or high is None or not np.isfinite(low) or not np.isfinite(high):
+        low, high = 0.0, 1.0
+    if high <= low:
+        low, high = low - 0.5, low + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def update_range(ranges, chunk):
+    # running finite (min, max) per column, None until a column has a finite value
+    if ranges is None:
+        ranges = [(None, None)] * len(chunk)
+    updated = []
+    for (low, high), column in zip(ranges, chunk):
+        column = np.asarray(column, dtype=np.float64)
+        finite = column[np.isfinite(column)]
+        if len(finite):
+            chunk_low, chunk_high = float(finite.min()), float(finite.max())
+            low = chunk_low if low is None else min(low, chunk_low)
+            high = chunk_high if high is None else max(high, chunk_high)
+        updated.append((low, high))
+    return updated
+
+
+class Histogram:
+    ## Bin counts over fixed edges, one edges array per dimension (1D or 2D), filled chunk by chunk
+
+    def __init__(self, edges):
+        self.edges = [np.asarray(e, dtype=np.float64) for e in edges]
+        self.counts = np.zeros([len(e) - 1 for e in self.edges], dtype=np.int64)
+        self.rows = 0
+        self.skipped = 0  # rows with a missing value in any column
+
+    def add(self, *columns):
+        # one chunk, a column per dimension, rows outside the edges are not counted
+        columns = [np.asarray(c, dtype=np.float64) for c in columns]
+        finite = np.logical_and.reduce([np.isfinite(c) for c in columns])
+        self.rows += len(finite)
+        self.skipped += len(finite) - int(np.count_nonzero(finite))
+        if len(columns) == 1:
+            counts, _ = np.histogram(columns[0][finite], bins=self.edges[0])
+        else:
+            counts, _ = np.histogramdd(np.column_stack([c[finite] for c in columns]), bins=self.edges)
+        self.counts += counts.astype(np.int64)
+
+
+def iter_histogram(read_chunks, dims, bins=DEFAULT_BINS, ranges=None):
+    # read_chunks() returns a fresh iterable of chunks, each a tuple with one array per dimension
+    # it is called twice when ranges (a (low, high) per dimension) is not given
+    # yields (rows, elapsed) after every chunk like the loaders and returns the Histogram
+    start = time.perf_counter()
+    if ranges is None:
+        rows = 0
+        for chunk in read_chunks():
+            ranges = update_range(ranges, chunk)
+            rows += len(chunk[0])
+            yield rows, time.perf_counter() - start
+        if ranges is None:
+            ranges = [(None, None)] * dims
+    if np.isscalar(bins):
+        bins = [bins] * dims
+    histogram = Histogram([bin_edges(low, high, count) for (low, high), count in zip(ranges, bins)])
+    for chunk in read_chunks():
+        histogram.add(*chunk)
+        yield histogram.rows, time.perf_counter() - start
+    return histogram
+
+
+def array_chunks(columns, chunk_rows):
+    # slices of equally long arrays (memory maps stay on disk until a slice is read)
+    rows = len(columns[0]) if columns else 0
+    for offset in range(0, rows, chunk_rows):
+        yield tuple(column[offset:offset + chunk_rows] for column in columns)
@@ -0,0 +1,156 @@
+# dataset catalog
+# ingesting a file records its row count and, per column, the dtype, min, max, mean, null count
+# and a small histogram in the SQLite store. The numbers come from the columnar sidecar, so the
+# file is parsed once (the same parse later chart loads reuse) and every summary is a numpy
+# reduction over a memory-mapped array. Later lookups are a database query, not a scan.
+
+import os
+import json
+import numpy as np
+
+import sidecar
+from database import DATABASE_URL, CatalogEntry, ColumnStats, get_session, session_scope
+
+HISTOGRAM_BINS = 16
+
+# (path, mtime, size) -> entry dict (None when not catalogued), so the panel does not query
+# the database on every redraw
+_lookup_memo = {}
+
+
+def file_stamp(filepath):
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def summarize_numeric(values):
+    # one column of floats (NaN for missing or unparsable cells)
+    finite = values[np.isfinite(values)]
+    summary = {
+        'count': int(len(finite)),
+        'null_count': int(np.count_nonzero(np.isnan(values))),
+        'min': None, 'max': None, 'mean': None,
+        'dtype': 'float64',
+        'histogram': {'edges': [], 'counts': []},
+    }
+    if len(finite):
+        low, high = float(finite.min()), float(finite.max())
+        counts, edges = np.histogram(finite, bins=HISTOGRAM_BINS, range=(low, high) if high > low else (low - 0.5, low + 0.5))
+        summary.update(min=low, max=high, mean=float(finite.mean()),
+                       histogram={'edges': edges.tolist(), 'counts': counts.tolist()})
+        if np.array_equal(finite, np.floor(finite)):
+            summary['dtype'] = 'int64'
+    return summary
+
+
+def summarize_category(codes, categories):
+    # one column of category codes, the histogram holds the most frequent values
+    counts = np.bincount(codes, minlength=len(categories)) if len(codes) else np.zeros(len(categories), dtype=np.int64)
+    missing = [i for i, value in enumerate(categories) if value in ('nan', 'None', '')]
+    null_count = int(counts[missing].sum()) if missing else 0
+    top = np.argsort(counts)[::-1][:HISTOGRAM_BINS]
+    return {
+        'count': int(len(codes)) - null_count,
+        'null_count': null_count,
+        'min': None, 'max': None, 'mean': None,
+        'dtype': 'category',
+        'histogram': {'labels': [categories[i] for i in top], 'counts': counts[top].tolist(), 'distinct': len(categories)},
+    }
+
+
+def entry_dict(entry):
+    # plain copy of a CatalogEntry, usable after its session is closed
+    return {
+        'path': entry.path,
+        'rows': entry.rows,
+        'columns': [{
+            'position': column.position,
+            'name': column.name,
+            'dtype': column.dtype,
+            'count': column.count,
+            'null_count': column.null_count,
+            'min': column.min,
+            'max': column.max,
+            'mean': column.mean,
+            'histogram': json.loads(column.histogram) if column.histogram else None,
+        } for column in entry.columns],
+    }
+
+
+def ingest(filepath, progress=None, database_url=DATABASE_URL):
+    # (re)build the catalog entry of a file, returns it as a dict
+    path = os.path.abspath(filepath)
+    folder, meta = sidecar.ensure(path, progress)
+    mtime_ns, size = file_stamp(path)
+
+    summaries = []
+    for position, column in enumerate(meta['columns']):
+        series = sidecar.open_column(folder, meta, position)
+        if column['kind'] == 'float':
+            summary = summarize_numeric(series.to_numpy())
+        else:
+            summary = summarize_category(series.cat.codes.to_numpy(), column['categories'])
+        summaries.append(ColumnStats(
+            position=position, name=column['name'], dtype=summary['dtype'],
+            count=summary['count'], null_count=summary['null_count'],
+            min=summary['min'], max=summary['max'], mean=summary['mean'],
+            histogram=json.dumps(summary['histogram'])))
+
+    with session_scope(database_url) as session:
+        entry = session.query(CatalogEntry).filter_by(path=path).one_or_none()
+        if entry is None:
+            entry = CatalogEntry(path=path)
+            session.add(entry)
+        else:
+            # delete the old column rows first, (entry_id, position) is unique
+            entry.columns.clear()
+            session.flush()
+        entry.size = size
+        entry.mtime_ns = mtime_ns
+        entry.content_hash = meta['hash']
+        entry.rows = meta['rows']
+        entry.columns = summaries
+        session.flush()
+        result = entry_dict(entry)
+
+    _lookup_memo[(path, mtime_ns, size)] = result
+    return result
+
+
+def lookup(filepath, database_url=DATABASE_URL):
+    # catalog entry of a file if it is up to date, None if it was never ingested or has changed
+    path = os.path.abspath(filepath)
+    try:
+        mtime_ns, size = file_stamp(path)
+    except OSError:
+        return None
+    key = (path, mtime_ns, size)
+    if key in _lookup_memo:
+        return _lookup_memo[key]
+
+    session = get_session(database_url)
+    try:
+        entry = session.query(CatalogEntry).filter_by(path=path).one_or_none()
+        if entry is None or entry.mtime_ns != mtime_ns or entry.size != size:
+            result = None
+        else:
+            result = entry_dict(entry)
+    finally:
+        session.close()
+    _lookup_memo[key] = result
+    return result
+
+
+def describe(filepath, progress=None, database_url=DATABASE_URL):
+    # catalog entry of a file, ingesting it first if needed
+    return lookup(filepath, database_url) or ingest(filepath, progress, database_url)
+
+
+def forget(filepath, database_url=DATABASE_URL):
+    path = os.path.abspath(filepath)
+    with session_scope(database_url) as session:
+        entry = session.query(CatalogEntry).filter_by(path=path).one_or_none()
+        if entry is not None:
+            session.delete(entry)
+    for key in [key for key in _lookup_memo if key[0] == path]:
+        del _lookup_memo[key]
@@ -0,0 +1,684 @@
+# bulk mesh helpers for the chart builders
+# everything is written from numpy arrays with foreach_set, no per-point operators
+
+import bpy
+import bmesh
+import numpy as np
+
+
+def new_group_socket(node_group, name, in_out, socket_type):
+    # node group interface sockets moved to node_group.interface in blender 4
+    if bpy.app.version[0] >= 4:
+        return node_group.interface.new_socket(name, in_out=in_out, socket_type=socket_type)
+    if in_out == 'INPUT':
+        return node_group.inputs.new(socket_type, name)
+    return node_group.outputs.new(socket_type, name)
+
+
+def set_modifier_input(modifier, node_group, name, value):
+    # modifier inputs are keyed by socket identifier ("Input_2", "Socket_2", ...)
+    if bpy.app.version[0] >= 4:
+        sockets = [item for item in node_group.interface.items_tree if item.item_type == 'SOCKET' and item.in_out == 'INPUT']
+    else:
+        sockets = list(node_group.inputs)
+    for socket in sockets:
+        if socket.name == name:
+            modifier[socket.identifier] = value
+            return socket.identifier
+    raise KeyError(name)
+
+
+def mesh_from_arrays(name, vertices, faces=None, edges=None, face_sizes=None):
+    # vertices: (n, 3) float array, faces: (m, k) int array of k-sided faces
+    # faces of mixed sizes are one flat index array with face_sizes holding the sides of each
+    mesh = bpy.data.meshes.new(name)
+    write_geometry(mesh, vertices, faces, edges, face_sizes)
+    return mesh
+
+
+def write_geometry(mesh, vertices, faces=None, edges=None, face_sizes=None):
+    # fill an empty mesh from arrays
+    vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", vertices.ravel())
+
+    if edges is not None and len(edges):
+        edges = np.ascontiguousarray(edges, dtype=np.int32).reshape(-1, 2)
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", edges.ravel())
+
+    if faces is not None and len(faces):
+        faces = np.ascontiguousarray(faces, dtype=np.int32)
+        if face_sizes is None:
+            face_sizes = np.full(len(faces), faces.shape[1], dtype=np.int32)
+        face_sizes = np.ascontiguousarray(face_sizes, dtype=np.int32)
+        mesh.loops.add(faces.size)
+        mesh.loops.foreach_set("vertex_index", faces.ravel())
+        mesh.polygons.add(len(face_sizes))
+        mesh.polygons.foreach_set("loop_start", (np.cumsum(face_sizes) - face_sizes).astype(np.int32))
+        mesh.polygons.foreach_set("loop_total", face_sizes)
+
+    mesh.update(calc_edges=faces is not None and len(faces) > 0)
+    mesh.validate()
+
+
+def update_mesh(mesh, vertices, faces=None, edges=None, face_sizes=None):
+    # rewrite the geometry of an existing mesh, materials and users stay as they are
+    # with the same element counts only the positions are written, otherwise the geometry
+    # (and its attributes) is rebuilt and the caller sets the attributes again
+    vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+    face_count = 0 if faces is None else len(faces) if face_sizes is None else len(face_sizes)
+    same_faces = len(mesh.polygons) == face_count
+    same_edges = faces is not None or len(mesh.edges) == (0 if edges is None else len(edges))
+    if len(mesh.vertices) == len(vertices) and same_faces and same_edges:
+        mesh.vertices.foreach_set("co", vertices.ravel())
+        mesh.update()
+        return mesh
+    mesh.clear_geometry()
+    write_geometry(mesh, vertices, faces, edges, face_sizes)
+    return mesh
+
+
+def get_positions(mesh):
+    # (n, 3) float32 vertex positions
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    return positions.reshape(-1, 3)
+
+
+def set_attribute(mesh, name, values, data_type='FLOAT', domain='POINT'):
+    # write a whole attribute in one call, values is an array with one entry (or row) per element
+    attribute = mesh.attributes.get(name)
+    if attribute is None:
+        attribute = mesh.attributes.new(name=name, type=data_type, domain=domain)
+    field = {
+        'FLOAT': 'value', 'INT': 'value', 'BOOLEAN': 'value', 'STRING': 'value',
+        'FLOAT_VECTOR': 'vector', 'FLOAT_COLOR': 'color', 'BYTE_COLOR': 'color',
+    }[data_type]
+    dtype = np.int32 if data_type == 'INT' else bool if data_type == 'BOOLEAN' else np.float32
+    attribute.data.foreach_set(field, np.ascontiguousarray(values, dtype=dtype).ravel())
+    return attribute
+
+
+def get_attribute(mesh, name, data_type='FLOAT'):
+    # read a whole attribute back as an (n, width) array, None when the mesh has no such attribute
+    attribute = mesh.attributes.get(name)
+    if attribute is None:
+        return None
+    field, width = {
+        'FLOAT': ('value', 1), 'INT': ('value', 1), 'FLOAT_VECTOR': ('vector', 3), 'FLOAT_COLOR': ('color', 4),
+    }[data_type]
+    values = np.empty(len(attribute.data) * width, dtype=np.int32 if data_type == 'INT' else np.float32)
+    attribute.data.foreach_get(field, values)
+    return values.reshape(-1, width)
+
+
+def link_object(name, data, collection=None):
+    ob = bpy.data.objects.new(name, data)
+    (collection or bpy.context.scene.collection).objects.link(ob)
+    return ob
+
+
+def scatter_instancer_node_group():
+    # Instance on Points with a smooth UV sphere, radius and grow are modifier inputs
+    node_group = bpy.data.node_groups.get("Scatter Instancer")
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type="GeometryNodeTree", name="Scatter Instancer")
+    new_group_socket(node_group, "Geometry", 'INPUT', 'NodeSocketGeometry')
+    new_group_socket(node_group, "Radius", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Grow", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Material", 'INPUT', 'NodeSocketMaterial')
+    new_group_socket(node_group, "Geometry", 'OUTPUT', 'NodeSocketGeometry')
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-600.0, 0.0)
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (400.0, 0.0)
+
+    sphere = nodes.new("GeometryNodeMeshUVSphere")
+    sphere.location = (-400.0, -200.0)
+    sphere.inputs["Segments"].default_value = 16
+    sphere.inputs["Rings"].default_value = 8
+    sphere.inputs["Radius"].default_value = 1.0
+
+    smooth = nodes.new("GeometryNodeSetShadeSmooth")
+    smooth.location = (-200.0, -200.0)
+
+    scale = nodes.new("ShaderNodeMath")
+    scale.location = (-400.0, -400.0)
+    scale.operation = 'MULTIPLY'
+
+    # the material goes on the prototype so the instances never need realizing
+    set_material = nodes.new("GeometryNodeSetMaterial")
+    set_material.location = (-200.0, -350.0)
+
+    instance = nodes.new("GeometryNodeInstanceOnPoints")
+    instance.location = (0.0, 0.0)
+
+    links.new(sphere.outputs["Mesh"], smooth.inputs["Geometry"])
+    links.new(smooth.outputs["Geometry"], set_material.inputs["Geometry"])
+    links.new(group_input.outputs["Material"], set_material.inputs["Material"])
+    links.new(group_input.outputs["Radius"], scale.inputs[0])
+    links.new(group_input.outputs["Grow"], scale.inputs[1])
+    links.new(group_input.outputs["Geometry"], instance.inputs["Points"])
+    links.new(set_material.outputs["Geometry"], instance.inputs["Instance"])
+    links.new(scale.outputs["Value"], instance.inputs["Scale"])
+    links.new(instance.outputs["Instances"], group_output.inputs["Geometry"])
+    return node_group
+
+
+# corner pattern of a box, False picks the low coordinate and True the high one
+BOX_CORNERS = np.array([
+    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1],
+], dtype=bool)
+
+# outward facing quads of a box: bottom, top, front, right, back, left
+BOX_FACES = np.array([
+    [0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4],
+    [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7],
+], dtype=np.int32)
+
+
+def box_arrays(x0, x1, y0, y1, z0, z1):
+    # vertices (n*8, 3), quads (n*6, 4) and per-vertex box index for n axis aligned boxes
+    x0, x1, y0, y1, z0, z1 = np.broadcast_arrays(*(np.asarray(v, dtype=np.float32) for v in (x0, x1, y0, y1, z0, z1)))
+    low = np.stack((x0, y0, z0), axis=1)
+    high = np.stack((x1, y1, z1), axis=1)
+    count = len(low)
+
+    vertices = np.where(BOX_CORNERS[None, :, :], high[:, None, :], low[:, None, :]).reshape(-1, 3)
+    faces = (BOX_FACES[None, :, :] + (np.arange(count, dtype=np.int32) * 8)[:, None, None]).reshape(-1, 4)
+    index = np.repeat(np.arange(count, dtype=np.int32), 8)
+    return vertices, faces, index
+
+
+def histogram_arrays(histogram, size=10.0, height=5.0, gap=0.1):
+    # one box per non-empty bin on a size x size footprint around the origin, the fullest bin is
+    # height tall. 1D histograms are a row of bars along x, 2D ones a grid on the x / y plane
+    counts = histogram.counts if histogram.counts.ndim == 2 else histogram.counts[:, None]
+    bins_x, bins_y = counts.shape
+    cell_x, cell_y = np.nonzero(counts)
+    cell_counts = counts[cell_x, cell_y]
+    share = cell_counts / cell_counts.max() if len(cell_counts) else np.zeros(0)
+
+    width = size / bins_x
+    x0 = -size / 2 + cell_x * width + width * gap / 2
+    if histogram.counts.ndim == 2:
+        depth = size / bins_y
+        y0 = -size / 2 + cell_y * depth + depth * gap / 2
+    else:
+        depth = width
+        y0 = np.full(len(cell_x), -depth * (1 - gap) / 2)
+    vertices, faces, bin_index = box_arrays(
+        x0, x0 + width * (1 - gap),
+        y0, y0 + depth * (1 - gap),
+        0.0, share * height)
+    # blue for the emptiest bins through to red for the fullest
+    cell_colors = np.column_stack((share, np.zeros_like(share), 1 - share, np.ones_like(share)))
+    return vertices, faces, bin_index, np.repeat(cell_colors, 8, axis=0)
+
+
+def bar_grow_node_group():
+    # scales every vertex height by a per-bar factor that ramps from 0 to 1 over time
+    # bar i grows between Start + i * Step and Start + i * Step + Duration
+    node_group = bpy.data.node_groups.get("Bar Grow")
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type="GeometryNodeTree", name="Bar Grow")
+    new_group_socket(node_group, "Geometry", 'INPUT', 'NodeSocketGeometry')
+    new_group_socket(node_group, "Start", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Step", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Duration", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Geometry", 'OUTPUT', 'NodeSocketGeometry')
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-900.0, 0.0)
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (400.0, 0.0)
+
+    scene_time = nodes.new("GeometryNodeInputSceneTime")
+    scene_time.location = (-700.0, -300.0)
+
+    bar_index = nodes.new("GeometryNodeInputNamedAttribute")
+    bar_index.location = (-900.0, -200.0)
+    bar_index.data_type = 'INT'
+    bar_index.inputs["Name"].default_value = "bar_index"
+
+    begin = nodes.new("ShaderNodeMath")
+    begin.location = (-700.0, -150.0)
+    begin.operation = 'MULTIPLY_ADD'
+
+    elapsed = nodes.new("ShaderNodeMath")
+    elapsed.location = (-500.0, -200.0)
+    elapsed.operation = 'SUBTRACT'
+
+    factor = nodes.new("ShaderNodeMath")
+    factor.location = (-300.0, -200.0)
+    factor.operation = 'DIVIDE'
+    factor.use_clamp = True
+
+    position = nodes.new("GeometryNodeInputPosition")
+    position.location = (-500.0, -400.0)
+
+    scale = nodes.new("ShaderNodeVectorMath")
+    scale.location = (-100.0, -300.0)
+    scale.operation = 'MULTIPLY'
+
+    combine = nodes.new("ShaderNodeCombineXYZ")
+    combine.location = (-300.0, -400.0)
+    combine.inputs["X"].default_value = 1.0
+    combine.inputs["Y"].default_value = 1.0
+
+    set_position = nodes.new("GeometryNodeSetPosition")
+    set_position.location = (150.0, 0.0)
+
+    links.new(bar_index.outputs["Attribute"], begin.inputs[0])
+    links.new(group_input.outputs["Step"], begin.inputs[1])
+    links.new(group_input.outputs["Start"], begin.inputs[2])
+    links.new(scene_time.outputs["Frame"], elapsed.inputs[0])
+    links.new(begin.outputs["Value"], elapsed.inputs[1])
+    links.new(elapsed.outputs["Value"], factor.inputs[0])
+    links.new(group_input.outputs["Duration"], factor.inputs[1])
+    links.new(factor.outputs["Value"], combine.inputs["Z"])
+    links.new(position.outputs["Position"], scale.inputs[0])
+    links.new(combine.outputs["Vector"], scale.inputs[1])
+    links.new(group_input.outputs["Geometry"], set_position.inputs["Geometry"])
+    links.new(scale.outputs["Vector"], set_position.inputs["Position"])
+    links.new(set_position.outputs["Geometry"], group_output.inputs["Geometry"])
+    return node_group
+
+
+def line_tube_node_group():
+    # trims a curve and sweeps a circle along it, the trim end, tube radius, profile
+    # resolution and material are modifier inputs so every line graph shares this group
+    node_group = bpy.data.node_groups.get("Line Graph Tube")
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type="GeometryNodeTree", name="Line Graph Tube")
+    new_group_socket(node_group, "Geometry", 'INPUT', 'NodeSocketGeometry')
+    trim = new_group_socket(node_group, "Trim", 'INPUT', 'NodeSocketFloat')
+    trim.default_value = 1.0
+    radius = new_group_socket(node_group, "Radius", 'INPUT', 'NodeSocketFloat')
+    radius.default_value = 0.03
+    resolution = new_group_socket(node_group, "Resolution", 'INPUT', 'NodeSocketInt')
+    resolution.default_value = 32
+    new_group_socket(node_group, "Material", 'INPUT', 'NodeSocketMaterial')
+    new_group_socket(node_group, "Geometry", 'OUTPUT', 'NodeSocketGeometry')
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-340.0, 0.0)
+    group_input.width, group_input.height = 140.0, 100.0
+
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (609.8951416015625, 0.0)
+    group_output.width, group_output.height = 140.0, 100.0
+
+    trim_curve = nodes.new("GeometryNodeTrimCurve")
+    trim_curve.location = (-63.592041015625, 22.438913345336914)
+    trim_curve.width, trim_curve.height = 140.0, 100.0
+    trim_curve.mode = 'FACTOR'
+    trim_curve.inputs[1].default_value = True
+    trim_curve.inputs[2].default_value = 0.0
+
+    curve_to_mesh = nodes.new("GeometryNodeCurveToMesh")
+    curve_to_mesh.location = (169.89512634277344, 18.004777908325195)
+    curve_to_mesh.width, curve_to_mesh.height = 140.0, 100.0
+    curve_to_mesh.inputs[2].default_value = False
+
+    curve_circle = nodes.new("GeometryNodeCurvePrimitiveCircle")
+    curve_circle.location = (-340.7394104003906, -86.51416015625)
+    curve_circle.width, curve_circle.height = 140.0, 100.0
+    curve_circle.mode = 'RADIUS'
+
+    set_material = nodes.new("GeometryNodeSetMaterial")
+    set_material.location = (389.71429443359375, 25.688528060913086)
+    set_material.width, set_material.height = 140.0, 100.0
+    set_material.inputs[1].default_value = True
+
+    links.new(group_input.outputs["Geometry"], trim_curve.inputs[0])
+    links.new(group_input.outputs["Trim"], trim_curve.inputs[3])
+    links.new(group_input.outputs["Resolution"], curve_circle.inputs[0])
+    links.new(group_input.outputs["Radius"], curve_circle.inputs[4])
+    links.new(trim_curve.outputs[0], curve_to_mesh.inputs[0])
+    links.new(curve_circle.outputs[0], curve_to_mesh.inputs[1])
+    links.new(curve_to_mesh.outputs[0], set_material.inputs[0])
+    links.new(group_input.outputs["Material"], set_material.inputs[2])
+    links.new(set_material.outputs[0], group_output.inputs[0])
+    return node_group
+
+
+def point_cloud_node_group():
+    # turns mesh vertices into a point cloud, each point sized by its "radius" attribute
+    # times the Grow input, much lighter than instancing a sphere per point
+    node_group = bpy.data.node_groups.get("Scatter Point Cloud")
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type="GeometryNodeTree", name="Scatter Point Cloud")
+    new_group_socket(node_group, "Geometry", 'INPUT', 'NodeSocketGeometry')
+    new_group_socket(node_group, "Grow", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Material", 'INPUT', 'NodeSocketMaterial')
+    new_group_socket(node_group, "Geometry", 'OUTPUT', 'NodeSocketGeometry')
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-600.0, 0.0)
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (400.0, 0.0)
+
+    radius = nodes.new("GeometryNodeInputNamedAttribute")
+    radius.location = (-600.0, -200.0)
+    radius.data_type = 'FLOAT'
+    radius.inputs["Name"].default_value = "radius"
+
+    scale = nodes.new("ShaderNodeMath")
+    scale.location = (-400.0, -200.0)
+    scale.operation = 'MULTIPLY'
+
+    to_points = nodes.new("GeometryNodeMeshToPoints")
+    to_points.location = (-200.0, 0.0)
+    to_points.mode = 'VERTICES'
+
+    set_material = nodes.new("GeometryNodeSetMaterial")
+    set_material.location = (100.0, 0.0)
+
+    links.new(radius.outputs["Attribute"], scale.inputs[0])
+    links.new(group_input.outputs["Grow"], scale.inputs[1])
+    links.new(group_input.outputs["Geometry"], to_points.inputs["Mesh"])
+    links.new(scale.outputs["Value"], to_points.inputs["Radius"])
+    links.new(to_points.outputs["Points"], set_material.inputs["Geometry"])
+    links.new(group_input.outputs["Material"], set_material.inputs["Material"])
+    links.new(set_material.outputs["Geometry"], group_output.inputs["Geometry"])
+    return node_group
+
+
+def spike_prototype(texture):
+    # subdivided cube with the bevel + displace look of the spike chart, modifiers applied
+    # once; a hidden object carries it so geometry nodes can instance it
+    ob = bpy.data.objects.get("spike_prototype")
+    if ob is not None:
+        if not ob.users_collection:
+            bpy.context.scene.collection.objects.link(ob)
+        return ob
+
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=1.0)
+    bmesh.ops.subdivide_edges(bm, edges=bm.edges[:], cuts=1, use_grid_fill=True)
+    mesh = bpy.data.meshes.new("spike_prototype")
+    bm.to_mesh(mesh)
+    bm.free()
+
+    ob = link_object("spike_prototype", mesh)
+    bevel = ob.modifiers.new("Bevel", 'BEVEL')
+    bevel.width = 3
+    bevel.segments = 1
+    bevel.profile = 0.5
+    displace = ob.modifiers.new("Displace", 'DISPLACE')
+    displace.strength = 0.2
+    displace.direction = 'Z'
+    displace.texture_coords = 'LOCAL'
+    displace.texture = texture
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    baked = bpy.data.meshes.new_from_object(ob.evaluated_get(depsgraph))
+    ob.modifiers.clear()
+    ob.data = baked
+    bpy.data.meshes.remove(mesh)
+    baked.name = "spike_prototype"
+    ob.hide_viewport = True
+    ob.hide_render = True
+    return ob
+
+
+def spike_instancer_node_group():
+    # instances the spike prototype on every point, scaled by Grow and the "height" attribute
+    node_group = bpy.data.node_groups.get("Spike Instancer")
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type="GeometryNodeTree", name="Spike Instancer")
+    new_group_socket(node_group, "Geometry", 'INPUT', 'NodeSocketGeometry')
+    new_group_socket(node_group, "Prototype", 'INPUT', 'NodeSocketObject')
+    new_group_socket(node_group, "Grow", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Material", 'INPUT', 'NodeSocketMaterial')
+    new_group_socket(node_group, "Geometry", 'OUTPUT', 'NodeSocketGeometry')
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-700.0, 0.0)
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (400.0, 0.0)
+
+    prototype = nodes.new("GeometryNodeObjectInfo")
+    prototype.location = (-450.0, -200.0)
+    prototype.transform_space = 'ORIGINAL'
+
+    set_material = nodes.new("GeometryNodeSetMaterial")
+    set_material.location = (-200.0, -200.0)
+
+    height = nodes.new("GeometryNodeInputNamedAttribute")
+    height.location = (-700.0, -400.0)
+    height.data_type = 'FLOAT'
+    height.inputs["Name"].default_value = "height"
+
+    shape = nodes.new("ShaderNodeCombineXYZ")
+    shape.location = (-450.0, -400.0)
+    shape.inputs["X"].default_value = 1.0
+    shape.inputs["Y"].default_value = 1.0
+
+    grow = nodes.new("ShaderNodeVectorMath")
+    grow.location = (-200.0, -400.0)
+    grow.operation = 'SCALE'
+
+    instance = nodes.new("GeometryNodeInstanceOnPoints")
+    instance.location = (100.0, 0.0)
+
+    links.new(group_input.outputs["Prototype"], prototype.inputs["Object"])
+    links.new(prototype.outputs["Geometry"], set_material.inputs["Geometry"])
+    links.new(group_input.outputs["Material"], set_material.inputs["Material"])
+    links.new(height.outputs["Attribute"], shape.inputs["Z"])
+    links.new(shape.outputs["Vector"], grow.inputs[0])
+    links.new(group_input.outputs["Grow"], grow.inputs["Scale"])
+    links.new(group_input.outputs["Geometry"], instance.inputs["Points"])
+    links.new(set_material.outputs["Geometry"], instance.inputs["Instance"])
+    links.new(grow.outputs["Vector"], instance.inputs["Scale"])
+    links.new(instance.outputs["Instances"], group_output.inputs["Geometry"])
+    return node_group
+
+
+def pie_arrays(values, radius=1.0, inner_radius=0.0, height=0.2, start_angle=0.0, segment_angle=np.radians(5)):
+    # one closed slab per slice, inner_radius > 0 makes a donut. Arcs are split into segments of
+    # at most segment_angle, so thin slices cost a few vertices and wide ones stay round
+    # returns vertices, flat faces with their face sizes, per-vertex slice index, per-vertex unit
+    # direction of the slice middle (what explode moves along) and the middle angle of each slice
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0).clip(min=0)
+    total = values.sum()
+    angles = values / total * 2 * np.pi if total > 0 else np.zeros(len(values))
+    starts = start_angle + np.cumsum(angles) - angles
+    middles = starts + angles / 2
+
+    vertices, faces, sizes, index, directions = [], [], [], [], []
+    offset = 0
+    for i in np.nonzero(angles > 0)[0]:
+        segments = max(1, int(np.ceil(angles[i] / segment_angle)))
+        theta = starts[i] + angles[i] * np.arange(segments + 1) / segments
+        ring = np.column_stack((np.cos(theta), np.sin(theta)))
+        outer = ring * radius
+        # a pie slice has a single center point instead of an inner arc
+        inner = ring * inner_radius if inner_radius > 0 else np.zeros((1, 2))
+        n, m = len(outer), len(inner)
+        slab = np.concatenate((
+            np.column_stack((outer, np.full(n, height))),
+            np.column_stack((outer, np.zeros(n))),
+            np.column_stack((inner, np.full(m, height))),
+            np.column_stack((inner, np.zeros(m))),
+        ))
+        # outer top, outer bottom, inner top, inner bottom
+        ot = offset + np.arange(n)
+        ob = ot + n
+        it = offset + 2 * n + np.arange(m)
+        ib = it + m
+        k = np.arange(segments)
+        outer_wall = np.column_stack((ob[k], ob[k + 1], ot[k + 1], ot[k]))
+        if inner_radius > 0:
+            quads = np.concatenate((
+                outer_wall,
+                np.column_stack((it[k], ot[k], ot[k + 1], it[k + 1])),
+                np.column_stack((ib[k], ib[k + 1], ob[k + 1], ob[k])),
+                np.column_stack((ib[k], it[k], it[k + 1], ib[k + 1])),
+                [[ib[0], ob[0], ot[0], it[0]], [ib[-1], it[-1], ot[-1], ob[-1]]],
+            ))
+            slice_faces = quads.ravel()
+            slice_sizes = np.full(len(quads), 4)
+        else:
+            # the cut sides are quads, top and bottom one fan face each around the center
+            cuts = np.array([ib[0], ob[0], ot[0], it[0], ib[0], it[0], ot[-1], ob[-1]])
+            top = np.concatenate(([it[0]], ot))
+            bottom = np.concatenate(([ib[0]], ob[::-1]))
+            slice_faces = np.concatenate((outer_wall.ravel(), cuts, top, bottom))
+            slice_sizes = np.concatenate((np.full(segments + 2, 4), [n + 1, n + 1]))
+
+        vertices.append(slab)
+        faces.append(slice_faces)
+        sizes.append(slice_sizes)
+        index.append(np.full(len(slab), i))
+        directions.append(np.tile((np.cos(middles[i]), np.sin(middles[i]), 0.0), (len(slab), 1)))
+        offset += len(slab)
+
+    if not vertices:
+        return np.zeros((0, 3)), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros((0, 3)), middles
+    return (np.concatenate(vertices), np.concatenate(faces).astype(np.int32), np.concatenate(sizes).astype(np.int32),
+            np.concatenate(index).astype(np.int32), np.concatenate(directions), middles)
+
+
+def pie_values(frame):
+    # slice names and sizes of a (names, sizes) frame, missing or negative sizes count as 0
+    import pandas as pd
+
+    names = [str(name) for name in frame.iloc[:, 0].tolist()]
+    values = pd.to_numeric(frame.iloc[:, 1], errors='coerce').to_numpy(dtype=np.float64)
+    return names, np.nan_to_num(values, nan=0.0).clip(min=0)
+
+
+def pie_colors(count):
+    # evenly spaced hues, one per slice
+    hue = np.arange(count) / max(count, 1) * 6
+    channel = lambda shift: np.clip(np.abs((hue + shift) % 6 - 3) - 1, 0, 1)
+    return np.column_stack((channel(0), channel(4), channel(2), np.ones(count)))
+
+
+def pie_node_group():
+    # slice i rises from flat to full height between Start + i * Step and Start + i * Step + Duration
+    # (reading the "slice_index" attribute) and every slice moves Explode along its
+    # "slice_direction" attribute as it rises
+    node_group = bpy.data.node_groups.get("Pie Animate")
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type="GeometryNodeTree", name="Pie Animate")
+    new_group_socket(node_group, "Geometry", 'INPUT', 'NodeSocketGeometry')
+    new_group_socket(node_group, "Start", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Step", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Duration", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Explode", 'INPUT', 'NodeSocketFloat')
+    new_group_socket(node_group, "Geometry", 'OUTPUT', 'NodeSocketGeometry')
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-900.0, 0.0)
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (600.0, 0.0)
+
+    scene_time = nodes.new("GeometryNodeInputSceneTime")
+    scene_time.location = (-700.0, -300.0)
+
+    slice_index = nodes.new("GeometryNodeInputNamedAttribute")
+    slice_index.location = (-900.0, -200.0)
+    slice_index.data_type = 'INT'
+    slice_index.inputs["Name"].default_value = "slice_index"
+
+    direction = nodes.new("GeometryNodeInputNamedAttribute")
+    direction.location = (-500.0, -600.0)
+    direction.data_type = 'FLOAT_VECTOR'
+    direction.inputs["Name"].default_value = "slice_direction"
+
+    begin = nodes.new("ShaderNodeMath")
+    begin.location = (-700.0, -150.0)
+    begin.operation = 'MULTIPLY_ADD'
+
+    elapsed = nodes.new("ShaderNodeMath")
+    elapsed.location = (-500.0, -200.0)
+    elapsed.operation = 'SUBTRACT'
+
+    factor = nodes.new("ShaderNodeMath")
+    factor.location = (-300.0, -200.0)
+    factor.operation = 'DIVIDE'
+    factor.use_clamp = True
+
+    distance = nodes.new("ShaderNodeMath")
+    distance.location = (-100.0, -500.0)
+    distance.operation = 'MULTIPLY'
+
+    offset = nodes.new("ShaderNodeVectorMath")
+    offset.location = (100.0, -500.0)
+    offset.operation = 'SCALE'
+
+    position = nodes.new("GeometryNodeInputPosition")
+    position.location = (-500.0, -400.0)
+
+    combine = nodes.new("ShaderNodeCombineXYZ")
+    combine.location = (-100.0, -300.0)
+    combine.inputs["X"].default_value = 1.0
+    combine.inputs["Y"].default_value = 1.0
+
+    scale = nodes.new("ShaderNodeVectorMath")
+    scale.location = (100.0, -300.0)
+    scale.operation = 'MULTIPLY'
+
+    moved = nodes.new("ShaderNodeVectorMath")
+    moved.location = (300.0, -300.0)
+    moved.operation = 'ADD'
+
+    set_position = nodes.new("GeometryNodeSetPosition")
+    set_position.location = (400.0, 0.0)
+
+    links.new(slice_index.outputs["Attribute"], begin.inputs[0])
+    links.new(group_input.outputs["Step"], begin.inputs[1])
+    links.new(group_input.outputs["Start"], begin.inputs[2])
+    links.new(scene_time.outputs["Frame"], elapsed.inputs[0])
+    links.new(begin.outputs["Value"], elapsed.inputs[1])
+    links.new(elapsed.outputs["Value"], factor.inputs[0])
+    links.new(group_input.outputs["Duration"], factor.inputs[1])
+    links.new(factor.outputs["Value"], combine.inputs["Z"])
+    links.new(position.outputs["Position"], scale.inputs[0])
+    links.new(combine.outputs["Vector"], scale.inputs[1])
+    links.new(factor.outputs["Value"], distance.inputs[0])
+    links.new(group_input.outputs["Explode"], distance.inputs[1])
+    links.new(direction.outputs["Attribute"], offset.inputs[0])
+    links.new(distance.outputs["Value"], offset.inputs["Scale"])
+    links.new(scale.outputs["Vector"], moved.inputs[0])
+    links.new(offset.outputs["Vector"], moved.inputs[1])
+    links.new(group_input.outputs["Geometry"], set_position.inputs["Geometry"])
+    links.new(moved.outputs["Vector"], set_position.inputs["Position"])
+    links.new(set_position.outputs["Geometry"], group_output.inputs["Geometry"])
+    return node_group
@@ -1,12 +1,19 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey
+import os
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event, insert, Column, Integer, BigInteger, Float, String, Text, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
+
+# example.db next to this file, whatever the working directory (Blender's is rarely the repo)
+DATABASE_URL = "sqlite:///" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "example.db")
 
 # Create a base class for our classes to inherit from
 Base = declarative_base()
 
 class Dataset(Base):
-    __tablename__ = 'Datasets'
+    __tablename__ = 'datasets'
 
     id = Column(Integer, primary_key=True)
     name = Column(String(50))
@@ -17,18 +24,19 @@ class Dataset(Base):
         return f"<Dataset(name={self.name}, description={self.description})>"
 
 class Configuration(Base):
-    __tablename__ = 'Configurations'
+    __tablename__ = 'configurations'
 
     id = Column(Integer, primary_key=True)
     key = Column(String(50))
     value = Column(String(50))
     model_id = Column(Integer, ForeignKey('models.id'))
+    model = relationship("Model", back_populates="configurations")
 
     def _repr_(self):
         return f"<Configuration(key={self.key}, value={self.value})>"
 
 class Model(Base):
-    __tablename__ = 'Model'
+    __tablename__ = 'models'
 
     id = Column(Integer, primary_key=True)
     name = Column(String(50))
@@ -38,45 +46,144 @@ class Model(Base):
 
     def _repr_(self):
         return f"<Model(name={self.name})>"
+
+class CatalogEntry(Base):
+    ## A dataset file as it was when last ingested, see catalog.py
+    __tablename__ = 'catalog_entries'
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String(1024), unique=True, index=True)
+    size = Column(BigInteger)
+    mtime_ns = Column(BigInteger)
+    content_hash = Column(String(40))
+    rows = Column(BigInteger)
+    dataset_id = Column(Integer, ForeignKey('datasets.id'), nullable=True)
+    columns = relationship("ColumnStats", back_populates="entry", order_by="ColumnStats.position", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<CatalogEntry(path={self.path}, rows={self.rows})>"
+
+class ColumnStats(Base):
+    ## Summary of one column of a catalogued file, histogram is a JSON string
+    __tablename__ = 'column_stats'
+    __table_args__ = (Index('ix_column_stats_entry_position', 'entry_id', 'position', unique=True),)
+
+    id = Column(Integer, primary_key=True)
+    entry_id = Column(Integer, ForeignKey('catalog_entries.id'), nullable=False)
+    position = Column(Integer)
+    name = Column(String(250))
+    dtype = Column(String(20))
+    count = Column(BigInteger)
+    null_count = Column(BigInteger)
+    min = Column(Float)
+    max = Column(Float)
+    mean = Column(Float)
+    histogram = Column(Text)
+    entry = relationship("CatalogEntry", back_populates="columns")
+
+    def __repr__(self):
+        return f"<ColumnStats(name={self.name}, dtype={self.dtype})>"
     
+
+# one engine (and its connection pool) and one session factory per database url, for the whole process
+_engines = {}
+_session_factories = {}
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # runs once per pooled connection: WAL lets readers work during a write and
+    # synchronous=NORMAL only syncs at checkpoints, which is safe in WAL mode
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def get_engine(database_url=DATABASE_URL):
+    # long-lived pooled engine, the tables are created the first time a url is used
+    engine = _engines.get(database_url)
+    if engine is not None:
+        return engine
+    if database_url.startswith("sqlite"):
+        if database_url in ("sqlite://", "sqlite:///:memory:"):
+            # every connection to an in-memory database is a new database, share a single one
+            engine = create_engine(database_url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+        else:
+            engine = create_engine(database_url, poolclass=QueuePool, pool_size=5, max_overflow=10,
+                                   connect_args={"check_same_thread": False})
+            event.listen(engine, "connect", _set_sqlite_pragmas)
+    else:
+        engine = create_engine(database_url, pool_pre_ping=True)
+    Base.metadata.create_all(engine)
+    _engines[database_url] = engine
+    _session_factories[database_url] = sessionmaker(bind=engine, expire_on_commit=False)
+    return engine
+
+def dispose_engines():
+    # close every pooled connection, e.g. before the database file is moved or deleted
+    for engine in _engines.values():
+        engine.dispose()
+    _engines.clear()
+    _session_factories.clear()
+
+# Function to create and return the database session
+def get_session(database_url=DATABASE_URL):
+    get_engine(database_url)
+    return _session_factories[database_url]()
+
 def get_db():
-        engine = create_engine('sqlite:///example.db')
-        return sessionmaker(bind=engine)()
-    
+    return get_session()
+
+@contextmanager
+def session_scope(database_url=DATABASE_URL):
+    # one transaction: committed when the block ends, rolled back if it raises
+    session = get_session(database_url)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 def save_to_db(object):
-    db = get_db()
-    db.add(object)
-    db.commit()
-    db.close()
-# Function to create and return the database session
-def get_session(database_url="sqlite:///example.db"):
-    engine = create_engine(database_url, echo=True)
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    with session_scope() as db:
+        db.add(object)
+
+def save_all(objects, database_url=DATABASE_URL):
+    # save many Dataset / Model / Configuration objects, with the objects they reference,
+    # in a single transaction
+    objects = list(objects)
+    with session_scope(database_url) as session:
+        session.add_all(objects)
+    return objects
+
+def bulk_insert(model, rows, database_url=DATABASE_URL):
+    # insert plain dicts of column values (e.g. thousands of Configuration rows) with one
+    # executemany in a single transaction, no ORM objects are built
+    rows = list(rows)
+    if not rows:
+        return 0
+    with session_scope(database_url) as session:
+        session.execute(insert(model.__table__), rows)
+    return len(rows)
 
 
 
 # Example of using the defined classes
 if __name__ == "__main__":
-    session = get_session()
-
-    # Create and add new dataset
+    # Create a dataset, a model and a configuration, saved in one transaction
     new_dataset = Dataset(name="Sample Dataset", description="This is a sample dataset.")
-    session.add(new_dataset)
-    
-    # Create and add new model
     new_model = Model(name="Sample Model", dataset=new_dataset)
-    session.add(new_model)
-    
-    # Create and add new configuration
     new_config = Configuration(key="resolution", value="1080p", model=new_model)
-    session.add(new_config)
-    
-    # Commit the changes
-    session.commit()
-    
+    save_all([new_dataset, new_model, new_config])
+
+    # Many configurations of the model in one executemany
+    bulk_insert(Configuration, [{"key": f"frame_{i}", "value": str(i), "model_id": new_model.id} for i in range(1000)])
+
     # Query and print data
+    session = get_session()
     for dataset in session.query(Dataset).all():
         print(dataset)
         for model in dataset.models:
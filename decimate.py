@@ -0,0 +1,77 @@
+# line series decimation
+# picks the rows worth drawing so a long series keeps its visual shape within a point budget
+
+import numpy as np
+
+# default number of points a line graph draws
+LINE_POINT_BUDGET = 2000
+
+
+def lttb(x, y, budget):
+    # Largest-Triangle-Three-Buckets, returns the sorted indices of the kept rows
+    # first and last rows are always kept, every bucket in between keeps the row that forms
+    # the largest triangle with the previously kept row and the mean of the next bucket
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    count = len(y)
+    if budget >= count:
+        return np.arange(count)
+    if budget < 3:
+        return np.array([0, count - 1])[:max(budget, 0)]
+
+    edges = np.linspace(1, count - 1, budget - 1).astype(np.int64)
+    # mean point of every bucket, computed in one pass
+    sums_x = np.add.reduceat(x[1:count - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:count - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    means_x = np.append(sums_x / sizes, x[-1])
+    means_y = np.append(sums_y / sizes, y[-1])
+
+    kept = np.empty(budget, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = count - 1
+    previous = 0
+    for bucket in range(budget - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        ax, ay = x[previous], y[previous]
+        bx, by = x[start:end], y[start:end]
+        cx, cy = means_x[bucket + 1], means_y[bucket + 1]
+        area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def minmax(y, budget):
+    # min and max row of every bucket (two rows per bucket), returns sorted unique indices
+    y = np.asarray(y, dtype=np.float64)
+    count = len(y)
+    if budget >= count:
+        return np.arange(count)
+
+    buckets = max(budget // 2, 1)
+    size = -(-count // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:count] = y
+    padded = padded.reshape(buckets, size)
+    # all-NaN buckets (only possible at the end) fall back to their first row
+    valid = ~np.all(np.isnan(padded), axis=1)
+    filled = np.where(np.isnan(padded), np.inf, padded)
+    low = np.argmin(filled, axis=1)
+    filled = np.where(np.isnan(padded), -np.inf, padded)
+    high = np.argmax(filled, axis=1)
+    offsets = np.arange(buckets) * size
+    kept = np.concatenate(((offsets + low)[valid], (offsets + high)[valid], [0, count - 1]))
+    return np.unique(kept[kept < count])
+
+
+def decimate(x, y, budget=LINE_POINT_BUDGET, method='lttb'):
+    # indices of the rows to draw, all rows when the series already fits the budget
+    count = len(y)
+    if count <= budget:
+        return np.arange(count)
+    if method == 'minmax':
+        return minmax(y, budget)
+    if method == 'lttb':
+        return lttb(x, y, budget)
+    raise ValueError(f"Unknown decimation method: {method}")
@@ -1,58 +1,36 @@
 import bpy
-import pandas as pd
-import matplotlib.pyplot as plt
+import os
+import sys
 import numpy as np
 
-# Sample DataFrame
-data = {
-    'x': np.random.normal(size=100),
-    'y': np.random.normal(size=100)
-}
-df = pd.DataFrame(data)
+# helper modules live next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import binning
+import chart_mesh
+import materials
 
-# Create histogram data
-hist, xedges, yedges = np.histogram2d(df['x'], df['y'], bins=20)
-
-# Set up figure and axis
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
-
-# Construct arrays for the anchor positions of the bars.
-xpos, ypos = np.meshgrid(xedges[:-1] + 0.1, yedges[:-1] + 0.1, indexing="ij")
-xpos = xpos.ravel()
-ypos = ypos.ravel()
-zpos = 0
-
-# Construct arrays with the dimensions for the bars.
-dx = dy = 0.2 * np.ones_like(zpos)
-dz = hist.ravel()
-
-# Create 3D histogram
-ax.bar3d(xpos, ypos, zpos, dx, dy, dz, zsort='average')
-
-# Save histogram as an image
-plt.savefig('/tmp/histogram.png')
+# Sample data
+x = np.random.normal(size=100)
+y = np.random.normal(size=100)
 
 # Clear previous meshes and objects
 bpy.ops.wm.read_factory_settings(use_empty=True)
 
-# Create material
-material = bpy.data.materials.new(name="HistogramMaterial")
-material.use_nodes = True
-bsdf = material.node_tree.nodes["Principled BSDF"]
-tex_image = material.node_tree.nodes.new('ShaderNodeTexImage')
-tex_image.image = bpy.data.images.load('/tmp/histogram.png')
-material.node_tree.links.new(bsdf.inputs['Base Color'], tex_image.outputs['Color'])
+# Count the samples in 20 x 20 bins, larger data can be added chunk by chunk
+histogram = binning.Histogram([binning.bin_edges(x.min(), x.max(), 20), binning.bin_edges(y.min(), y.max(), 20)])
+histogram.add(x, y)
 
-# Create plane
-bpy.ops.mesh.primitive_plane_add(size=2, enter_editmode=False, align='WORLD', location=(0, 0, 0))
-plane = bpy.context.active_object
-plane.data.materials.append(material)
+# One box per bin, all in one mesh, colored by count
+vertices, faces, bin_index, colors = chart_mesh.histogram_arrays(histogram, size=2.0, height=1.0)
+mesh = chart_mesh.mesh_from_arrays("histogram", vertices, faces)
+chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+mesh.materials.append(materials.attribute_color("color", 'GEOMETRY'))
+chart_mesh.link_object("histogram", mesh)
 
 # Set up the camera
 bpy.ops.object.camera_add(location=(0, -3, 3))
 camera = bpy.context.active_object
-camera.rotation_euler = (np.radians(60), 0, np.radians(90))
+camera.rotation_euler = (np.radians(45), 0, 0)
 
 # Set up the light
 bpy.ops.object.light_add(type='SUN', align='WORLD', location=(0, -3, 3))
@@ -65,4 +43,4 @@ bpy.context.scene.camera = camera
 bpy.context.scene.render.filepath = '/tmp/histogram_render.png'
 bpy.ops.render.render(write_still=True)
 
-print("Histogram render saved to /tmp/histogram_render.png")
\ No newline at end of file
+print("Histogram render saved to /tmp/histogram_render.png")
@@ -0,0 +1,75 @@
+# bulk keyframe writer
+# fills whole f-curves with keyframe_points.add + foreach_set instead of one keyframe_insert per key
+
+import bpy
+import numpy as np
+
+# Keyframe.interpolation enum values in RNA order
+INTERPOLATION = {'CONSTANT': 0, 'LINEAR': 1, 'BEZIER': 2}
+
+
+def ensure_action(id_data):
+    anim = id_data.animation_data or id_data.animation_data_create()
+    if anim.action is None:
+        anim.action = bpy.data.actions.new(name=f"{id_data.name}Action")
+    return anim.action
+
+
+def ensure_fcurve(id_data, data_path, index=0):
+    action = ensure_action(id_data)
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path, index=index)
+    return fcurve
+
+
+def fill_fcurve(fcurve, frames, values, interpolation='BEZIER'):
+    # replace the keys of one f-curve, frames and values are 1d arrays of equal length
+    frames = np.asarray(frames, dtype=np.float32).ravel()
+    values = np.asarray(values, dtype=np.float32).ravel()
+    count = len(frames)
+
+    co = np.empty(count * 2, dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+
+    points = fcurve.keyframe_points
+    points.clear()
+    points.add(count)
+    points.foreach_set("co", co)
+    points.foreach_set("interpolation", np.full(count, INTERPOLATION[interpolation], dtype=np.int32))
+    # sorts the keys and recomputes bezier handles
+    fcurve.update()
+    return fcurve
+
+
+def animate(id_data, data_path, frames, values, interpolation='BEZIER'):
+    # keys for one property of one datablock
+    # values has shape (keys,) for a single value or (keys, channels) for vectors like scale
+    values = np.asarray(values, dtype=np.float32)
+    if values.ndim == 1:
+        values = values[:, None]
+    return [
+        fill_fcurve(ensure_fcurve(id_data, data_path, index=channel), frames, values[:, channel], interpolation)
+        for channel in range(values.shape[1])
+    ]
+
+
+def animate_many(ids, data_path, frames, values, interpolation='BEZIER'):
+    # keys for the same property on many datablocks
+    # frames: (keys,) shared or (objects, keys), values: (objects, keys) or (objects, keys, channels)
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+    for i, id_data in enumerate(ids):
+        animate(id_data, data_path, frames if frames.ndim == 1 else frames[i], values[i], interpolation)
+
+
+def set_interpolation(id_data, interpolation='LINEAR'):
+    # set the interpolation of every key of a datablock in one call per f-curve
+    anim = id_data.animation_data
+    if anim is None or anim.action is None:
+        return
+    for fcurve in anim.action.fcurves:
+        points = fcurve.keyframe_points
+        points.foreach_set("interpolation", np.full(len(points), INTERPOLATION[interpolation], dtype=np.int32))
+        fcurve.update()
@@ -0,0 +1,188 @@
+# single-object chart captions
+# all captions of a chart are drawn by one object: a vertex per caption anchor and a geometry
+# nodes tree that runs String to Curves on the captions joined by newlines, then moves
+# every text line onto its anchor. Geometry nodes cannot read string attributes, so the
+# caption text is a modifier input and the line number is the caption index.
+
+import bpy
+import math
+import numpy as np
+
+import chart_mesh
+
+LABEL_GROUP_NAME = "Chart Labels"
+
+
+def label_node_group():
+    node_group = bpy.data.node_groups.get(LABEL_GROUP_NAME)
+    if node_group is not None:
+        return node_group
+
+    node_group = bpy.data.node_groups.new(type="GeometryNodeTree", name=LABEL_GROUP_NAME)
+    new_socket = chart_mesh.new_group_socket
+    new_socket(node_group, "Geometry", 'INPUT', 'NodeSocketGeometry')
+    new_socket(node_group, "Text", 'INPUT', 'NodeSocketString')
+    new_socket(node_group, "Size", 'INPUT', 'NodeSocketFloat')
+    new_socket(node_group, "Duration", 'INPUT', 'NodeSocketFloat')
+    new_socket(node_group, "Rotation", 'INPUT', 'NodeSocketVector')
+    new_socket(node_group, "Material", 'INPUT', 'NodeSocketMaterial')
+    new_socket(node_group, "Geometry", 'OUTPUT', 'NodeSocketGeometry')
+
+    nodes = node_group.nodes
+    links = node_group.links
+
+    group_input = nodes.new("NodeGroupInput")
+    group_input.location = (-1400.0, 0.0)
+    group_output = nodes.new("NodeGroupOutput")
+    group_output.location = (1000.0, 0.0)
+
+    # one text line per caption, line k sits at y = -k * size
+    text = nodes.new("GeometryNodeStringToCurves")
+    text.location = (-1100.0, 200.0)
+    text.align_x = 'CENTER'
+    text.inputs["Line Spacing"].default_value = 1.0
+
+    # anchor position and start frame of the caption each character belongs to
+    anchor = nodes.new("GeometryNodeSampleIndex")
+    anchor.location = (-800.0, -200.0)
+    anchor.data_type = 'FLOAT_VECTOR'
+    anchor.domain = 'POINT'
+    position = nodes.new("GeometryNodeInputPosition")
+    position.location = (-1100.0, -250.0)
+
+    start = nodes.new("GeometryNodeSampleIndex")
+    start.location = (-800.0, -450.0)
+    start.data_type = 'FLOAT'
+    start.domain = 'POINT'
+    label_start = nodes.new("GeometryNodeInputNamedAttribute")
+    label_start.location = (-1100.0, -450.0)
+    label_start.data_type = 'FLOAT'
+    label_start.inputs["Name"].default_value = "label_start"
+
+    # move line k back to y = 0
+    line_offset = nodes.new("ShaderNodeMath")
+    line_offset.location = (-800.0, 150.0)
+    line_offset.operation = 'MULTIPLY'
+    line_vector = nodes.new("ShaderNodeCombineXYZ")
+    line_vector.location = (-600.0, 150.0)
+    unshift = nodes.new("GeometryNodeTranslateInstances")
+    unshift.location = (-400.0, 300.0)
+    unshift.inputs["Local Space"].default_value = False
+
+    rotate = nodes.new("GeometryNodeRotateInstances")
+    rotate.location = (-200.0, 300.0)
+    rotate.inputs["Local Space"].default_value = False
+
+    # caption scale-in: height pops to 0.5 in one frame, width grows to 0.5 over Duration
+    scene_time = nodes.new("GeometryNodeInputSceneTime")
+    scene_time.location = (-800.0, -650.0)
+    elapsed = nodes.new("ShaderNodeMath")
+    elapsed.location = (-600.0, -600.0)
+    elapsed.operation = 'SUBTRACT'
+    height_ramp = nodes.new("ShaderNodeMath")
+    height_ramp.location = (-400.0, -550.0)
+    height_ramp.operation = 'ADD'
+    height_ramp.use_clamp = True
+    height_ramp.inputs[1].default_value = 1.0
+    width_ramp = nodes.new("ShaderNodeMath")
+    width_ramp.location = (-400.0, -700.0)
+    width_ramp.operation = 'DIVIDE'
+    width_ramp.use_clamp = True
+    scale_vector = nodes.new("ShaderNodeCombineXYZ")
+    scale_vector.location = (-200.0, -600.0)
+    half = nodes.new("ShaderNodeVectorMath")
+    half.location = (0.0, -600.0)
+    half.operation = 'SCALE'
+    half.inputs["Scale"].default_value = 0.5
+    scale = nodes.new("GeometryNodeScaleInstances")
+    scale.location = (0.0, 300.0)
+    scale.inputs["Local Space"].default_value = False
+
+    place = nodes.new("GeometryNodeTranslateInstances")
+    place.location = (200.0, 300.0)
+    place.inputs["Local Space"].default_value = False
+
+    realize = nodes.new("GeometryNodeRealizeInstances")
+    realize.location = (400.0, 300.0)
+    fill = nodes.new("GeometryNodeFillCurve")
+    fill.location = (600.0, 300.0)
+    set_material = nodes.new("GeometryNodeSetMaterial")
+    set_material.location = (800.0, 300.0)
+
+    links.new(group_input.outputs["Text"], text.inputs["String"])
+    links.new(group_input.outputs["Size"], text.inputs["Size"])
+
+    links.new(group_input.outputs["Geometry"], anchor.inputs["Geometry"])
+    links.new(position.outputs["Position"], anchor.inputs["Value"])
+    links.new(text.outputs["Line"], anchor.inputs["Index"])
+    links.new(group_input.outputs["Geometry"], start.inputs["Geometry"])
+    links.new(label_start.outputs["Attribute"], start.inputs["Value"])
+    links.new(text.outputs["Line"], start.inputs["Index"])
+
+    links.new(text.outputs["Line"], line_offset.inputs[0])
+    links.new(group_input.outputs["Size"], line_offset.inputs[1])
+    links.new(line_offset.outputs["Value"], line_vector.inputs["Y"])
+    links.new(text.outputs["Curve Instances"], unshift.inputs["Instances"])
+    links.new(line_vector.outputs["Vector"], unshift.inputs["Translation"])
+
+    links.new(unshift.outputs["Instances"], rotate.inputs["Instances"])
+    links.new(group_input.outputs["Rotation"], rotate.inputs["Rotation"])
+
+    links.new(scene_time.outputs["Frame"], elapsed.inputs[0])
+    links.new(start.outputs["Value"], elapsed.inputs[1])
+    links.new(elapsed.outputs["Value"], height_ramp.inputs[0])
+    links.new(elapsed.outputs["Value"], width_ramp.inputs[0])
+    links.new(group_input.outputs["Duration"], width_ramp.inputs[1])
+    links.new(width_ramp.outputs["Value"], scale_vector.inputs["X"])
+    links.new(height_ramp.outputs["Value"], scale_vector.inputs["Y"])
+    links.new(height_ramp.outputs["Value"], scale_vector.inputs["Z"])
+    links.new(scale_vector.outputs["Vector"], half.inputs[0])
+    links.new(rotate.outputs["Instances"], scale.inputs["Instances"])
+    links.new(half.outputs["Vector"], scale.inputs["Scale"])
+
+    links.new(scale.outputs["Instances"], place.inputs["Instances"])
+    links.new(anchor.outputs["Value"], place.inputs["Translation"])
+
+    links.new(place.outputs["Instances"], realize.inputs["Geometry"])
+    links.new(realize.outputs["Geometry"], fill.inputs["Curve"])
+    links.new(fill.outputs["Mesh"], set_material.inputs["Geometry"])
+    links.new(group_input.outputs["Material"], set_material.inputs["Material"])
+    links.new(set_material.outputs["Geometry"], group_output.inputs["Geometry"])
+    return node_group
+
+
+def create_labels(name, positions, captions, starts, duration, material=None, size=1.0, rotation=(math.radians(90), 0, 0)):
+    # positions: (n, 3) anchors, captions: n strings, starts: n scale-in start frames
+    captions = [str(caption).replace("\n", " ") for caption in captions]
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    starts = np.broadcast_to(np.asarray(starts, dtype=np.float32), (len(positions),))
+
+    mesh = chart_mesh.mesh_from_arrays(name, positions)
+    chart_mesh.set_attribute(mesh, "label_start", starts, 'FLOAT', 'POINT')
+    ob = chart_mesh.link_object(name, mesh)
+
+    node_group = label_node_group()
+    modifier = ob.modifiers.new(LABEL_GROUP_NAME, "NODES")
+    modifier.node_group = node_group
+    chart_mesh.set_modifier_input(modifier, node_group, "Text", "\n".join(captions))
+    chart_mesh.set_modifier_input(modifier, node_group, "Size", float(size))
+    chart_mesh.set_modifier_input(modifier, node_group, "Duration", float(duration))
+    chart_mesh.set_modifier_input(modifier, node_group, "Rotation", tuple(float(v) for v in rotation))
+    if material is not None:
+        chart_mesh.set_modifier_input(modifier, node_group, "Material", material)
+    return ob
+
+
+def update_labels(ob, positions, captions, starts):
+    # point an existing labels object at new anchors and captions
+    captions = [str(caption).replace("\n", " ") for caption in captions]
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    starts = np.broadcast_to(np.asarray(starts, dtype=np.float32), (len(positions),))
+
+    chart_mesh.update_mesh(ob.data, positions)
+    chart_mesh.set_attribute(ob.data, "label_start", starts, 'FLOAT', 'POINT')
+    modifier = ob.modifiers.get(LABEL_GROUP_NAME)
+    chart_mesh.set_modifier_input(modifier, modifier.node_group, "Text", "\n".join(captions))
+    # modifier inputs are id properties, changing them does not tag the object by itself
+    ob.update_tag()
+    return ob
@@ -0,0 +1,134 @@
+# chunked dataset loader
+# reads csv / xlsx files in fixed-size chunks and keeps only the columns a chart needs
+
+import time
+import numpy as np
+import pandas as pd
+
+# number of rows parsed per chunk
+CHUNK_ROWS = 100000
+
+# text columns with at most this share of distinct values become categoricals
+CATEGORY_RATIO = 0.5
+
+INT32 = np.iinfo(np.int32)
+
+
+def iter_excel_chunks(filepath, usecols=None, chunksize=CHUNK_ROWS, sheet=None, cell_range=None):
+    # openpyxl in read-only mode streams rows instead of building the whole sheet, see xlsx.py
+    import xlsx
+
+    yield from xlsx.iter_frames(filepath, sheet, cell_range, usecols, chunksize)
+
+
+def iter_chunks(filepath, usecols=None, chunksize=CHUNK_ROWS, sheet=None, cell_range=None):
+    # yield the file as DataFrames of at most chunksize rows
+    # sheet and cell_range select part of an xlsx workbook, csv files ignore them
+    if filepath.endswith('.csv'):
+        yield from pd.read_csv(filepath, usecols=usecols, chunksize=chunksize)
+    elif filepath.endswith('.xlsx'):
+        yield from iter_excel_chunks(filepath, usecols=usecols, chunksize=chunksize, sheet=sheet, cell_range=cell_range)
+    else:
+        raise ValueError(f"Unsupported dataset type: {filepath}")
+
+
+def read_header(filepath, sheet=None, cell_range=None):
+    # column names only, no data rows are parsed
+    if filepath.endswith('.csv'):
+        return list(pd.read_csv(filepath, nrows=0).columns)
+    elif filepath.endswith('.xlsx'):
+        import xlsx
+
+        return xlsx.header_names(filepath, sheet, cell_range)
+    else:
+        raise ValueError(f"Unsupported dataset type: {filepath}")
+
+
+def check_columns(columns, names):
+    # positional columns must exist, a negative position would quietly pick from the end
+    for i in columns:
+        if not 0 <= i < len(names):
+            raise ValueError(f"Column {i + 1} does not exist, the dataset has {len(names)} columns")
+
+
+def downcast(frame):
+    # smallest dtype that keeps every value: int32 for whole numbers that fit, float32 for other
+    # numbers and categoricals for text columns with repeated values (month names, labels)
+    columns = []
+    for i in range(frame.shape[1]):
+        column = frame.iloc[:, i]
+        if isinstance(column.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(column):
+            pass
+        elif pd.api.types.is_numeric_dtype(column):
+            values = column.to_numpy()
+            whole = len(values) > 0 and (pd.api.types.is_integer_dtype(column) or
+                                         (np.isfinite(values).all() and np.array_equal(values, np.floor(values))))
+            if whole and INT32.min <= values.min() and values.max() <= INT32.max:
+                if column.dtype != np.int32:
+                    column = column.astype(np.int32)
+            elif pd.api.types.is_float_dtype(column) and column.dtype != np.float32:
+                column = column.astype(np.float32)
+        elif column.dtype == object and len(column) and column.nunique(dropna=False) <= len(column) * CATEGORY_RATIO:
+            column = column.astype('category')
+        columns.append(column)
+    if not columns:
+        return frame
+    return pd.concat(columns, axis=1, copy=False)
+
+
+def frame_bytes(frame):
+    # memory held by the columns, strings included
+    return int(frame.memory_usage(index=False, deep=True).sum())
+
+
+def float64_bytes(frame):
+    # what the columns would take as float64 numbers, the size pandas parses them to
+    return sum(len(frame) * 8 if pd.api.types.is_numeric_dtype(frame.iloc[:, i]) else
+               int(frame.iloc[:, i].memory_usage(index=False, deep=True))
+               for i in range(frame.shape[1]))
+
+
+def memory_text(columns, total_columns, rows, loaded, before, mapped=False):
+    # one line for the panel and the console, mapped columns are read from the sidecar files
+    # on demand and do not count as resident memory
+    return (f"{columns} of {total_columns} columns, {rows:,} rows: {loaded / 1e6:,.1f} MB "
+            f"{'memory-mapped ' if mapped else ''}({before / 1e6:,.1f} MB as float64)")
+
+
+def drain(steps, progress=None):
+    # run a step generator to the end and return its result
+    # every yielded (rows, elapsed) pair is passed on to progress
+    while True:
+        try:
+            step = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        if progress is not None:
+            progress(*step)
+
+
+def iter_stream_columns(filepath, columns, chunksize=CHUNK_ROWS):
+    # generator version of stream_columns, yields (rows, elapsed) after every chunk
+    check_columns(columns, read_header(filepath))
+    unique = sorted(set(columns))
+    parts = []
+    rows = 0
+    start = time.perf_counter()
+
+    for chunk in iter_chunks(filepath, usecols=unique, chunksize=chunksize):
+        rows += len(chunk)
+        parts.append(chunk)
+        yield rows, time.perf_counter() - start
+
+    if not parts:
+        return pd.DataFrame()
+    frame = pd.concat(parts, ignore_index=True)
+    del parts
+    # usecols returns columns in file order, put them back in the requested order
+    return frame.iloc[:, [unique.index(c) for c in columns]]
+
+
+def stream_columns(filepath, columns, chunksize=CHUNK_ROWS, progress=None):
+    # read the positional columns of the whole file chunk by chunk and return them in the
+    # requested order; memory grows with the rows of these columns only, not the whole frame
+    return drain(iter_stream_columns(filepath, columns, chunksize), progress)
@@ -0,0 +1,112 @@
+# shared material / texture registry
+# datablocks are named after a hash of their shader parameters, so asking twice for the
+# same look returns the existing datablock instead of creating "name.001", "name.002", ...
+
+import bpy
+import hashlib
+
+REGISTRY_KEY = "chart_registry_key"
+
+
+def registry_name(prefix, key):
+    digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:8]
+    return f"{prefix}_{digest}"
+
+
+def lookup(collection, prefix, key):
+    # return (datablock or None, name) for a registry key
+    name = registry_name(prefix, key)
+    block = collection.get(name)
+    if block is not None and block.get(REGISTRY_KEY) == repr(key):
+        return block, name
+    return None, name
+
+
+def remember(block, key):
+    block[REGISTRY_KEY] = repr(key)
+    return block
+
+
+def new_node_material(name):
+    material = bpy.data.materials.new(name=name)
+    material.use_nodes = True
+    material.node_tree.links.clear()
+    material.node_tree.nodes.clear()
+    return material
+
+
+def emission(color=(1.0, 1.0, 1.0, 1.0), strength=1.0):
+    # flat glowing material used for curves, markers, captions and axes
+    key = ('emission', tuple(color), float(strength))
+    material, name = lookup(bpy.data.materials, "chart_emission", key)
+    if material is not None:
+        return material
+
+    material = new_node_material(name)
+    nodes = material.node_tree.nodes
+    output = nodes.new(type='ShaderNodeOutputMaterial')
+    shader = nodes.new(type='ShaderNodeEmission')
+    shader.inputs['Color'].default_value = tuple(color)
+    shader.inputs['Strength'].default_value = strength
+    material.node_tree.links.new(shader.outputs[0], output.inputs[0])
+    return remember(material, key)
+
+
+def diffuse(color):
+    # viewport colour only material
+    key = ('diffuse', tuple(color))
+    material, name = lookup(bpy.data.materials, "chart_diffuse", key)
+    if material is not None:
+        return material
+
+    material = bpy.data.materials.new(name=name)
+    material.diffuse_color = tuple(color)
+    return remember(material, key)
+
+
+def attribute_color(attribute_name="color", attribute_type='GEOMETRY'):
+    # principled material whose base colour comes from a colour attribute, one material
+    # colours any number of points; use attribute_type='INSTANCER' for instanced geometry
+    key = ('attribute', attribute_name, attribute_type)
+    material, name = lookup(bpy.data.materials, "chart_attribute", key)
+    if material is not None:
+        return material
+
+    material = new_node_material(name)
+    nodes = material.node_tree.nodes
+    links = material.node_tree.links
+    output = nodes.new(type='ShaderNodeOutputMaterial')
+    shader = nodes.new(type='ShaderNodeBsdfPrincipled')
+    attribute = nodes.new(type='ShaderNodeAttribute')
+    attribute.attribute_type = attribute_type
+    attribute.attribute_name = attribute_name
+    links.new(attribute.outputs['Color'], shader.inputs['Base Color'])
+    links.new(shader.outputs[0], output.inputs[0])
+    # the viewport solid mode shows the attribute too when color type is set to attribute
+    material.diffuse_color = (1.0, 1.0, 1.0, 1.0)
+    return remember(material, key)
+
+
+def clouds_texture(noise_scale=0.5, intensity=0.5, contrast=0.5, saturation=0.5, nabla=0.5):
+    # soft noise texture for displace modifiers
+    key = ('clouds', noise_scale, intensity, contrast, saturation, nabla)
+    texture, name = lookup(bpy.data.textures, "chart_clouds", key)
+    if texture is not None:
+        return texture
+
+    texture = bpy.data.textures.new(name=name, type='CLOUDS')
+    texture.noise_scale = noise_scale
+    texture.intensity = intensity
+    texture.contrast = contrast
+    texture.saturation = saturation
+    texture.nabla = nabla
+    texture.noise_basis = 'BLENDER_ORIGINAL'
+    texture.noise_type = 'SOFT_NOISE'
+    texture.noise_depth = 1
+    texture.use_color_ramp = True
+    texture.color_ramp.elements[0].position = 0.0
+    texture.color_ramp.elements[0].color = (0.0, 0.0, 0.0, 1)
+    texture.color_ramp.elements[1].position = 1.0
+    texture.color_ramp.elements[1].color = (1.0, 1.0, 1.0, 1)
+    texture.color_ramp.elements[1].alpha = 1
+    return remember(texture, key)
@@ -1,20 +1,58 @@
 # blender plugin
 
 import bpy
-import pandas as pd
+from bpy.app.handlers import persistent
 import os
+import sys
 import math
 import random
-
-# global variables
-context = bpy.context
-scene = context.scene
+import json
+import time
+import traceback
+import importlib.util
+from collections import OrderedDict
+
+# helper modules live next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import materials
+import timing
+
+def lazy_import(name):
+    # module whose code only runs on its first attribute access, so enabling the add-on (and
+    # every blender start with it enabled) does not pay for pandas / numpy until a chart is built
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    lazy_loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = lazy_loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    lazy_loader.exec_module(module)
+    return module
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+loader = lazy_import("loader")
+sidecar = lazy_import("sidecar")
+chart_mesh = lazy_import("chart_mesh")
+keyframes = lazy_import("keyframes")
+labels = lazy_import("labels")
+decimate = lazy_import("decimate")
+scaling = lazy_import("scaling")
+binning = lazy_import("binning")
 
 # initial properties
 def init_properties():
     bpy.types.Scene.my_file_path = bpy.props.StringProperty(name="File Path", default="")
     bpy.types.Scene.x_axis_column = bpy.props.IntProperty(name="X Axis", default=0)
     bpy.types.Scene.y_axis_column = bpy.props.IntProperty(name="Y Axis", default=0)
+    bpy.types.Scene.x_axis_name = bpy.props.EnumProperty(name="X Axis", items=catalog_column_items, update=pick_x_column)
+    bpy.types.Scene.y_axis_name = bpy.props.EnumProperty(name="Y Axis", items=catalog_column_items, update=pick_y_column)
+    bpy.types.Scene.chart_spans = bpy.props.CollectionProperty(type=ChartSpan)
+    bpy.types.Scene.chart_trace_name = bpy.props.StringProperty(name="Last Build", default="")
+    bpy.types.Scene.show_performance = bpy.props.BoolProperty(name="Performance", default=False)
+    bpy.types.Scene.live_reload = bpy.props.BoolProperty(name="Live Reload", description="Update charts in place when their dataset file changes",
+                                                         default=False, update=toggle_live_reload)
 
 bl_info = {
     "name": "3D Visualization",
@@ -40,20 +78,344 @@ class OpenFilebrowser(bpy.types.Operator):
     def execute(self, context):
         print("Selected file:", self.filepath)
         context.scene.my_file_path = self.filepath  # Store the filepath in the scene property
+        # parse the file once now, the panel then describes it from the catalog
+        ingest_catalog(self.filepath)
         return {'FINISHED'}
     
     def invoke(self, context, event):
         context.window_manager.fileselect_add(self)
         return {'RUNNING_MODAL'}
 
+########################################
+######### DATASET CATALOG ##############
+########################################
+
+def dataset_catalog():
+    # the catalog lives in the SQLite store, which needs sqlalchemy; Blender's own python
+    # does not ship it, the panel then falls back to plain column numbers
+    try:
+        import catalog
+    except ImportError:
+        return None
+    return catalog
+
+def ingest_catalog(filepath):
+    catalog = dataset_catalog()
+    if catalog is None or not (filepath.endswith('.csv') or filepath.endswith('.xlsx')):
+        return None
+    try:
+        return catalog.describe(filepath, progress=lambda rows, elapsed: report_build_progress(None, load_message(rows, elapsed)))
+    except Exception as e:
+        print("Could not catalogue", filepath, e)
+        return None
+    finally:
+        if bpy.context.workspace is not None:
+            bpy.context.workspace.status_text_set(None)
+
+def catalog_entry(filepath):
+    # catalog entry of the file if it is catalogued and unchanged, a memoised lookup
+    if not filepath:
+        return None
+    catalog = dataset_catalog()
+    if catalog is None:
+        return None
+    try:
+        return catalog.lookup(filepath)
+    except Exception as e:
+        print("Catalog lookup failed:", e)
+        return None
+
+# blender only keeps a reference to dynamic enum items, python has to keep them alive
+_column_items = []
+
+def catalog_column_items(self, context):
+    # column picker items, identifiers are 1-based column numbers like the X / Y Axis properties
+    global _column_items
+    entry = catalog_entry(context.scene.my_file_path)
+    if entry is None:
+        _column_items = [('0', "(not catalogued)", "")]
+    else:
+        _column_items = [(str(column['position'] + 1), column['name'], f"{column['dtype']}, {column['count']:,} values, {column['null_count']:,} missing")
+                         for column in entry['columns']]
+    return _column_items
+
+def pick_x_column(self, context):
+    self.x_axis_column = int(self.x_axis_name)
+
+def pick_y_column(self, context):
+    self.y_axis_column = int(self.y_axis_name)
+
+def axis_columns(scene):
+    # 1-based (x, y) column numbers as the panel shows them: the column pickers of a catalogued
+    # file, the plain number fields otherwise. The number fields only follow the pickers once
+    # a column is picked, until then they hold 0
+    if catalog_entry(scene.my_file_path) is not None:
+        return int(scene.x_axis_name or 0), int(scene.y_axis_name or 0)
+    return scene.x_axis_column, scene.y_axis_column
+
+def column_range_text(entry, number):
+    # dtype and value range of a 1-based column number, from the catalog
+    if not 1 <= number <= len(entry['columns']):
+        return ""
+    column = entry['columns'][number - 1]
+    if column['min'] is None:
+        distinct = (column['histogram'] or {}).get('distinct', 0)
+        return f"{column['dtype']}, {distinct:,} distinct values"
+    return f"{column['dtype']}, {column['min']:g} to {column['max']:g}"
+
+
+# rows kept in DatasetHelper.df for the panel, charts stream the whole file
+PREVIEW_ROWS = 1000
+
+# operator defaults, the same as decimate.LINE_POINT_BUDGET and binning.DEFAULT_BINS; reading
+# those at registration would import numpy
+LINE_POINT_BUDGET = 2000
+HISTOGRAM_BINS = 20
+
+# instanced scatter plots with more points than this get no captions
+SCATTER_LABEL_LIMIT = 10000
+
+# instanced scatter plots with more points than this switch to a density mode
+SCATTER_DENSITY_THRESHOLD = 100000
+# cells per side of the density grid
+SCATTER_DENSITY_GRID = 64
+# pie charts with more slices than this get no captions
+PIE_LABEL_LIMIT = 200
+
+def load_message(rows, elapsed):
+    # rows/sec progress while a dataset streams in
+    rate = rows / elapsed if elapsed > 0 else 0
+    return f"Loading dataset: {rows:,} rows ({rate:,.0f} rows/s)"
+
+def bin_message(rows, elapsed):
+    rate = rows / elapsed if elapsed > 0 else 0
+    return f"Binning: {rows:,} rows ({rate:,.0f} rows/s)"
+
+def load_steps(steps, message=load_message):
+    # turn loader (rows, elapsed) steps into (fraction, message) build steps
+    try:
+        while True:
+            rows, elapsed = next(steps)
+            yield None, message(rows, elapsed)
+    except StopIteration as stop:
+        return stop.value
+
+def report_build_progress(fraction, message):
+    workspace = bpy.context.workspace
+    if workspace is not None:
+        workspace.status_text_set(message)
+
+def run_build(steps, name=None):
+    # run a chart build generator to the end, mirroring its progress in the status bar
+    # a named build is timed phase by phase and its spans are stored on the scene
+    trace = timing.Trace(name) if name else None
+    if trace is not None:
+        steps = timing.traced(trace, steps)
+    try:
+        result = loader.drain(steps, report_build_progress)
+    finally:
+        if bpy.context.workspace is not None:
+            bpy.context.workspace.status_text_set(None)
+    if trace is not None:
+        store_trace(bpy.context.scene, trace)
+    return result
+
+class ChartSpan(bpy.types.PropertyGroup):
+    ## One timed phase of the last chart build, times in milliseconds from the start of the build
+    name: bpy.props.StringProperty(name="Phase", default="")
+    start: bpy.props.FloatProperty(name="Start", default=0.0)
+    duration: bpy.props.FloatProperty(name="Duration", default=0.0)
+    depth: bpy.props.IntProperty(name="Depth", default=0)
+
+def store_trace(scene, trace):
+    # keep the spans of the last build on the scene, they are saved with the .blend
+    if not hasattr(scene, "chart_spans"):
+        return
+    scene.chart_spans.clear()
+    scene.chart_trace_name = trace.name
+    for name, start, duration, depth in sorted(trace.spans, key=lambda span: (span[1], span[3])):
+        item = scene.chart_spans.add()
+        item.name = name
+        item.start = start * 1000
+        item.duration = duration * 1000
+        item.depth = depth
+
+########################################
+######### CHART DATA ###################
+########################################
+
+# shared by the builders and by live reload, which rewrites existing chart objects in place
+
+def line_series(frame, point_budget, decimation, graph_start_position, distance_bet_points):
+    # rows kept after decimation, their x positions and display heights
+    # a copy, the frame may already hold float32 and is still needed for the captions
+    values = frame.iloc[:, 0].to_numpy(dtype=np.float32, copy=True)
+    normalized_data = scaling.mean_ratio(values, 10, out=values)
+
+    # Keep only the rows worth drawing, the whole series is used for the scaling
+    kept = decimate.decimate(np.arange(len(values)), normalized_data, point_budget, decimation)
+    number_of_data = len(kept)
+    # Kept rows keep their relative spacing but span number_of_data slots on the x axis
+    slots = kept * (number_of_data - 1) / max(len(values) - 1, 1)
+    x_positions = graph_start_position + distance_bet_points * slots
+
+    stats = scaling.finite_stats(normalized_data)
+    if stats.low > abs(stats.mean - stats.low):
+        display_data = list(normalized_data[kept] - stats.low + abs(stats.mean - stats.low))
+    else:
+        display_data = list(normalized_data[kept])
+    return kept, x_positions, display_data
+
+def line_captions(frame, kept, x_positions, display_data, currency_symbol, anim_start_frame, anim_length_data):
+    # month captions above the value captions: (positions, captions, start frames)
+    number_of_data = len(kept)
+    data_list = frame.iloc[kept, 0].reset_index(drop=True)
+    month_list = frame.iloc[kept, 1].reset_index(drop=True)
+    label_z = np.asarray(display_data, dtype=np.float64)
+    label_positions = np.concatenate((
+        np.column_stack((x_positions, np.zeros(number_of_data), label_z + 1.5)),
+        np.column_stack((x_positions, np.zeros(number_of_data), label_z + 1)),
+    ))
+    captions = [str(month) for month in month_list] + [currency_symbol + str(data) for data in data_list]
+    label_starts = np.tile(anim_start_frame + anim_length_data * np.arange(number_of_data), 2)
+    return label_positions, captions, label_starts
+
+def set_curve_points(curve, x_positions, heights):
+    # rewrite the points of the line graph curve, keeping the curve datablock
+    count = len(x_positions)
+    if len(curve.splines) != 1 or len(curve.splines[0].bezier_points) != count:
+        curve.splines.clear()
+        curve.splines.new('BEZIER').bezier_points.add(count - 1)
+    points = curve.splines[0].bezier_points
+    co = np.column_stack((x_positions, np.zeros(count), heights)).astype(np.float32)
+    points.foreach_set("co", co.ravel())
+    for point in points:
+        point.handle_left_type = 'AUTO'
+        point.handle_right_type = 'AUTO'
+
+def bar_arrays(frame, anim_start_frame, anim_length_data, bar_spacing=1.5, bar_width=1):
+    # one box per row, plus the (positions, captions, start frames) of the captions under the bars
+    names = frame.iloc[:, 0].tolist()
+    # make y log scale, zero, negative and missing values get a flat bar
+    heights = scaling.log(frame.iloc[:, 1].to_numpy(dtype=np.float32), fill=0.0)
+    np.round(heights, 1, out=heights)
+    number_of_data = len(heights)
+
+    centers = np.arange(number_of_data) * bar_spacing
+    vertices, faces, bar_index = chart_mesh.box_arrays(
+        centers - bar_width / 2, centers + bar_width / 2,
+        -bar_width / 2, bar_width / 2,
+        0.0, heights)
+    label_positions = np.column_stack((centers, np.zeros(number_of_data), np.full(number_of_data, -2.0)))
+    label_starts = anim_start_frame + anim_length_data * np.arange(number_of_data)
+    return vertices, faces, bar_index, (label_positions, names, label_starts)
+
+def spike_points(frame, previous_colors=None):
+    # x / y scaled to -5..5 at height 5, blue or green at random
+    # rows that were already drawn keep their previous color
+    # normalize the data to -5 to 5 range, missing values land on 0
+    x = scaling.minmax(frame.iloc[:, 0].to_numpy(dtype=np.float32), -5, 5, fill=0.0)
+    y = scaling.minmax(frame.iloc[:, 1].to_numpy(dtype=np.float32), -5, 5, fill=0.0)
+
+    count = len(x)
+    points = np.column_stack((x, y, np.full(count, 5.0)))
+    colors = np.where(np.random.rand(count, 1) < 0.5, (0.0, 0.0, 1.0, 1.0), (0.0, 1.0, 0.0, 1.0))
+    if previous_colors is not None:
+        kept = min(len(previous_colors), count)
+        colors[:kept] = previous_colors[:kept]
+    return points, colors
+
+def scatter_points(frame, previous_heights=None):
+    # x / y scaled to -5..5 with a random height per row, rows already drawn keep their height
+    # keep the data in -5 to 5 range, missing values land on 0
+    x = scaling.minmax(frame.iloc[:, 0].to_numpy(dtype=np.float32), -5, 5, fill=0.0)
+    y = scaling.minmax(frame.iloc[:, 1].to_numpy(dtype=np.float32), -5, 5, fill=0.0)
+    # random height based on the data points
+    z = np.random.randint(0, 5, size=len(x))
+    if previous_heights is not None:
+        kept = min(len(previous_heights), len(z))
+        z[:kept] = np.round(previous_heights[:kept])
+    points = np.column_stack((x, y, z))
+
+    # red for even heights, green for 0 / 5, blue otherwise
+    colors = np.tile(np.array([0.0, 0.0, 1.0, 1.0], dtype=np.float32), (len(z), 1))
+    colors[z % 5 == 0] = (0.0, 1.0, 0.0, 1.0)
+    colors[z % 2 == 0] = (1.0, 0.0, 0.0, 1.0)
+    return points, colors
+
+def scatter_captions(points, anim_start_frame):
+    # (x, y) captions just above the points
+    captions = [f"({round(ix,1)}, {round(iy,1)})" for ix, iy in zip(points[:, 0], points[:, 1])]
+    return points + (0, 0, 1), captions, anim_start_frame + 1
+
+def density_radius(count, point_radius, density_threshold):
+    # points shrink as there are more of them so the cloud stays readable
+    return max(point_radius * math.sqrt(density_threshold / count), 0.01)
+
+def density_grid_arrays(points):
+    # points binned on the x / y plane, one box per non-empty cell, height and color by count
+    counts, x_edges, y_edges = np.histogram2d(points[:, 0], points[:, 1], bins=SCATTER_DENSITY_GRID, range=[[-5, 5], [-5, 5]])
+    cell_x, cell_y = np.nonzero(counts)
+    cell_counts = counts[cell_x, cell_y]
+    share = scaling.symlog(cell_counts) / np.log1p(cell_counts.max())
+
+    vertices, faces, cell_index = chart_mesh.box_arrays(
+        x_edges[cell_x], x_edges[cell_x + 1],
+        y_edges[cell_y], y_edges[cell_y + 1],
+        0.0, share * 5)
+    # blue for sparse cells through to red for the densest ones
+    cell_colors = np.column_stack((share, np.zeros_like(share), 1 - share, np.ones_like(share)))
+    return vertices, faces, cell_index, np.repeat(cell_colors, 8, axis=0)
+
+def histogram_captions(histogram, anim_start_frame, size=10.0, ticks=10):
+    # bin edge values along the x axis (and the y axis of a 2D histogram), at most ticks + 1 each
+    positions, captions = [], []
+    for axis, edges in enumerate(histogram.edges):
+        step = max(1, int(math.ceil((len(edges) - 1) / ticks)))
+        shown = edges[::step]
+        along = -size / 2 + size * (np.arange(len(edges))[::step] / (len(edges) - 1))
+        across = np.full(len(shown), -size / 2 - 1 if len(histogram.edges) == 2 else -1.5)
+        if axis == 0:
+            positions.append(np.column_stack((along, across, np.zeros(len(shown)))))
+        else:
+            positions.append(np.column_stack((across, along, np.zeros(len(shown)))))
+        captions += [f"{value:.3g}" for value in shown]
+    positions = np.concatenate(positions)
+    return positions, captions, np.full(len(captions), anim_start_frame)
+
+def pie_captions(names, values, middles, radius, anim_start_frame, anim_length_data):
+    # "name 12%" just outside the middle of every non-empty slice
+    total = values.sum()
+    shown = np.nonzero(values > 0)[0] if total > 0 else np.zeros(0, dtype=int)
+    positions = np.column_stack((np.cos(middles[shown]) * (radius + 1), np.sin(middles[shown]) * (radius + 1), np.zeros(len(shown))))
+    captions = [f"{names[i]} {values[i] / total:.0%}" for i in shown]
+    return positions, captions, anim_start_frame + anim_length_data * shown
+
+def pie_geometry(names, values, radius, inner_radius, height):
+    # vertices, faces, face sizes, slice index, slice direction and per-vertex slice color
+    vertices, faces, face_sizes, slice_index, directions, middles = chart_mesh.pie_arrays(values, radius, inner_radius, height)
+    colors = chart_mesh.pie_colors(len(values))[slice_index]
+    return vertices, faces, face_sizes, slice_index, directions, colors, middles
+
+def remove_objects(names):
+    # delete the named objects that still exist, the scatter charts clear the scene this way
+    # at the end of their build
+    for name in names:
+        ob = bpy.data.objects.get(name)
+        if ob is not None:
+            bpy.data.objects.remove(ob, do_unlink=True)
+
+
 class DatasetHelper:
 
     def __init__(self, filepath):
         self.filepath = filepath
+        self.memory = None  # what the last column load kept in memory, see memory_text
+        self.streamable = self.filepath.endswith('.csv') or self.filepath.endswith('.xlsx')
         if self.filepath.endswith('.csv'):
-            self.df = pd.read_csv(self.filepath, nrows=1000)
+            self.df = loader.downcast(pd.read_csv(self.filepath, nrows=PREVIEW_ROWS))
         elif self.filepath.endswith('.xlsx'):
-            self.df = pd.read_excel(self.filepath, nrows=1000)
+            self.df = loader.downcast(next(loader.iter_excel_chunks(self.filepath, chunksize=PREVIEW_ROWS), pd.DataFrame()))
         else:
             self.df = pd.DataFrame({
                 'A': [1, 2, 3],
@@ -63,96 +425,244 @@ class DatasetHelper:
 
     def get_all_columns(self):
         return self.df.columns
+
+    def iter_load_columns(self, columns):
+        # stream only the given positional columns of the whole file
+        # yields (None, message) build steps and returns the frame
+        if not self.streamable:
+            return self.df.iloc[:, columns]
+        # a chart keeps only its own columns, as the smallest dtypes that hold them: the sidecar
+        # stores them that way and maps them, a direct parse is downcast after reading
+        mapped = True
+        with timing.span("load"):
+            try:
+                frame = yield from load_steps(sidecar.iter_load_columns(self.filepath, columns))
+            except OSError as e:
+                # the sidecar folder is not writable, parse the file directly
+                print("Sidecar cache unavailable:", e)
+                frame = yield from load_steps(loader.iter_stream_columns(self.filepath, columns))
+                frame = loader.downcast(frame)
+                mapped = False
+        self.memory = loader.memory_text(len(columns), len(self.df.columns), len(frame), loader.frame_bytes(frame),
+                                         loader.float64_bytes(frame), mapped)
+        print("Loaded", self.memory)
+        return frame
+
+    def load_columns(self, columns):
+        return run_build(self.iter_load_columns(columns))
+
+    def iter_chunk_reader(self, columns):
+        # a function returning fresh float chunks (one array per column) of the given positional
+        # columns, for passes over files that should not be loaded whole. Sidecar columns are
+        # memory maps read a slice at a time, without a sidecar the file is parsed in chunks
+        if not self.streamable:
+            arrays = [pd.to_numeric(self.df.iloc[:, c], errors='coerce').to_numpy(dtype=np.float64) for c in columns]
+            return lambda: binning.array_chunks(arrays, loader.CHUNK_ROWS)
+        with timing.span("load"):
+            try:
+                folder, meta = yield from load_steps(sidecar.iter_ensure(self.filepath, columns))
+            except OSError as e:
+                print("Sidecar cache unavailable:", e)
+                unique = sorted(set(columns))
+
+                def read_chunks():
+                    for chunk in loader.iter_chunks(self.filepath, usecols=unique):
+                        yield tuple(pd.to_numeric(chunk.iloc[:, unique.index(c)], errors='coerce').to_numpy(dtype=np.float64) for c in columns)
+                return read_chunks
+        arrays = []
+        for c in columns:
+            column = meta['columns'][c]
+            if column['kind'] != 'float':
+                raise ValueError(f"Column {column['name']!r} is not numeric")
+            arrays.append(sidecar.open_column(folder, meta, c).to_numpy())
+        return lambda: binning.array_chunks(arrays, loader.CHUNK_ROWS)
+
+    def iter_bin_columns(self, columns, bins):
+        # streaming 1D / 2D bin counts of the given positional columns, returns a binning.Histogram
+        read_chunks = yield from self.iter_chunk_reader(columns)
+        with timing.span("bin"):
+            return (yield from load_steps(binning.iter_histogram(read_chunks, len(columns), bins), bin_message))
+
+    def tag_chart(self, kind, params, **roles):
+        # remember what a chart was built from so live reload can update it in place
+        # roles: role name -> object, 'main' is the object carrying the data
+        if not self.streamable or params is None:
+            return
+        chart_id = f"{kind}_{time.time_ns()}"
+        for role, ob in roles.items():
+            ob["chart_id"] = chart_id
+            ob["chart_kind"] = kind
+            ob["chart_role"] = role
+            ob["chart_source"] = os.path.abspath(self.filepath)
+            ob["chart_params"] = json.dumps(params)
+
+    def update_chart(self, objects):
+        # rewrite the objects of one tagged chart (role -> object) from the current file contents
+        # nothing is created or deleted, meshes, curves and captions are rewritten in place
+        main = objects['main']
+        getattr(self, "update_" + main["chart_kind"])(objects, **json.loads(main["chart_params"]))
+        for ob in objects.values():
+            ob.data.update_tag()
+            ob.update_tag()
+
+    def update_line_graph(self, objects, data_column, month_column, currency_symbol, anim_start_frame, anim_length_data, graph_start_position, distance_bet_points, point_budget, decimation):
+        frame = self.load_columns([data_column - 1, month_column - 1])
+        kept, x_positions, display_data = line_series(frame, point_budget, decimation, graph_start_position, distance_bet_points)
+        # one object per marker, added or removed when the point count changed
+        roles = self.sync_markers(objects, len(kept), anim_start_frame, anim_length_data)
+        set_curve_points(objects['main'].data, x_positions, display_data)
+        for role, x, z in zip(roles, x_positions, display_data):
+            objects[role].location = (x, 0, z)
+
+        if 'labels' in objects:
+            labels.update_labels(objects['labels'], *line_captions(frame, kept, x_positions, display_data, currency_symbol, anim_start_frame, anim_length_data))
+
+        axis_length = graph_start_position + distance_bet_points * (len(kept) - 1) + 2
+        axis_height = max(display_data) + 3
+        if 'x_axis' in objects:
+            objects['x_axis'].dimensions = [axis_length, 0.05, 0.05]
+            objects['x_axis'].location = [axis_length / 2, 0, 0]
+        if 'x_arrow' in objects:
+            objects['x_arrow'].location = [axis_length, 0, 0]
+        if 'z_axis' in objects:
+            objects['z_axis'].dimensions = [0.05, 0.05, axis_height]
+            objects['z_axis'].location = [0, 0, axis_height / 2]
+        if 'z_arrow' in objects:
+            objects['z_arrow'].location = [0, 0, axis_height]
+
+    def sync_markers(self, objects, count, anim_start_frame, anim_length_data):
+        # make the line graph have count markers: extra ones are deleted, missing ones are copies
+        # of the first marker with their own grow keys. Returns the marker roles in point order
+        roles = sorted((role for role in objects if role.startswith("marker_")), key=lambda role: int(role[7:]))
+        for role in roles[count:]:
+            bpy.data.objects.remove(objects.pop(role), do_unlink=True)
+        if len(roles) < count:
+            if not roles:
+                raise ValueError("the line graph has no markers left to copy, rebuild it")
+            template = objects[roles[0]]
+            for i in range(len(roles), count):
+                marker = template.copy()
+                marker.animation_data_clear()
+                for collection in template.users_collection:
+                    collection.objects.link(marker)
+                marker["chart_role"] = f"marker_{i}"
+                start = anim_start_frame + anim_length_data * i
+                keyframes.animate(marker, "scale", [start + 4, start + 6], [[0, 0, 0], [1, 1, 1]])
+                objects[f"marker_{i}"] = marker
+        return [f"marker_{i}" for i in range(count)]
+
+    def update_bar_graph(self, objects, x_column, y_column, anim_start_frame, anim_length_data):
+        frame = self.load_columns([x_column, y_column])
+        vertices, faces, bar_index, captions = bar_arrays(frame, anim_start_frame, anim_length_data)
+        mesh = objects['main'].data
+        chart_mesh.update_mesh(mesh, vertices, faces)
+        chart_mesh.set_attribute(mesh, "bar_index", bar_index, 'INT', 'POINT')
+        if 'labels' in objects:
+            labels.update_labels(objects['labels'], *captions)
+
+    def update_scatter_bar_graph(self, objects, x_column, y_column):
+        frame = self.load_columns([x_column - 1, y_column - 1])
+        mesh = objects['main'].data
+        points, colors = spike_points(frame, chart_mesh.get_attribute(mesh, "color", 'FLOAT_COLOR'))
+        chart_mesh.update_mesh(mesh, points)
+        chart_mesh.set_attribute(mesh, "height", points[:, 2], 'FLOAT', 'POINT')
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+
+    def update_scatter_graph(self, objects, x_column, y_column, anim_start_frame, point_radius, density_threshold, density_mode):
+        frame = self.load_columns([x_column - 1, y_column - 1])
+        mesh = objects['main'].data
+        points, colors = scatter_points(frame, chart_mesh.get_positions(mesh)[:, 2])
+        chart_mesh.update_mesh(mesh, points)
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+        if 'labels' in objects:
+            labels.update_labels(objects['labels'], *scatter_captions(points[:SCATTER_LABEL_LIMIT], anim_start_frame))
+
+    def update_density_scatter_graph(self, objects, x_column, y_column, anim_start_frame, point_radius, density_threshold, density_mode):
+        frame = self.load_columns([x_column - 1, y_column - 1])
+        mesh = objects['main'].data
+        if density_mode == 'grid':
+            points, colors = scatter_points(frame)
+            vertices, faces, cell_index, cell_colors = density_grid_arrays(points)
+            chart_mesh.update_mesh(mesh, vertices, faces)
+            chart_mesh.set_attribute(mesh, "bar_index", cell_index, 'INT', 'POINT')
+            chart_mesh.set_attribute(mesh, "color", cell_colors, 'FLOAT_COLOR', 'POINT')
+            return
+        points, colors = scatter_points(frame, chart_mesh.get_positions(mesh)[:, 2])
+        chart_mesh.update_mesh(mesh, points)
+        chart_mesh.set_attribute(mesh, "radius", np.full(len(points), density_radius(len(points), point_radius, density_threshold)), 'FLOAT', 'POINT')
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+
+    def update_pie_chart(self, objects, names_column, values_column, radius, inner_radius, height, explode, anim_start_frame, anim_length_data):
+        names, values = chart_mesh.pie_values(self.load_columns([names_column - 1, values_column - 1]))
+        vertices, faces, face_sizes, slice_index, directions, colors, middles = pie_geometry(names, values, radius, inner_radius, height)
+        mesh = objects['main'].data
+        chart_mesh.update_mesh(mesh, vertices, faces, face_sizes=face_sizes)
+        chart_mesh.set_attribute(mesh, "slice_index", slice_index, 'INT', 'POINT')
+        chart_mesh.set_attribute(mesh, "slice_direction", directions, 'FLOAT_VECTOR', 'POINT')
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+        if 'labels' in objects:
+            labels.update_labels(objects['labels'], *pie_captions(names, values, middles, radius + explode, anim_start_frame, anim_length_data))
+
+    def update_histogram(self, objects, x_column, y_column, bins, anim_start_frame, anim_length_data):
+        columns = [x_column - 1] if y_column is None else [x_column - 1, y_column - 1]
+        histogram = run_build(self.iter_bin_columns(columns, bins))
+        vertices, faces, bin_index, colors = chart_mesh.histogram_arrays(histogram)
+        mesh = objects['main'].data
+        chart_mesh.update_mesh(mesh, vertices, faces)
+        chart_mesh.set_attribute(mesh, "bar_index", bin_index, 'INT', 'POINT')
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+        if 'labels' in objects:
+            labels.update_labels(objects['labels'], *histogram_captions(histogram, anim_start_frame))
+
+    # Every chart has a build_* generator that yields (fraction, message) steps so the
+    # modal operators can spread the work over timer ticks, and a create_* wrapper that
+    # runs it to the end in one go.
+
+    def create_line_graph(self, *args, **kwargs):
+        return run_build(self.build_line_graph(*args, **kwargs), "Line graph")
+
+    def create_bar_graph(self, *args, **kwargs):
+        return run_build(self.build_bar_graph(*args, **kwargs), "Bar chart")
+
+    def create_scatter_bar_graph(self, *args, **kwargs):
+        return run_build(self.build_scatter_bar_graph(*args, **kwargs), "Scatter bar chart")
+
+    def create_scatter_graph(self, *args, **kwargs):
+        return run_build(self.build_scatter_graph(*args, **kwargs), "Scatter plot")
+
+    def create_histogram(self, *args, **kwargs):
+        return run_build(self.build_histogram(*args, **kwargs), "Histogram")
+
+    def create_pie_chart(self, *args, **kwargs):
+        return run_build(self.build_pie_chart(*args, **kwargs), "Pie chart")
     
-    def create_line_graph(self, data_column, month_column, currency_symbol, anim_start_frame=2, anim_length_data=20, graph_start_position=1, distance_bet_points=2):
+    def build_line_graph(self, data_column, month_column, currency_symbol, anim_start_frame=2, anim_length_data=20, graph_start_position=1, distance_bet_points=2, point_budget=LINE_POINT_BUDGET, decimation='lttb'):
         context = bpy.context
         scene = context.scene
 
         # Save the current location of the 3D cursor
         saved_cursor_loc = scene.cursor.location.xyz
 
-        data_list = self.df.iloc[:, data_column - 1]
-        month_list = self.df.iloc[:, month_column - 1]
-        number_of_data = len(month_list)
-        data_height_mean = sum(data_list) / number_of_data
+        frame = yield from self.iter_load_columns([data_column - 1, month_column - 1])
+        yield 0.1, "Decimating"
+        timing.phase("normalise")
+        kept, x_positions, display_data = line_series(frame, point_budget, decimation, graph_start_position, distance_bet_points)
+        number_of_data = len(kept)
 
         # Initialize the variables.
-        position_count = graph_start_position
         anim_length_text = anim_length_data / 2
         anim_curr_frame = anim_start_frame
         anim_end_frame = anim_start_frame + anim_length_data * (number_of_data - 1)
 
-        normalized_data = []
-        for data in data_list:
-            normalized_data.append(data * 10 / data_height_mean)
-
-        data_height_mean = sum(normalized_data) / number_of_data
-        data_height_min = min(normalized_data)
-
-        display_data = []
-        if data_height_min > abs(data_height_mean - data_height_min):
-            for data in normalized_data:
-                display_data.append(data - data_height_min + abs(data_height_mean - data_height_min))
-        else:
-            for data in normalized_data:
-                display_data.append(data)
-
-        # Create a new material for the curve
-        material_1 = bpy.data.materials.new(name="anim_material_1")
-        material_1.use_nodes = True
-        if material_1.node_tree:
-            material_1.node_tree.links.clear()
-            material_1.node_tree.nodes.clear()
-        nodes = material_1.node_tree.nodes
-        links = material_1.node_tree.links
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        shader = nodes.new(type='ShaderNodeEmission')
-        nodes["Emission"].inputs['Color'].default_value = (1.0, 0.3, 1.0, 1)
-        nodes["Emission"].inputs['Strength'].default_value = 1.5
-        links.new(shader.outputs[0], output.inputs[0])
-
-        # Create a new material for the text
-        material_2 = bpy.data.materials.new(name="anim_material_2")
-        material_2.use_nodes = True
-        if material_2.node_tree:
-            material_2.node_tree.links.clear()
-            material_2.node_tree.nodes.clear()
-        nodes = material_2.node_tree.nodes
-        links = material_2.node_tree.links
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        shader = nodes.new(type='ShaderNodeEmission')
-        nodes["Emission"].inputs['Strength'].default_value = 3.0
-        links.new(shader.outputs[0], output.inputs[0])
-
-        # Create a new material for the x-axis
-        material_3 = bpy.data.materials.new(name="anim_material_3")
-        material_3.use_nodes = True
-        if material_3.node_tree:
-            material_3.node_tree.links.clear()
-            material_3.node_tree.nodes.clear()
-        nodes = material_3.node_tree.nodes
-        links = material_3.node_tree.links
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        shader = nodes.new(type='ShaderNodeEmission')
-        nodes["Emission"].inputs['Color'].default_value = (1.0, 0.0, 0.0, 1)
-        nodes["Emission"].inputs['Strength'].default_value = 1.5
-        links.new(shader.outputs[0], output.inputs[0])
-
-        # Create a new material for the z-axis
-        material_4 = bpy.data.materials.new(name="anim_material_4")
-        material_4.use_nodes = True
-        if material_4.node_tree:
-            material_4.node_tree.links.clear()
-            material_4.node_tree.nodes.clear()
-        nodes = material_4.node_tree.nodes
-        links = material_4.node_tree.links
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        shader = nodes.new(type='ShaderNodeEmission')
-        nodes["Emission"].inputs['Color'].default_value = (0.0, 0.0, 1.0, 1)
-        nodes["Emission"].inputs['Strength'].default_value = 1.5
-        links.new(shader.outputs[0], output.inputs[0])
+        # Shared materials for the curve, the text, the x-axis and the z-axis
+        timing.phase("materials")
+        material_1 = materials.emission((1.0, 0.3, 1.0, 1), 1.5)
+        material_2 = materials.emission((1.0, 1.0, 1.0, 1), 3.0)
+        material_3 = materials.emission((1.0, 0.0, 0.0, 1), 1.5)
+        material_4 = materials.emission((0.0, 0.0, 1.0, 1), 1.5)
 
         # Create a curve and add it to the scene
+        timing.phase("geometry")
         curve = bpy.data.curves.new(name="data_curve", type='CURVE')
         curve.dimensions = '3D'
         curve_path = bpy.data.objects.new("my_curve", curve)
@@ -160,9 +670,8 @@ class DatasetHelper:
         bezier_curve = curve.splines.new('BEZIER') # other options: 'NURBS', 'POLY', 'BSPLINE'
         bezier_curve.bezier_points.add(number_of_data - 1)
 
-        for bezier, data in zip(bezier_curve.bezier_points, display_data):
-            bezier.co = (position_count, 0, data)
-            position_count = position_count + distance_bet_points
+        for bezier, position, data in zip(bezier_curve.bezier_points, x_positions, display_data):
+            bezier.co = (position, 0, data)
 
         context.scene.collection.objects.link(curve_path)
         curve_path.select_set(True)
@@ -171,6 +680,7 @@ class DatasetHelper:
         bpy.ops.curve.select_all(action='SELECT')
         bpy.ops.curve.handle_type_set(type='AUTOMATIC')
         bpy.ops.object.editmode_toggle()
+        yield 0.2, "Curve built"
 
         # Assign the yellow material created above
         curve_path.data.materials.append(material_1)
@@ -188,170 +698,56 @@ class DatasetHelper:
         follow_path.forward_axis = 'TRACK_NEGATIVE_Z'
         follow_path.up_axis = 'UP_Y'
         follow_path.use_fixed_location = True
-        follow_path.offset_factor = 0.0
-        follow_path.keyframe_insert("offset_factor", frame=anim_start_frame)
-        follow_path.offset_factor = 1.0
-        follow_path.keyframe_insert("offset_factor", frame=anim_end_frame)
-
-        fcurves = sphere.animation_data.action.fcurves
-        for fcurve in fcurves:
-            for kf in fcurve.keyframe_points:
-                kf.interpolation = 'LINEAR'
-                kf.easing = 'AUTO'
+        keyframes.animate(sphere, follow_path.path_from_id("offset_factor"), [anim_start_frame, anim_end_frame], [0.0, 1.0], 'LINEAR')
         bpy.ops.constraint.followpath_path_animate(constraint=follow_path.name)
 
-        def geometry_nodes_node_group(start_frame, end_frame, material):
-
-            geometry_nodes = bpy.data.node_groups.new(type="GeometryNodeTree", name="Geometry Nodes")
-
-            if bpy.app.version[0] >= 4:
-                geometry_nodes.interface.new_socket('NodeInterfaceInput', in_out='INPUT', socket_type='NodeSocketGeometry')
-            else:
-                geometry_nodes.inputs.new("NodeSocketGeometry", "Geometry")
-
-            group_input = geometry_nodes.nodes.new("NodeGroupInput")
-            group_input.location = (-340.0, 0.0)
-            group_input.width, group_input.height = 140.0, 100.0
-
-            if bpy.app.version[0] >= 4:
-                geometry_nodes.interface.new_socket('NodeInterfaceOutput', in_out='OUTPUT', socket_type='NodeSocketGeometry')
-            else:
-                geometry_nodes.outputs.new("NodeSocketGeometry", "Geometry")
-
-            group_output = geometry_nodes.nodes.new("NodeGroupOutput")
-            group_output.location = (609.8951416015625, 0.0)
-            group_output.width, group_output.height = 140.0, 100.0
-
-            trim_curve = geometry_nodes.nodes.new("GeometryNodeTrimCurve")
-            trim_curve.location = (-63.592041015625, 22.438913345336914)
-            trim_curve.width, trim_curve.height = 140.0, 100.0
-            trim_curve.mode = 'FACTOR'
-            trim_curve.inputs[1].default_value = True
-            trim_curve.inputs[2].default_value = 0.0
-            trim_curve.inputs[3].default_value = 0.0
-            trim_curve.inputs[3].keyframe_insert('default_value', frame=start_frame)
-            trim_curve.inputs[3].default_value = 1.0
-            trim_curve.inputs[3].keyframe_insert('default_value', frame=end_frame)
-
-            curve_to_mesh = geometry_nodes.nodes.new("GeometryNodeCurveToMesh")
-            curve_to_mesh.location = (169.89512634277344, 18.004777908325195)
-            curve_to_mesh.width, curve_to_mesh.height = 140.0, 100.0
-            curve_to_mesh.inputs[2].default_value = False
-
-            curve_circle = geometry_nodes.nodes.new("GeometryNodeCurvePrimitiveCircle")
-            curve_circle.location = (-340.7394104003906, -86.51416015625)
-            curve_circle.width, curve_circle.height = 140.0, 100.0
-            curve_circle.mode = 'RADIUS'
-            curve_circle.inputs[0].default_value = 32
-            curve_circle.inputs[1].default_value = (-1.0, 0.0, 0.0)
-            curve_circle.inputs[2].default_value = (0.0, 1.0, 0.0)
-            curve_circle.inputs[3].default_value = (1.0, 0.0, 0.0)
-            curve_circle.inputs[4].default_value = 0.03
-
-            set_material = geometry_nodes.nodes.new("GeometryNodeSetMaterial")
-            set_material.location = (389.71429443359375, 25.688528060913086)
-            set_material.width, set_material.height = 140.0, 100.0
-            set_material.inputs[1].default_value = True
-            set_material.inputs[2].default_value = material
-
-            geometry_nodes.links.new(set_material.outputs[0], group_output.inputs[0])
-            geometry_nodes.links.new(group_input.outputs[0], trim_curve.inputs[0])
-            geometry_nodes.links.new(trim_curve.outputs[0], curve_to_mesh.inputs[0])
-            geometry_nodes.links.new(curve_circle.outputs[0], curve_to_mesh.inputs[1])
-            geometry_nodes.links.new(curve_to_mesh.outputs[0], set_material.inputs[0])
-
-            fcurves = geometry_nodes.animation_data.action.fcurves
-            for fcurve in fcurves:
-                for kf in fcurve.keyframe_points:
-                    kf.interpolation = 'LINEAR'
-                    kf.easing = 'AUTO'
-
-            return geometry_nodes
-
-        geometry_nodes = geometry_nodes_node_group(anim_start_frame, anim_end_frame, material_1)
-        modifier = curve_path.modifiers.new("Geometry Nodes Temp", "NODES")
+        # Sweep the curve with the shared tube node group and animate its trim end
+        geometry_nodes = chart_mesh.line_tube_node_group()
+        modifier = curve_path.modifiers.new("Line Graph Tube", "NODES")
         modifier.node_group = geometry_nodes
-
-        # Create the text fields in a loop
+        chart_mesh.set_modifier_input(modifier, geometry_nodes, "Radius", 0.03)
+        chart_mesh.set_modifier_input(modifier, geometry_nodes, "Resolution", 32)
+        chart_mesh.set_modifier_input(modifier, geometry_nodes, "Material", material_1)
+        trim = chart_mesh.set_modifier_input(modifier, geometry_nodes, "Trim", 0.0)
+        keyframes.animate(curve_path, f'{modifier.path_from_id()}["{trim}"]', [anim_start_frame, anim_end_frame], [0.0, 1.0], 'LINEAR')
+
+        # Create the markers in a loop
+        timing.phase("markers")
         data_counter = 0
         anim_curr_frame = anim_start_frame
+        markers = []
 
         while data_counter < number_of_data:
-
-            text_month = str(month_list[data_counter])
-            text_data = currency_symbol + str(data_list[data_counter])
+            yield 0.2 + 0.6 * data_counter / number_of_data, "Adding markers"
 
             # Add a sphere, set its location and animate its size
             bpy.ops.mesh.primitive_uv_sphere_add(radius=0.15)
             sph = context.active_object
-            sph.location = [graph_start_position + distance_bet_points * data_counter, 0, display_data[data_counter]]
-            sph.scale = [0, 0, 0]
-            sph.keyframe_insert(data_path="scale", frame=anim_curr_frame + 4)
-            sph.scale = [1, 1, 1]
-            sph.keyframe_insert(data_path="scale", frame=anim_curr_frame + 6)
+            sph.location = [x_positions[data_counter], 0, display_data[data_counter]]
+            keyframes.animate(sph, "scale", [anim_curr_frame + 4, anim_curr_frame + 6], [[0, 0, 0], [1, 1, 1]])
 
             # Assign the yellow material created above
             sph.data.materials.append(material_1)
-
-            # Add the 1st caption
-            bpy.ops.object.text_add()
-            ob = bpy.context.object
-            ob.data.body = text_month
-            ob.data.align_x = "CENTER"
-            ob.data.align_y = "CENTER"
-            ob.data.extrude = 0.01
-
-            ob.location = [graph_start_position + distance_bet_points * data_counter, 0, display_data[data_counter] + 1.5]
-            ob.rotation_euler = [math.radians(90), 0, 0]
-
-            # Animate the caption horizontally
-            ob.scale = [0, 0, 0]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame - 1)
-            ob.scale = [0, 0.5, 0.5]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame)
-            anim_curr_frame += anim_length_text
-            ob.scale = [0.5, 0.5, 0.5]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame)
-
-            # Assign the white material created above
-            ob.data.materials.append(material_2)
-
-            anim_curr_frame -= anim_length_text
-
-            # Add the 2nd caption
-            bpy.ops.object.text_add()
-            ob = bpy.context.object
-            ob.data.body = text_data
-            ob.data.align_x = "CENTER"
-            ob.data.align_y = "CENTER"
-            ob.data.extrude = 0.01
-
-            ob.location = [graph_start_position + distance_bet_points * data_counter, 0, display_data[data_counter] + 1]
-            ob.rotation_euler = [math.radians(90), 0, 0]
-
-            # Animate the caption horizontally
-            ob.scale = [0, 0, 0]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame - 1)
-            ob.scale = [0, 0.5, 0.5]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame)
-            anim_curr_frame += anim_length_text
-            ob.scale = [0.5, 0.5, 0.5]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame)
-
-            # Assign the white material created above
-            ob.data.materials.append(material_2)
+            markers.append(sph)
 
             # Increase the loop counters
             data_counter += 1
-            anim_curr_frame -= anim_length_text
             anim_curr_frame += anim_length_data
 
+        # Month captions above the value captions, both drawn by one labels object
+        yield 0.8, "Adding captions"
+        timing.phase("labels")
+        label_positions, captions, label_starts = line_captions(frame, kept, x_positions, display_data, currency_symbol, anim_start_frame, anim_length_data)
+        captions_ob = labels.create_labels("captions", label_positions, captions, label_starts, anim_length_text, material_2)
+
         # Add x-axis and set its dimensions
+        timing.phase("axes")
         bpy.ops.mesh.primitive_cube_add()
         ob = context.active_object
         axis_length = graph_start_position + distance_bet_points * (number_of_data - 1) + 2
         ob.dimensions = [axis_length, 0.05, 0.05]
         ob.location = [axis_length / 2, 0, 0]
+        x_axis = ob
 
         # Assign the red material created above
         ob.data.materials.append(material_3)
@@ -368,6 +764,7 @@ class DatasetHelper:
         # Add z-axis and set its dimensions
         bpy.ops.mesh.primitive_cube_add()
         ob = context.active_object
+        z_axis = ob
         axis_height = max(display_data) + 3
         ob.dimensions = [0.05, 0.05, axis_height]
         ob.location = [0, 0, axis_height / 2]
@@ -383,125 +780,61 @@ class DatasetHelper:
         # Assign the blue material created above
         cyl2.data.materials.append(material_4)
 
+        # remember what the chart was built from so live reload can update it in place
+        roles = {f"marker_{i}": marker for i, marker in enumerate(markers)}
+        self.tag_chart('line_graph', dict(
+            data_column=data_column, month_column=month_column, currency_symbol=currency_symbol,
+            anim_start_frame=anim_start_frame, anim_length_data=anim_length_data, graph_start_position=graph_start_position,
+            distance_bet_points=distance_bet_points, point_budget=point_budget, decimation=decimation,
+        ), main=curve_path, labels=captions_ob, x_axis=x_axis, x_arrow=cyl1, z_axis=z_axis, z_arrow=cyl2, **roles)
+
         # Set the 3D cursor back to where it was
         bpy.context.scene.cursor.location = saved_cursor_loc
 
         return {'FINISHED'}
     
-    def create_bar_graph(self, x_column, y_column, symbol, anim_start_frame=2, anim_length_data=20, graph_start_position=1, distance_bet_points=2):
+    def build_bar_graph(self, x_column, y_column, symbol, anim_start_frame=2, anim_length_data=20, graph_start_position=1, distance_bet_points=2):
         context = bpy.context
         scene = context.scene
         saved_cursor_loc = scene.cursor.location.xyz
         bar_spacing = 1.5
         bar_width = 1
-        readout = self.df.iloc[:, [x_column, y_column]].values.tolist()
-        # make y log scale
-        for i in range(len(readout)):
-            readout[i][1] = math.log(readout[i][1])
+        frame = yield from self.iter_load_columns([x_column, y_column])
+        yield 0.2, "Building bars"
+        timing.phase("normalise")
+        vertices, faces, bar_index, captions = bar_arrays(frame, anim_start_frame, anim_length_data, bar_spacing, bar_width)
 
         # [[names, values],[names, values],[names, values]] format
         # generate bars with names and heights on x axis. Height should be log scale
         # generate text on top of each bar with the value
 
-        # Create a new material for the bars
-        material_1 = bpy.data.materials.new(name="anim_material_1")
-        material_1.use_nodes = True
-        if material_1.node_tree:
-            material_1.node_tree.links.clear()
-            material_1.node_tree.nodes.clear()
-        nodes = material_1.node_tree.nodes
-        links = material_1.node_tree.links
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        shader = nodes.new(type='ShaderNodeEmission')
-        nodes["Emission"].inputs['Color'].default_value = (1.0, 0.3, 1.0, 1)
-        nodes["Emission"].inputs['Strength'].default_value = 1.5
-        links.new(shader.outputs[0], output.inputs[0])
-        
-        # Create a new material for the text
-        material_2 = bpy.data.materials.new(name="anim_material_2")
-        material_2.use_nodes = True
-        if material_2.node_tree:
-            material_2.node_tree.links.clear()
-            material_2.node_tree.nodes.clear()
-        nodes = material_2.node_tree.nodes
-        links = material_2.node_tree.links
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        shader = nodes.new(type='ShaderNodeEmission')
-        nodes["Emission"].inputs['Strength'].default_value = 3.0
-        links.new(shader.outputs[0], output.inputs[0])
-
-        # Create a new material for the x-axis
-        material_3 = bpy.data.materials.new(name="anim_material_3")
-        material_3.use_nodes = True
-        if material_3.node_tree:
-            material_3.node_tree.links.clear()
-            material_3.node_tree.nodes.clear()
-        nodes = material_3.node_tree.nodes
-        links = material_3.node_tree.links
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        shader = nodes.new(type='ShaderNodeEmission')
-        nodes["Emission"].inputs['Color'].default_value = (1.0, 0.0, 0.0, 1)
-        nodes["Emission"].inputs['Strength'].default_value = 1.5
-        links.new(shader.outputs[0], output.inputs[0])
-
-        # Create a new material for the z-axis
-        material_4 = bpy.data.materials.new(name="anim_material_4")
-        material_4.use_nodes = True
-        if material_4.node_tree:
-            material_4.node_tree.links.clear()
-            material_4.node_tree.nodes.clear()
-        nodes = material_4.node_tree.nodes
-        links = material_4.node_tree.links
-        output = nodes.new(type='ShaderNodeOutputMaterial')
-        shader = nodes.new(type='ShaderNodeEmission')
-        nodes["Emission"].inputs['Color'].default_value = (0.0, 0.0, 1.0, 1)
-        nodes["Emission"].inputs['Strength'].default_value = 1.5
-        links.new(shader.outputs[0], output.inputs[0])
-
-        # Create the bars in a loop
-        data_counter = 0
-        anim_curr_frame = anim_start_frame
-        for a in readout:
-            name = a[0]
-            value = round(a[1],1)
-            # Add a cube, set its location and animate its size, make height log scale on positive z axis
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(data_counter * bar_spacing, 0, 0))
-            # set the 3d cursor to the 0,0,0
-            bpy.context.scene.cursor.location = (0, 0, 0)
-            # set origin to 3d cursor
-            bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
-            cube = context.active_object
-            cube.scale = [bar_width, bar_width, 0] # start with 0 height
-            cube.keyframe_insert(data_path="scale", frame=anim_curr_frame + 4)
-            # scale z axis to 5
-            cube.scale = [bar_width, bar_width, value] # end with the value
-            cube.keyframe_insert(data_path="scale", frame=anim_curr_frame + 6)
-            # Assign the yellow material created above
-            cube.data.materials.append(material_1)
-            # Add the caption
-            bpy.ops.object.text_add()
-            ob = bpy.context.object
-            ob.data.body = str(name)
-            ob.data.align_x = "CENTER"
-            ob.data.align_y = "CENTER"
-            # put text above the bar
-            ob.data.extrude = 0.01
-            ob.location = [data_counter * bar_spacing, 0, -2] # [x, y, z] # 
-            ob.rotation_euler = [math.radians(90), 0, 0]
-            # Animate the caption horizontally
-            ob.scale = [0, 0, 0]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame - 1)
-            ob.scale = [0, 0.5, 0.5]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame)
-            anim_curr_frame += anim_length_data
-            ob.scale = [0.5, 0.5, 0.5]
-            ob.keyframe_insert(data_path="scale", frame=anim_curr_frame)
-            # Assign the white material created above
-            ob.data.materials.append(material_2)
-            # Increase the loop counters
-            data_counter += 1
-            anim_curr_frame -= anim_length_data
-            anim_curr_frame += anim_length_data
+        # Shared materials for the bars and the text
+        timing.phase("materials")
+        material_1 = materials.emission((1.0, 0.3, 1.0, 1), 1.5)
+        material_2 = materials.emission((1.0, 1.0, 1.0, 1), 3.0)
+
+        # Build every bar as a box of one mesh, the origin stays at 0,0,0
+        timing.phase("geometry")
+        mesh = chart_mesh.mesh_from_arrays("bars", vertices, faces)
+        chart_mesh.set_attribute(mesh, "bar_index", bar_index, 'INT', 'POINT')
+        # Assign the yellow material created above
+        mesh.materials.append(material_1)
+        bars = chart_mesh.link_object("bars", mesh)
+
+        # Bar i grows from 0 to its value between frames start + i * step + 4 and + 6
+        node_group = chart_mesh.bar_grow_node_group()
+        modifier = bars.modifiers.new("Bar Grow", "NODES")
+        modifier.node_group = node_group
+        chart_mesh.set_modifier_input(modifier, node_group, "Start", float(anim_start_frame + 4))
+        chart_mesh.set_modifier_input(modifier, node_group, "Step", float(anim_length_data))
+        chart_mesh.set_modifier_input(modifier, node_group, "Duration", 2.0)
+
+        # Captions under the bars, all drawn by one labels object
+        yield 0.7, "Adding captions"
+        timing.phase("labels")
+        captions_ob = labels.create_labels("bar_captions", *captions, anim_length_data, material_2)
+        self.tag_chart('bar_graph', dict(x_column=x_column, y_column=y_column, anim_start_frame=anim_start_frame, anim_length_data=anim_length_data),
+                       main=bars, labels=captions_ob)
 
         # Add x-axis and set its dimensions
         # bpy.ops.mesh.primitive_cube_add(size=1, location=(data_counter * bar_spacing, 0, 0))
@@ -515,86 +848,44 @@ class DatasetHelper:
             
         return {'FINISHED'}
 
-    def create_scatter_bar_graph(self, x_column, y_column, anim_start_frame=2, anim_length_data=100, graph_start_position=1):
+    def build_scatter_bar_graph(self, x_column, y_column, anim_start_frame=2, anim_length_data=100, graph_start_position=1):
         # create a histogram graph with  x and y columns of the dataframe with a z axis width of .2 
         context = bpy.context
         scene = context.scene
-        # delete all objects
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete()
+        # the chart replaces every object of the scene, they are deleted once it is built so a
+        # cancelled build leaves the scene as it was
+        previous = set(scene.objects.keys())
         saved_cursor_loc = scene.cursor.location.xyz
         # generate a plane with -5 to 5 range
         context.scene.cursor.location = (0, 0, 0)
 
         # generate a maxtrix of data from x and y columns of the dataframe with a z axis width of .2
-        x = self.df.iloc[:, x_column - 1]
-        y = self.df.iloc[:, y_column - 1]
-        z = [random.uniform(-5, 5) for i in range(len(x))]
-        # normalize the data to -5 to 5 range
-        x = (x - x.min()) / (x.max() - x.min()) * 10 - 5
-        y = (y - y.min()) / (y.max() - y.min()) * 10 - 5
-
-        # create spikes on the basic of x and y data
-        for ix, iy, iz in zip(x, y, z):
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(ix, iy, 5))
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.subdivide(number_cuts=1)
-            bpy.ops.object.mode_set(mode='OBJECT')
-
-            # bevel modifier
-            bpy.ops.object.modifier_add(type='BEVEL')
-            bpy.context.object.modifiers["Bevel"].width = 3
-            bpy.context.object.modifiers["Bevel"].segments = 1
-            bpy.context.object.modifiers["Bevel"].profile = 0.5
-            # displace modifier
-            bpy.ops.object.modifier_add(type='DISPLACE')
-            bpy.context.object.modifiers["Displace"].strength = 0.2
-            bpy.context.object.modifiers["Displace"].direction = 'Z'
-            bpy.context.object.modifiers["Displace"].texture_coords = 'LOCAL'
-            bpy.context.object.modifiers["Displace"].texture = bpy.data.textures.new(name="Texture", type='CLOUDS')
-            bpy.context.object.modifiers["Displace"].texture.noise_scale = 0.5
-            bpy.context.object.modifiers["Displace"].texture.intensity = 0.5
-            bpy.context.object.modifiers["Displace"].texture.contrast = 0.5
-            bpy.context.object.modifiers["Displace"].texture.saturation = 0.5
-            bpy.context.object.modifiers["Displace"].texture.nabla = 0.5
-            bpy.context.object.modifiers["Displace"].texture.noise_basis = 'BLENDER_ORIGINAL'
-            bpy.context.object.modifiers["Displace"].texture.noise_scale = 0.5
-            bpy.context.object.modifiers["Displace"].texture.noise_type = 'SOFT_NOISE'
-            bpy.context.object.modifiers["Displace"].texture.noise_depth = 1
-            bpy.context.object.modifiers["Displace"].texture.noise_basis = 'BLENDER_ORIGINAL'
-            bpy.context.object.modifiers["Displace"].texture.use_color_ramp = True
-            bpy.context.object.modifiers["Displace"].texture.color_ramp.elements[0].position = 0.0
-            bpy.context.object.modifiers["Displace"].texture.color_ramp.elements[0].color = (0.0, 0.0, 0.0, 1)
-            bpy.context.object.modifiers["Displace"].texture.color_ramp.elements[1].position = 1.0
-            bpy.context.object.modifiers["Displace"].texture.color_ramp.elements[1].color = (1.0, 1.0, 1.0, 1)
-            bpy.context.object.modifiers["Displace"].texture.color_ramp.elements[1].alpha = 1
-            
-            # apply red or blue or green color to the spikes randomly
-            if random.choice([True, False]):
-                bpy.ops.object.material_slot_add()
-                bpy.context.object.material_slots[0].material = bpy.data.materials.new(name="Material")
-                bpy.context.object.material_slots[0].material.diffuse_color = (0, 0, 1, 1)
-            else:
-                bpy.ops.object.material_slot_add()
-                bpy.context.object.material_slots[0].material = bpy.data.materials.new(name="Material")
-                bpy.context.object.material_slots[0].material.diffuse_color = (0, 1, 0, 1)
-            # add keyframes to the spikes
-            bpy.context.object.scale = (0, 0, 0)
-            bpy.context.object.keyframe_insert(data_path="scale", frame=anim_start_frame)
-            bpy.context.object.scale = (1, 1, 1)
-            bpy.context.object.keyframe_insert(data_path="scale", frame=anim_start_frame + 150)
-           
-            
-            # resize the spikes to 5
-            bpy.ops.transform.resize(value=(1, 1, 5))
-            mesh = context.active_object
-            # add a material to the mesh
-            mat = bpy.data.materials.new('histogram_material')
-            mat.diffuse_color = (1, 0.5, 1, 0.5) # blue color
-        # create a material for the mesh
-        mat = bpy.data.materials.new('histogram_material')
-        mat.diffuse_color = (0.5, 0.5, 1, 0.5) # blue color
-        mesh.data.materials.append(mat)
+        frame = yield from self.iter_load_columns([x_column - 1, y_column - 1])
+        yield 0.3, "Building spikes"
+        timing.phase("normalise")
+        points, colors = spike_points(frame)
+
+        # build the spike shape once, then instance it on one point per row
+        timing.phase("geometry")
+        prototype = chart_mesh.spike_prototype(materials.clouds_texture())
+        mesh = chart_mesh.mesh_from_arrays("spikes", points)
+        # spikes are 5 units tall, blue or green at random
+        chart_mesh.set_attribute(mesh, "height", points[:, 2], 'FLOAT', 'POINT')
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+        ob = chart_mesh.link_object("spikes", mesh)
+
+        node_group = chart_mesh.spike_instancer_node_group()
+        modifier = ob.modifiers.new("Spike Instancer", "NODES")
+        modifier.node_group = node_group
+        chart_mesh.set_modifier_input(modifier, node_group, "Prototype", prototype)
+        chart_mesh.set_modifier_input(modifier, node_group, "Material", materials.attribute_color("color", 'INSTANCER'))
+        # add keyframes to the spikes
+        timing.phase("keyframes")
+        grow = chart_mesh.set_modifier_input(modifier, node_group, "Grow", 0.0)
+        keyframes.animate(ob, f'{modifier.path_from_id()}["{grow}"]', [anim_start_frame, anim_start_frame + 150], [0.0, 1.0])
+        self.tag_chart('scatter_bar_graph', dict(x_column=x_column, y_column=y_column), main=ob)
+        remove_objects(previous)
+
         # set the 3d cursor back to where it was
         bpy.context.scene.cursor.location = saved_cursor_loc
         # return the finished message
@@ -602,7 +893,9 @@ class DatasetHelper:
     
         
         
-    def create_scatter_graph(self, x_column, y_column, anim_start_frame=2, anim_length_data=10):
+    def build_scatter_graph(self, x_column, y_column, anim_start_frame=2, anim_length_data=10, instanced=False, density_threshold=SCATTER_DENSITY_THRESHOLD, density_mode='points'):
+        if instanced:
+            return (yield from self.build_instanced_scatter_graph(x_column, y_column, anim_start_frame, anim_length_data, density_threshold, density_mode))
         r = 0.5
         g = 0.5
         b = 0.5
@@ -614,108 +907,508 @@ class DatasetHelper:
         
         context = bpy.context
         scene = context.scene
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete()
+        # the objects already in the scene are deleted once the chart is built
+        previous = set(scene.objects.keys())
         scene.cursor.location = (0, 0, 0)
         bpy.ops.object.light_add(type='SUN', location=(0, 0, sun_height))
         bpy.ops.mesh.primitive_plane_add(size=20, location=(0, 0, plain_height))
         
-        # add a material to plane
-        mat = bpy.data.materials.new('point_material')
-        mat.diffuse_color = (r,g,b,a)
+        # caption material
+        timing.phase("materials")
+        mat = materials.diffuse((r, g, b, a))
         # generate data from x and y columns of the dataframe
-        x = self.df.iloc[:, x_column - 1]
-        y = self.df.iloc[:, y_column - 1]
-        print(x)
-        print(y)
+        frame = yield from self.iter_load_columns([x_column - 1, y_column - 1])
+        timing.phase("normalise")
+        x = frame.iloc[:, 0]
+        y = frame.iloc[:, 1]
         # convert data to float
-        try:
-            x = x.astype(float) 
-            y = y.astype(float)
-            
-            # keep the data in -5 to 5 range
-            x = (x - x.min()) / (x.max() - x.min()) * 10 - 5
-            y = (y - y.min()) / (y.max() - y.min()) * 10 - 5
-            # random height based on the data points
-            z = random.choices(range(0, 5), k=len(x))
-            # create points
-            for ix, iy, iz in zip(x, y, z):
-                print(ix, iy, iz)
-                try:
-                    bpy.ops.mesh.primitive_uv_sphere_add(radius=point_radius, location=(ix, iy, iz))
-                    context.object.data.materials.append(mat)
-                    
-                    # scale items from 0 to 1 scale using keyframes 0 to 100
-                    context.object.scale = (0, 0, 0)
-                    context.object.keyframe_insert(data_path="scale", frame=anim_start_frame)
-                    context.object.scale = (1, 1, 1)
-                    context.object.keyframe_insert(data_path="scale", frame=anim_start_frame + 100)
-                    
-                    # add keyframes to location
-                    context.object.location = (ix, iy, iz)
-                    context.object.keyframe_insert(data_path="location", frame=anim_start_frame+1)
-                    context.object.location = (ix, iy, iz)
-                    context.object.keyframe_insert(data_path="location", frame=anim_start_frame+2 + 100)
-                    
-                    # apply random colors to the points based on the z axis
-                    mat.diffuse_color = (random.uniform(0, 1), random.uniform(0, 1), random.uniform(0, 1), 1)
-                    
-                    # apply red or blue or green or yellow color to the points randomly
-                   
-                    # shade smooth
-                    bpy.ops.object.shade_smooth()
-                    
-                    
-                    # add text to the points in (x, y) format just above the point
-                    bpy.ops.object.text_add(location=(ix, iy, iz+1 ))
-                    text = context.object
-                    text.data.body = f"({round(ix,1)}, {round(iy,1)})"
-                    text.data.align_x = 'CENTER'
-                    text.data.align_y = 'CENTER'
+        x = x.astype(float) 
+        y = y.astype(float)
+        
+        # keep the data in -5 to 5 range
+        x = scaling.minmax(x.to_numpy(dtype=np.float32), -5, 5, fill=0.0)
+        y = scaling.minmax(y.to_numpy(dtype=np.float32), -5, 5, fill=0.0)
+        # random height based on the data points
+        z = random.choices(range(0, 5), k=len(x))
+        captions = []
+        # create points
+        timing.phase("points")
+        for index, (ix, iy, iz) in enumerate(zip(x, y, z)):
+            # outside the try below, closing the build must not be swallowed by it
+            yield 0.1 + 0.8 * index / len(z), "Adding points"
+            try:
+                bpy.ops.mesh.primitive_uv_sphere_add(radius=point_radius, location=(ix, iy, iz))
+                # red for even heights, green for 5, blue otherwise, from shared materials
+                if iz % 2 == 0:
+                    point_color = (1, 0, 0, 1)
+                elif iz % 5 == 0:
+                    point_color = (0, 1, 0, 1)
+                else:
+                    point_color = (0, 0, 1, 1)
+                context.object.data.materials.append(materials.diffuse(point_color))
                 
-                    text.data.extrude = 0.1
-                    text.data.materials.append(mat)
-                    red = (1, 0, 0, 1)
-                    blue = (0, 0, 1, 1)
-                    green = (0, 1, 0, 1)
-                    
-                    if z % 2 == 0:
-                        mat.diffuse_color = red
-                    elif z % 5 == 0:
-                        mat.diffuse_color = green
-                    else:
-                        mat.diffuse_color = blue
-                        
-
-                    text.scale = (0, 0, 0)
-                    text.keyframe_insert(data_path="scale", frame=anim_start_frame+1)
-                    text.scale = (.5, .5, .5)
-                    text.keyframe_insert(data_path="scale", frame=anim_start_frame+2 + 100)
-                    
-                    
+                # scale items from 0 to 1 scale using keyframes 0 to 100
+                keyframes.animate(context.object, "scale", [anim_start_frame, anim_start_frame + 100], [[0, 0, 0], [1, 1, 1]])
                 
-                except:
-                    pass 
-        except Exception as e:
-            # display error message in blender
-            self.report({'ERROR'}, str(e))
+                # add keyframes to location
+                keyframes.animate(context.object, "location", [anim_start_frame + 1, anim_start_frame + 2 + 100], [[ix, iy, iz], [ix, iy, iz]])
+                
+                # shade smooth
+                bpy.ops.object.shade_smooth()
+                
+                
+                # text for the point in (x, y) format just above it
+                captions.append(((ix, iy, iz + 1), f"({round(ix,1)}, {round(iy,1)})"))
+                
+                
+            
+            except:
+                pass 
+
+        # all point captions are drawn by one labels object
+        timing.phase("labels")
+        if captions:
+            positions, texts = zip(*captions)
+            labels.create_labels("point_captions", positions, texts, anim_start_frame + 1, 101, mat, rotation=(0, 0, 0))
+        remove_objects(previous)
+        return {'FINISHED'}
+
+    def build_density_scatter_graph(self, points, colors, anim_start_frame=2, point_radius=.35, density_threshold=SCATTER_DENSITY_THRESHOLD, density_mode='points', params=None):
+        # 'points': a point cloud with per-point radius and color attributes
+        # 'grid': points binned on the x / y plane, one box per cell, height and color by count
+        # params: the instanced scatter arguments, kept on the object for live reload
+        yield 0.5, "Building density " + density_mode
+        timing.phase("geometry")
+        if density_mode == 'grid':
+            vertices, faces, cell_index, cell_colors = density_grid_arrays(points)
+            mesh = chart_mesh.mesh_from_arrays("scatter_density", vertices, faces)
+            chart_mesh.set_attribute(mesh, "bar_index", cell_index, 'INT', 'POINT')
+            chart_mesh.set_attribute(mesh, "color", cell_colors, 'FLOAT_COLOR', 'POINT')
+            mesh.materials.append(materials.attribute_color("color", 'GEOMETRY'))
+            ob = chart_mesh.link_object("scatter_density", mesh)
+            self.tag_chart('density_scatter_graph', params, main=ob)
+
+            # every cell grows together over 100 frames
+            node_group = chart_mesh.bar_grow_node_group()
+            modifier = ob.modifiers.new("Bar Grow", "NODES")
+            modifier.node_group = node_group
+            chart_mesh.set_modifier_input(modifier, node_group, "Start", float(anim_start_frame))
+            chart_mesh.set_modifier_input(modifier, node_group, "Step", 0.0)
+            chart_mesh.set_modifier_input(modifier, node_group, "Duration", 100.0)
+            return {'FINISHED'}
+
+        mesh = chart_mesh.mesh_from_arrays("scatter_cloud", points)
+        chart_mesh.set_attribute(mesh, "radius", np.full(len(points), density_radius(len(points), point_radius, density_threshold)), 'FLOAT', 'POINT')
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+        ob = chart_mesh.link_object("scatter_cloud", mesh)
+        self.tag_chart('density_scatter_graph', params, main=ob)
+
+        timing.phase("keyframes")
+        node_group = chart_mesh.point_cloud_node_group()
+        modifier = ob.modifiers.new("Scatter Point Cloud", "NODES")
+        modifier.node_group = node_group
+        chart_mesh.set_modifier_input(modifier, node_group, "Material", materials.attribute_color("color", 'GEOMETRY'))
+        grow = chart_mesh.set_modifier_input(modifier, node_group, "Grow", 0.0)
+        keyframes.animate(ob, f'{modifier.path_from_id()}["{grow}"]', [anim_start_frame, anim_start_frame + 100], [0.0, 1.0])
+        return {'FINISHED'}
+
+    def build_instanced_scatter_graph(self, x_column, y_column, anim_start_frame=2, anim_length_data=10, density_threshold=SCATTER_DENSITY_THRESHOLD, density_mode='points'):
+        # every point is a vertex of one mesh, a geometry nodes modifier instances a sphere on each
+        point_radius = .35
+        plain_height = -1
+        sun_height = 15
+
+        context = bpy.context
+        scene = context.scene
+        # the objects already in the scene are deleted once the chart is built
+        previous = set(scene.objects.keys())
+        scene.cursor.location = (0, 0, 0)
+        bpy.ops.object.light_add(type='SUN', location=(0, 0, sun_height))
+        bpy.ops.mesh.primitive_plane_add(size=20, location=(0, 0, plain_height))
+
+        frame = yield from self.iter_load_columns([x_column - 1, y_column - 1])
+        yield 0.3, "Building points"
+        timing.phase("normalise")
+        points, colors = scatter_points(frame)
+        params = dict(x_column=x_column, y_column=y_column, anim_start_frame=anim_start_frame, point_radius=point_radius,
+                      density_threshold=density_threshold, density_mode=density_mode)
+
+        # past the threshold a sphere per point costs too much memory
+        if len(points) > density_threshold:
+            result = yield from self.build_density_scatter_graph(points, colors, anim_start_frame, point_radius, density_threshold, density_mode, params)
+            remove_objects(previous)
+            return result
+
+        timing.phase("geometry")
+        mesh = chart_mesh.mesh_from_arrays("scatter_points", points)
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+        ob = chart_mesh.link_object("scatter_points", mesh)
+
+        # the instancer material reads the per-point color attribute
+        mat = materials.attribute_color("color", 'INSTANCER')
+
+        node_group = chart_mesh.scatter_instancer_node_group()
+        modifier = ob.modifiers.new("Scatter Instancer", "NODES")
+        modifier.node_group = node_group
+        chart_mesh.set_modifier_input(modifier, node_group, "Radius", point_radius)
+        chart_mesh.set_modifier_input(modifier, node_group, "Material", mat)
+
+        # scale all points from 0 to 1 with two keyframes on the modifier
+        grow = chart_mesh.set_modifier_input(modifier, node_group, "Grow", 0.0)
+        keyframes.animate(ob, f'{modifier.path_from_id()}["{grow}"]', [anim_start_frame, anim_start_frame + 100], [0.0, 1.0])
+
+        # (x, y) captions just above the points, skipped when there are too many to read
+        roles = {}
+        if len(points) <= SCATTER_LABEL_LIMIT:
+            yield 0.7, "Adding captions"
+            timing.phase("labels")
+            roles['labels'] = labels.create_labels("point_captions", *scatter_captions(points, anim_start_frame), 101, rotation=(0, 0, 0))
+        self.tag_chart('scatter_graph', params, main=ob, **roles)
+        remove_objects(previous)
+        return {'FINISHED'}
+
+    def build_histogram(self, x_column, y_column=None, bins=HISTOGRAM_BINS, anim_start_frame=2, anim_length_data=100):
+        # 1D histogram of x_column, or 2D over x_column / y_column when it is given
+        # the file is binned chunk by chunk and every bin is a box of one mesh
+        columns = [x_column - 1] if y_column is None else [x_column - 1, y_column - 1]
+        histogram = yield from self.iter_bin_columns(columns, bins)
+        yield 0.6, "Building bins"
+        timing.phase("geometry")
+        vertices, faces, bin_index, colors = chart_mesh.histogram_arrays(histogram)
+        mesh = chart_mesh.mesh_from_arrays("histogram", vertices, faces)
+        chart_mesh.set_attribute(mesh, "bar_index", bin_index, 'INT', 'POINT')
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+        mesh.materials.append(materials.attribute_color("color", 'GEOMETRY'))
+        ob = chart_mesh.link_object("histogram", mesh)
+
+        # every bin grows together
+        node_group = chart_mesh.bar_grow_node_group()
+        modifier = ob.modifiers.new("Bar Grow", "NODES")
+        modifier.node_group = node_group
+        chart_mesh.set_modifier_input(modifier, node_group, "Start", float(anim_start_frame))
+        chart_mesh.set_modifier_input(modifier, node_group, "Step", 0.0)
+        chart_mesh.set_modifier_input(modifier, node_group, "Duration", float(anim_length_data))
+
+        # bin edge values along the axes
+        yield 0.8, "Adding captions"
+        timing.phase("labels")
+        captions_ob = labels.create_labels("histogram_captions", *histogram_captions(histogram, anim_start_frame), anim_length_data,
+                                           materials.emission((1.0, 1.0, 1.0, 1), 3.0), size=0.5)
+        self.tag_chart('histogram', dict(x_column=x_column, y_column=y_column, bins=bins, anim_start_frame=anim_start_frame, anim_length_data=anim_length_data),
+                       main=ob, labels=captions_ob)
+        return {'FINISHED'}
+
+    def build_pie_chart(self, names_column, values_column, radius=4.0, inner_radius=0.0, height=0.5, explode=0.3, anim_start_frame=2, anim_length_data=20):
+        # the whole pie (a donut when inner_radius > 0) is one mesh, slice i rises and moves out
+        # by explode from frame anim_start_frame + i * anim_length_data
+        frame = yield from self.iter_load_columns([names_column - 1, values_column - 1])
+        yield 0.3, "Building slices"
+        timing.phase("geometry")
+        names, values = chart_mesh.pie_values(frame)
+        vertices, faces, face_sizes, slice_index, directions, colors, middles = pie_geometry(names, values, radius, inner_radius, height)
+        mesh = chart_mesh.mesh_from_arrays("pie", vertices, faces, face_sizes=face_sizes)
+        chart_mesh.set_attribute(mesh, "slice_index", slice_index, 'INT', 'POINT')
+        chart_mesh.set_attribute(mesh, "slice_direction", directions, 'FLOAT_VECTOR', 'POINT')
+        chart_mesh.set_attribute(mesh, "color", colors, 'FLOAT_COLOR', 'POINT')
+        mesh.materials.append(materials.attribute_color("color", 'GEOMETRY'))
+        ob = chart_mesh.link_object("pie", mesh)
+
+        node_group = chart_mesh.pie_node_group()
+        modifier = ob.modifiers.new("Pie Animate", "NODES")
+        modifier.node_group = node_group
+        chart_mesh.set_modifier_input(modifier, node_group, "Start", float(anim_start_frame))
+        chart_mesh.set_modifier_input(modifier, node_group, "Step", float(anim_length_data))
+        chart_mesh.set_modifier_input(modifier, node_group, "Duration", float(anim_length_data))
+        chart_mesh.set_modifier_input(modifier, node_group, "Explode", float(explode))
+
+        # "name share" captions around the pie, skipped when there are too many to read
+        roles = {}
+        if len(names) <= PIE_LABEL_LIMIT:
+            yield 0.7, "Adding captions"
+            timing.phase("labels")
+            roles['labels'] = labels.create_labels("pie_captions", *pie_captions(names, values, middles, radius + explode, anim_start_frame, anim_length_data),
+                                                   anim_length_data, materials.emission((1.0, 1.0, 1.0, 1), 3.0), size=0.5, rotation=(0, 0, 0))
+        self.tag_chart('pie_chart', dict(names_column=names_column, values_column=values_column, radius=radius, inner_radius=inner_radius, height=height,
+                                         explode=explode, anim_start_frame=anim_start_frame, anim_length_data=anim_length_data),
+                       main=ob, **roles)
         return {'FINISHED'}
     
         
 
 
+########################################
+######### DATASET CACHE ################
+########################################
+
+# dataset cache limits
+DATASET_CACHE_MAX_ENTRIES = 8
+DATASET_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+class DatasetCache:
+    ## Process-wide LRU cache of parsed datasets keyed by path, mtime and size
+
+    def __init__(self, max_entries=DATASET_CACHE_MAX_ENTRIES, max_bytes=DATASET_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # path -> (stamp, dataset, nbytes)
+        self.total_bytes = 0
+
+    def file_stamp(self, filepath):
+        # (mtime, size) of the file, a missing file always maps to the same stamp
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return (0, 0)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, filepath):
+        key = os.path.abspath(filepath) if filepath else ""
+        stamp = self.file_stamp(key) if key else (0, 0)
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] == stamp:
+                self.entries.move_to_end(key)
+                return entry[1]
+            # the file changed on disk, drop the stale copy
+            self.discard(key)
+
+        dataset = DatasetHelper(filepath)
+        nbytes = int(dataset.df.memory_usage(index=True, deep=True).sum())
+        self.entries[key] = (stamp, dataset, nbytes)
+        self.total_bytes += nbytes
+        self.evict()
+        return dataset
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def evict(self):
+        # drop least recently used datasets, but always keep the newest one
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            key = next(iter(self.entries))
+            self.discard(key)
+
+    def peek(self, filepath):
+        # the cached dataset of a file without loading it, None when there is none
+        entry = self.entries.get(os.path.abspath(filepath) if filepath else "")
+        return entry[1] if entry is not None else None
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+dataset_cache = DatasetCache()
+
+def get_dataset(filepath):
+    return dataset_cache.get(filepath)
+
+class ClearDatasetCache(bpy.types.Operator):
+    ## Forget every cached dataset so the next draw or chart re-reads the file
+    bl_idname = "test.clear_dataset_cache"
+    bl_label = "Clear Dataset Cache"
+
+    def execute(self, context):
+        dataset_cache.clear()
+        if context.scene.my_file_path:
+            sidecar.clear(context.scene.my_file_path)
+            ingest_catalog(context.scene.my_file_path)
+        self.report({'INFO'}, "Dataset cache cleared")
+        return {'FINISHED'}
+
+class ExportChartTrace(bpy.types.Operator):
+    ## Write the phase timings of the last chart build as a Chrome trace (chrome://tracing, Perfetto)
+    bl_idname = "test.export_chart_trace"
+    bl_label = "Export Chart Trace"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, context):
+        spans = [(span.name, span.start / 1000, span.duration / 1000, span.depth) for span in context.scene.chart_spans]
+        timing.write_chrome_trace(bpy.path.ensure_ext(self.filepath, ".json"), spans)
+        self.report({'INFO'}, f"Trace written to {self.filepath}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "chart_trace.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
+########################################
+######### LIVE RELOAD ##################
+########################################
+
+# seconds between checks of the dataset files behind the charts
+LIVE_RELOAD_SECONDS = 1.0
+
+def live_charts():
+    # source path -> chart id -> role -> object, for every chart tagged by a builder
+    charts = {}
+    for ob in bpy.data.objects:
+        if ob.get("chart_id") is not None:
+            charts.setdefault(ob["chart_source"], {}).setdefault(ob["chart_id"], {})[ob["chart_role"]] = ob
+    return charts
+
+class LiveReload:
+    ## Polls the files behind the charts and updates the charts in place when one changes
+
+    def __init__(self):
+        self.stamps = {}  # path -> (mtime, size) when last seen
+        self.status = ""  # outcome of the last update, shown in the panel
+
+    def poll(self):
+        for source, charts in live_charts().items():
+            stamp = dataset_cache.file_stamp(source)
+            previous = self.stamps.get(source)
+            self.stamps[source] = stamp
+            # the first look only records the stamp, a missing file is left alone
+            if previous is None or previous == stamp or stamp == (0, 0):
+                continue
+            dataset = get_dataset(source)
+            failed = []
+            for objects in charts.values():
+                if 'main' not in objects:
+                    continue
+                try:
+                    dataset.update_chart(objects)
+                except Exception as e:
+                    # a half written file, try again on the next change
+                    print("Live reload failed for", objects['main'].name, e)
+                    failed.append(f"{objects['main'].name}: {e}")
+            name = os.path.basename(source)
+            self.status = f"{name} failed, {'; '.join(failed)}" if failed else f"{name} updated at {time.strftime('%H:%M:%S')}"
+
+live_reload = LiveReload()
+
+def poll_live_reload():
+    # bpy.app.timers callback, returning None stops the timer
+    if not getattr(bpy.context.scene, "live_reload", False):
+        live_reload.stamps.clear()
+        return None
+    live_reload.poll()
+    return LIVE_RELOAD_SECONDS
+
+def toggle_live_reload(self, context):
+    # update callback of Scene.live_reload
+    if self.live_reload and not bpy.app.timers.is_registered(poll_live_reload):
+        bpy.app.timers.register(poll_live_reload, first_interval=0.0)
+
+@persistent
+def live_reload_load_post(dummy):
+    # the update callback does not run when a .blend with live reload switched on is opened
+    if getattr(bpy.context.scene, "live_reload", False) and not bpy.app.timers.is_registered(poll_live_reload):
+        bpy.app.timers.register(poll_live_reload, first_interval=0.0)
+
+
+########################################
+######### MODAL BUILD ##################
+########################################
+
+# time spent building per timer tick before the UI gets to redraw
+BUILD_TICK_SECONDS = 0.05
+
+# bpy.data collections a cancelled or failed build cleans up, in removal order
+BUILD_DATA = ('objects', 'meshes', 'curves', 'lights', 'materials', 'textures', 'node_groups', 'actions')
+
+class ModalBuild:
+    ## Mixin for the Add* operators: runs a build_* generator a little on every timer tick,
+    ## shows progress in the area header and removes the half built chart on Esc or an error
+
+    background: bpy.props.BoolProperty(name="Background Build", description="Keep the UI responsive while the chart is built, Esc cancels", default=True)
+
+    def start_build(self, context, steps, name):
+        if not self.background or context.window is None:
+            run_build(steps, name)
+            return {'FINISHED'}
+        self.trace = timing.Trace(name)
+        self.steps = timing.traced(self.trace, steps)
+        self.fraction = 0.0
+        self.existing = {kind: set(getattr(bpy.data, kind).keys()) for kind in BUILD_DATA}
+        wm = context.window_manager
+        self.timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def finish_build(self, context):
+        context.window_manager.event_timer_remove(self.timer)
+        if context.area is not None:
+            context.area.header_text_set(None)
+
+    def remove_new_data(self):
+        # everything the build added: objects first, then the meshes, text curves, lights,
+        # materials, textures, node groups and keyframe actions they used
+        for kind in BUILD_DATA:
+            data = getattr(bpy.data, kind)
+            for name in set(data.keys()) - self.existing[kind]:
+                if kind == 'objects':
+                    data.remove(data[name], do_unlink=True)
+                else:
+                    data.remove(data[name])
+
+    def cancel(self, context):
+        # Blender ends the operator without an event (file load, window closed)
+        self.steps.close()
+        self.finish_build(context)
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self.steps.close()
+            self.finish_build(context)
+            self.remove_new_data()
+            self.report({'WARNING'}, "Chart build cancelled")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        message = ""
+        deadline = time.perf_counter() + BUILD_TICK_SECONDS
+        try:
+            while time.perf_counter() < deadline:
+                fraction, message = next(self.steps)
+                if fraction is not None:
+                    self.fraction = fraction
+        except StopIteration:
+            self.finish_build(context)
+            store_trace(context.scene, self.trace)
+            return {'FINISHED'}
+        except Exception as e:
+            self.finish_build(context)
+            self.remove_new_data()
+            traceback.print_exc()
+            self.report({'ERROR'}, f"Chart build failed: {e}")
+            return {'CANCELLED'}
+        if context.area is not None:
+            context.area.header_text_set(f"{self.fraction:.0%}  {message}  (Esc to cancel)")
+        return {'RUNNING_MODAL'}
+
+
 ########################################
 ######### LINE GRAPH ###################
 ########################################
 
-class AddLineGraph(bpy.types.Operator):
+class AddLineGraph(ModalBuild, bpy.types.Operator):
     bl_idname = "mesh.add_line_graph"
     bl_label = "Add Line Graph"
 
+    point_budget: bpy.props.IntProperty(name="Point Budget", description="Most points drawn, longer series are decimated", default=LINE_POINT_BUDGET, min=3)
+    decimation: bpy.props.EnumProperty(
+        name="Decimation",
+        items=[
+            ('lttb', "LTTB", "Largest-Triangle-Three-Buckets, keeps the visual shape"),
+            ('minmax', "Min / Max", "Lowest and highest row of every bucket"),
+        ],
+        default='lttb',
+    )
+
     def execute(self, context):
-        dataset = DatasetHelper(context.scene.my_file_path)
-        dataset.create_line_graph(context.scene.y_axis_column, context.scene.x_axis_column, "$", 2, 20, 1, 2)
-        return {'FINISHED'}
+        dataset = get_dataset(context.scene.my_file_path)
+        x_column, y_column = axis_columns(context.scene)
+        return self.start_build(context, dataset.build_line_graph(y_column, x_column, "$", 2, 20, 1, 2,
+                                                                  point_budget=self.point_budget, decimation=self.decimation), "Line graph")
 
     def invoke(self, context, event):
         wm = context.window_manager
@@ -727,21 +1420,26 @@ class AddLineGraph(bpy.types.Operator):
         row.prop(self, "axis_x")
         row = layout.row()
         row.prop(self, "axis_y")
+        row = layout.row()
+        row.prop(self, "background")
+        row = layout.row()
+        row.prop(self, "point_budget")
+        row.prop(self, "decimation")
 
 ########################################
 #########BAR CHART######################
 ########################################
 
-class AddBarChart(bpy.types.Operator):
+class AddBarChart(ModalBuild, bpy.types.Operator):
     bl_idname = "mesh.add_bar_chart"
     bl_label = "Add Bar Chart"
 
     def execute(self, context):
         # Add custom code to create a bar chart
-        dataset = DatasetHelper(context.scene.my_file_path)
-        dataset.create_bar_graph(context.scene.y_axis_column, context.scene.x_axis_column, "", 2, 20, 1, 2)
+        dataset = get_dataset(context.scene.my_file_path)
+        x_column, y_column = axis_columns(context.scene)
         print("Creating Bar Chart")
-        return {'FINISHED'}
+        return self.start_build(context, dataset.build_bar_graph(y_column, x_column, "", 2, 20, 1, 2), "Bar chart")
     
     def invoke(self, context, event):
         wm = context.window_manager
@@ -753,20 +1451,22 @@ class AddBarChart(bpy.types.Operator):
         row.prop(self, "axis_x")
         row = layout.row()
         row.prop(self, "axis_y")
+        row = layout.row()
+        row.prop(self, "background")
 
 ########################################
 #########PIE CHART######################
 ########################################
-class AddAreaChart(bpy.types.Operator):
+class AddAreaChart(ModalBuild, bpy.types.Operator):
     bl_idname = "mesh.add_histogram_chart"
     bl_label = "Add Scatter Bar Chart"
 
     def execute(self, context):
         # Add custom code to create a pie chart
-        dataset = DatasetHelper(context.scene.my_file_path)
-        dataset.create_scatter_bar_graph(context.scene.y_axis_column, context.scene.x_axis_column, 2, 20)
+        dataset = get_dataset(context.scene.my_file_path)
+        x_column, y_column = axis_columns(context.scene)
         print("Creating Area Chart")
-        return {'FINISHED'}
+        return self.start_build(context, dataset.build_scatter_bar_graph(y_column, x_column, 2, 20), "Scatter bar chart")
     
     def invoke(self, context, event):
         wm = context.window_manager
@@ -778,19 +1478,33 @@ class AddAreaChart(bpy.types.Operator):
         row.prop(self, "axis_x")
         row = layout.row()
         row.prop(self, "axis_y")
+        row = layout.row()
+        row.prop(self, "background")
 
 ########################################
 #########SCATTER PLOT###################
 ########################################
-class AddScatterPlot(bpy.types.Operator):
+class AddScatterPlot(ModalBuild, bpy.types.Operator):
     bl_idname = "mesh.add_scatter_plot"
     bl_label = "Add Scatter Plot"
 
+    instanced: bpy.props.BoolProperty(name="Instanced", description="Draw all points from one mesh with geometry nodes", default=True)
+    density_threshold: bpy.props.IntProperty(name="Density Above", description="Instanced plots with more points switch to the density mode", default=SCATTER_DENSITY_THRESHOLD, min=1)
+    density_mode: bpy.props.EnumProperty(
+        name="Density Mode",
+        items=[
+            ('points', "Point Cloud", "One point per row with radius and color attributes"),
+            ('grid', "Grid", "Rows binned into cells, colored and raised by count"),
+        ],
+        default='points',
+    )
+
     def execute(self, context):
-        dataset = DatasetHelper(context.scene.my_file_path)
-        dataset.create_scatter_graph(context.scene.y_axis_column, context.scene.x_axis_column, 2, 20)
+        dataset = get_dataset(context.scene.my_file_path)
+        x_column, y_column = axis_columns(context.scene)
         print("Creating Scatter Plot")
-        return {'FINISHED'}
+        return self.start_build(context, dataset.build_scatter_graph(y_column, x_column, 2, 20, instanced=self.instanced,
+                                                                     density_threshold=self.density_threshold, density_mode=self.density_mode), "Scatter plot")
     
     def invoke(self, context, event):
         wm = context.window_manager
@@ -802,6 +1516,80 @@ class AddScatterPlot(bpy.types.Operator):
         row.prop(self, "axis_x")
         row = layout.row()
         row.prop(self, "axis_y")
+        row = layout.row()
+        row.prop(self, "background")
+        row = layout.row()
+        row.prop(self, "instanced")
+        row = layout.row()
+        row.prop(self, "density_threshold")
+        row.prop(self, "density_mode")
+
+########################################
+#########PIE CHART######################
+########################################
+class AddPieChart(ModalBuild, bpy.types.Operator):
+    bl_idname = "mesh.add_pie_chart"
+    bl_label = "Add Pie Chart"
+
+    inner_radius: bpy.props.FloatProperty(name="Hole", description="Inner radius, above 0 draws a donut", default=0.0, min=0.0, max=3.9)
+    explode: bpy.props.FloatProperty(name="Explode", description="How far every slice moves out from the center", default=0.3, min=0.0)
+
+    def execute(self, context):
+        # slice names from the X axis column, sizes from the Y axis column
+        dataset = get_dataset(context.scene.my_file_path)
+        x_column, y_column = axis_columns(context.scene)
+        print("Creating Pie Chart")
+        return self.start_build(context, dataset.build_pie_chart(x_column, y_column,
+                                                                 inner_radius=self.inner_radius, explode=self.explode), "Pie chart")
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row()
+        row.prop(self, "inner_radius")
+        row.prop(self, "explode")
+        row = layout.row()
+        row.prop(self, "background")
+
+########################################
+#########HISTOGRAM######################
+########################################
+class AddHistogram(ModalBuild, bpy.types.Operator):
+    bl_idname = "mesh.add_histogram"
+    bl_label = "Add Histogram"
+
+    bins: bpy.props.IntProperty(name="Bins", description="Bins per axis", default=HISTOGRAM_BINS, min=1, max=500)
+    dimensions: bpy.props.EnumProperty(
+        name="Dimensions",
+        items=[
+            ('1D', "1D", "Counts of the X axis column"),
+            ('2D', "2D", "Counts over the X and Y axis columns"),
+        ],
+        default='1D',
+    )
+
+    def execute(self, context):
+        dataset = get_dataset(context.scene.my_file_path)
+        x_column, y_column = axis_columns(context.scene)
+        print("Creating Histogram")
+        if self.dimensions != '2D':
+            y_column = None
+        return self.start_build(context, dataset.build_histogram(x_column, y_column, self.bins), "Histogram")
+
+    def invoke(self, context, event):
+        wm = context.window_manager
+        return wm.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row()
+        row.prop(self, "dimensions")
+        row.prop(self, "bins")
+        row = layout.row()
+        row.prop(self, "background")
 
 
 class XAxisColumn(bpy.types.PropertyGroup):
@@ -829,7 +1617,8 @@ class View3DPanel(bpy.types.Panel):
             context.scene.my_file_path = ""
         else:
             print(context.scene.my_file_path)
-        dataset = DatasetHelper(context.scene.my_file_path)
+        # described from the catalog, drawing the panel never parses the file
+        entry = catalog_entry(context.scene.my_file_path)
 
         info = "Blender 3D Visualization Toolkit by Team 3"
 
@@ -842,18 +1631,41 @@ class View3DPanel(bpy.types.Panel):
         row.label(text="Selected file:")
         row = layout.row()
         row.label(text=context.scene.my_file_path)
+        if entry is not None:
+            row = layout.row()
+            row.label(text=f"{entry['rows']:,} rows, {len(entry['columns'])} columns")
+        dataset = dataset_cache.peek(context.scene.my_file_path)
+        if dataset is not None and dataset.memory:
+            row = layout.row()
+            row.label(text="Last load: " + dataset.memory)
+        row = layout.row()
+        row.operator("test.clear_dataset_cache", text="Reload Dataset")
+        row.prop(context.scene, "live_reload")
+        if context.scene.live_reload and live_reload.status:
+            row = layout.row()
+            row.label(text="Live reload: " + live_reload.status)
 
         # dropdown for selecting the x-axis column
         row = layout.row()
         row.label(text="X Axis:")
         row = layout.row()
-        row.prop(context.scene, "x_axis_column", text="X Axis")
+        if entry is not None:
+            row.prop(context.scene, "x_axis_name", text="X Axis")
+            row = layout.row()
+            row.label(text=column_range_text(entry, int(context.scene.x_axis_name or 0)))
+        else:
+            row.prop(context.scene, "x_axis_column", text="X Axis")
 
         # dropdown for selecting the y-axis column
         row = layout.row()
         row.label(text="Y Axis:")
         row = layout.row()
-        row.prop(context.scene, "y_axis_column", text="Y Axis")
+        if entry is not None:
+            row.prop(context.scene, "y_axis_name", text="Y Axis")
+            row = layout.row()
+            row.label(text=column_range_text(entry, int(context.scene.y_axis_name or 0)))
+        else:
+            row.prop(context.scene, "y_axis_column", text="Y Axis")
 
         # buttons for adding different types of graphs
         row = layout.row()
@@ -865,8 +1677,25 @@ class View3DPanel(bpy.types.Panel):
         row.operator("mesh.add_histogram_chart", text="Scatter 2 Chart")
         row.operator("mesh.add_scatter_plot", text="Scatter Plot")
         row = layout.row()
+        row.operator("mesh.add_pie_chart", text="Pie Chart")
         row.operator("mesh.add_histogram", text="Histogram")
 
+        # collapsible timings of the last chart build
+        scene = context.scene
+        row = layout.row()
+        row.prop(scene, "show_performance", icon='TRIANGLE_DOWN' if scene.show_performance else 'TRIANGLE_RIGHT', emboss=False)
+        if scene.show_performance:
+            box = layout.box()
+            if not scene.chart_spans:
+                box.label(text="Build a chart to see its timings")
+            else:
+                box.label(text=scene.chart_trace_name)
+                for span in scene.chart_spans:
+                    row = box.row()
+                    row.label(text="    " * span.depth + span.name)
+                    row.label(text=f"{span.duration:.1f} ms")
+                box.operator("test.export_chart_trace", text="Export Chrome Trace")
+
         
 
         
@@ -874,35 +1703,54 @@ def clear_properties():
     del bpy.types.Scene.my_file_path
     del bpy.types.Scene.x_axis_column
     del bpy.types.Scene.y_axis_column
+    del bpy.types.Scene.x_axis_name
+    del bpy.types.Scene.y_axis_name
+    del bpy.types.Scene.chart_spans
+    del bpy.types.Scene.chart_trace_name
+    del bpy.types.Scene.show_performance
+    del bpy.types.Scene.live_reload
 
 ########################################
 #########REGISTER AND UNREGISTER########
 ########################################
 def register():
+    bpy.utils.register_class(ChartSpan)
     init_properties()
     bpy.utils.register_class(OpenFilebrowser)
+    bpy.utils.register_class(ClearDatasetCache)
+    bpy.utils.register_class(ExportChartTrace)
     bpy.utils.register_class(View3DPanel)
     bpy.utils.register_class(AddLineGraph)
     bpy.utils.register_class(AddBarChart)
     bpy.utils.register_class(AddScatterPlot)
     bpy.utils.register_class(AddAreaChart)
+    bpy.utils.register_class(AddPieChart)
+    bpy.utils.register_class(AddHistogram)
     bpy.utils.register_class(XAxisColumn)
     bpy.utils.register_class(YAxisColumn)
     bpy.types.Scene.my_file_path = bpy.props.StringProperty(name="File Path", default="")
+    bpy.app.handlers.load_post.append(live_reload_load_post)
 
 def unregister():
     bpy.utils.unregister_class(OpenFilebrowser)
+    bpy.utils.unregister_class(ClearDatasetCache)
+    bpy.utils.unregister_class(ExportChartTrace)
+    if live_reload_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(live_reload_load_post)
+    if bpy.app.timers.is_registered(poll_live_reload):
+        bpy.app.timers.unregister(poll_live_reload)
+    dataset_cache.clear()
     bpy.utils.unregister_class(View3DPanel)
     bpy.utils.unregister_class(AddLineGraph)
     bpy.utils.unregister_class(AddBarChart)
     bpy.utils.unregister_class(AddScatterPlot)
     bpy.utils.unregister_class(AddAreaChart)
+    bpy.utils.unregister_class(AddPieChart)
+    bpy.utils.unregister_class(AddHistogram)
     bpy.utils.unregister_class(XAxisColumn)
     bpy.utils.unregister_class(YAxisColumn)
-    del bpy.types.Scene.my_file_path
-    del bpy.types.Scene.x_axis_column
-    del bpy.types.Scene.y_axis_column
     clear_properties()
+    bpy.utils.unregister_class(ChartSpan)
 
 
 
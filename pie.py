@@ -1,50 +1,35 @@
 import bpy
-import math
-
-def create_pie_chart(names, values, radius, animation_start_frame, graph_start_position):
-    # Calculate total value
-    total_value = sum(values)
-    
-    # Create pie chart
-    bpy.ops.object.select_all(action='DESELECT')
-    bpy.ops.object.select_by_type(type='MESH')
-    bpy.ops.object.delete()
-
-    bpy.ops.mesh.primitive_circle_add(vertices=len(names), radius=radius, fill_type='NOTHING')
-    pie_chart = bpy.context.object
-    pie_chart.name = "PieChart"
-
-    # Set animation start frame
+import os
+import sys
+
+# helper modules live next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import chart_mesh
+import materials
+
+def create_pie_chart(names, values, radius, animation_start_frame, graph_start_position, inner_radius=0.0, explode=0.1, height=0.1):
+    # Build every slice as part of one mesh, graph_start_position is the angle of the first slice
+    vertices, faces, face_sizes, slice_index, directions, middles = chart_mesh.pie_arrays(values, radius, inner_radius, height, graph_start_position)
+    mesh = chart_mesh.mesh_from_arrays("PieChart", vertices, faces, face_sizes=face_sizes)
+    chart_mesh.set_attribute(mesh, "slice_index", slice_index, 'INT', 'POINT')
+    chart_mesh.set_attribute(mesh, "slice_direction", directions, 'FLOAT_VECTOR', 'POINT')
+    chart_mesh.set_attribute(mesh, "color", chart_mesh.pie_colors(len(names))[slice_index], 'FLOAT_COLOR', 'POINT')
+    mesh.materials.append(materials.attribute_color("color", 'GEOMETRY'))
+    pie_chart = chart_mesh.link_object("PieChart", mesh)
+
+    # Every slice rises and moves out over one frame, one after the other
+    node_group = chart_mesh.pie_node_group()
+    modifier = pie_chart.modifiers.new("Pie Animate", "NODES")
+    modifier.node_group = node_group
+    chart_mesh.set_modifier_input(modifier, node_group, "Start", float(animation_start_frame))
+    chart_mesh.set_modifier_input(modifier, node_group, "Step", 1.0)
+    chart_mesh.set_modifier_input(modifier, node_group, "Duration", 1.0)
+    chart_mesh.set_modifier_input(modifier, node_group, "Explode", float(explode))
+
+    # Set animation range
     bpy.context.scene.frame_start = animation_start_frame
-
-    # Create slices
-    current_rotation = graph_start_position
-    for i, (name, value) in enumerate(zip(names, values)):
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='DESELECT')
-        bpy.ops.mesh.select_face_by_sides(number=4, type='EQUAL', extend=False)
-        bpy.ops.mesh.extrude_region_move(TRANSFORM_OT_translate={"value":(0, 0, 0.1)})
-        bpy.ops.object.mode_set(mode='OBJECT')
-
-        slice_angle = (value / total_value) * 2 * math.pi
-        pie_slice = pie_chart.copy()
-        pie_slice.data = pie_chart.data.copy()
-        bpy.context.collection.objects.link(pie_slice)
-
-        pie_slice.rotation_euler[2] = current_rotation + slice_angle / 2
-        pie_slice.scale[0] = radius
-        pie_slice.scale[1] = radius
-        pie_slice.scale[2] = 0.1
-
-        current_rotation += slice_angle
-
-        # Keyframe scale for animation
-        pie_slice.scale[2] = value / total_value
-        pie_slice.keyframe_insert(data_path="scale", frame=animation_start_frame)
-        pie_slice.scale[2] = 0.1
-        pie_slice.keyframe_insert(data_path="scale", frame=animation_start_frame + 1)
-
-    bpy.context.scene.frame_end = animation_start_frame + 1
+    bpy.context.scene.frame_end = animation_start_frame + len(names) + 1
+    return pie_chart
 
 # Example usage
 names = ["A", "B", "C", "D"]
@@ -1,6 +1,14 @@
 import bpy
+import os
+import sys
 import math
-import pandas as pds
+
+# helper modules live next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import keyframes
+import chart_mesh
+import scaling
+import xlsx
 
 context = bpy.context
 scene = context.scene
@@ -13,6 +21,8 @@ scene = context.scene
 
 
 excel_file_path = r"E:\project_24\fyp_3d_vis_blender_plugin\sample.xlsx"
+excel_sheet = None       # sheet name, None for the active sheet
+excel_range = None       # e.g. "A1:E200", None for the whole sheet
 data_column = 5
 month_column = 2
 currency_symbol = "$"
@@ -25,17 +35,13 @@ anim_length_data = 20
 graph_start_position = 1
 distance_bet_points = 2
 
-MAJOR_VERSION, MINOR_VERSION, SUB_VERSION = bpy.app.version
 
 # Save the current location of the 3D cursor
 saved_cursor_loc = scene.cursor.location.xyz
 
 # Read excel file and store the data in an array
-xls_data = pds.read_excel(excel_file_path)
-data_list = xls_data.iloc[:,data_column-1]
-month_list = xls_data.iloc[:,month_column-1]
+names, (data_list, month_list) = xlsx.read_columns(excel_file_path, excel_sheet, excel_range, usecols=[data_column-1, month_column-1])
 number_of_data = len(month_list)
-data_height_mean = sum(data_list) / number_of_data
 
 # Initialize the variables.
 position_count = graph_start_position
@@ -43,20 +49,13 @@ anim_length_text = anim_length_data / 2
 anim_curr_frame = anim_start_frame
 anim_end_frame = anim_start_frame + anim_length_data * (number_of_data-1)
 
-normalized_data = []
-for data in data_list:
-    normalized_data.append(data * 10/data_height_mean)
-
-data_height_mean = sum(normalized_data) / number_of_data
-data_height_min = min(normalized_data)
+normalized_data = scaling.mean_ratio(data_list, 10)
 
-display_data = []
-if (data_height_min > abs(data_height_mean - data_height_min)):
-    for data in normalized_data:
-        display_data.append(data - data_height_min + abs(data_height_mean - data_height_min))
+stats = scaling.finite_stats(normalized_data)
+if (stats.low > abs(stats.mean - stats.low)):
+    display_data = list(normalized_data - stats.low + abs(stats.mean - stats.low))
 else:
-    for data in normalized_data:
-        display_data.append(data)
+    display_data = list(normalized_data)
 
 # Create a new material for the curve
 material_1 = bpy.data.materials.new(name = "anim_material_1")
@@ -147,89 +146,18 @@ follow_path.target = curve_path
 follow_path.forward_axis = 'TRACK_NEGATIVE_Z'
 follow_path.up_axis = 'UP_Y'
 follow_path.use_fixed_location = True
-follow_path.offset_factor = 0.0
-follow_path.keyframe_insert("offset_factor", frame=anim_start_frame)
-follow_path.offset_factor = 1.0
-follow_path.keyframe_insert("offset_factor", frame=anim_end_frame)
-
-fcurves = sphere.animation_data.action.fcurves
-for fcurve in fcurves:
-    for kf in fcurve.keyframe_points:
-        kf.interpolation = 'LINEAR'
-        kf.easing = 'AUTO'
+keyframes.animate(sphere, follow_path.path_from_id("offset_factor"), [anim_start_frame, anim_end_frame], [0.0, 1.0], 'LINEAR')
 bpy.ops.constraint.followpath_path_animate(constraint=follow_path.name)
 
-def geometry_nodes_node_group(start_frame, end_frame, material):
-
-    geometry_nodes = bpy.data.node_groups.new(type = "GeometryNodeTree", name = "Geometry Nodes")
-
-    if (MAJOR_VERSION >= 4):
-        geometry_nodes.interface.new_socket('NodeInterfaceInput', in_out='INPUT', socket_type='NodeSocketGeometry')
-    else:
-        geometry_nodes.inputs.new("NodeSocketGeometry", "Geometry")
-
-    group_input = geometry_nodes.nodes.new("NodeGroupInput")
-    group_input.location = (-340.0, 0.0)
-    group_input.width, group_input.height = 140.0, 100.0
-
-    if (MAJOR_VERSION >= 4):
-        geometry_nodes.interface.new_socket('NodeInterfaceOutput', in_out='OUTPUT', socket_type='NodeSocketGeometry')
-    else:
-        geometry_nodes.outputs.new("NodeSocketGeometry", "Geometry")
-
-    group_output = geometry_nodes.nodes.new("NodeGroupOutput")
-    group_output.location = (609.8951416015625, 0.0)
-    group_output.width, group_output.height = 140.0, 100.0
-
-    trim_curve = geometry_nodes.nodes.new("GeometryNodeTrimCurve")
-    trim_curve.location = (-63.592041015625, 22.438913345336914)
-    trim_curve.width, trim_curve.height = 140.0, 100.0
-    trim_curve.mode = 'FACTOR'
-    trim_curve.inputs[1].default_value = True
-    trim_curve.inputs[2].default_value = 0.0
-    trim_curve.inputs[3].default_value = 0.0
-    trim_curve.inputs[3].keyframe_insert('default_value', frame=start_frame)
-    trim_curve.inputs[3].default_value = 1.0
-    trim_curve.inputs[3].keyframe_insert('default_value', frame=end_frame)
-
-    curve_to_mesh = geometry_nodes.nodes.new("GeometryNodeCurveToMesh")
-    curve_to_mesh.location = (169.89512634277344, 18.004777908325195)
-    curve_to_mesh.width, curve_to_mesh.height = 140.0, 100.0
-    curve_to_mesh.inputs[2].default_value = False
-
-    curve_circle = geometry_nodes.nodes.new("GeometryNodeCurvePrimitiveCircle")
-    curve_circle.location = (-340.7394104003906, -86.51416015625)
-    curve_circle.width, curve_circle.height = 140.0, 100.0
-    curve_circle.mode = 'RADIUS'
-    curve_circle.inputs[0].default_value = 32
-    curve_circle.inputs[1].default_value = (-1.0, 0.0, 0.0)
-    curve_circle.inputs[2].default_value = (0.0, 1.0, 0.0)
-    curve_circle.inputs[3].default_value = (1.0, 0.0, 0.0)
-    curve_circle.inputs[4].default_value = 0.03
-
-    set_material = geometry_nodes.nodes.new("GeometryNodeSetMaterial")
-    set_material.location = (389.71429443359375, 25.688528060913086)
-    set_material.width, set_material.height = 140.0, 100.0
-    set_material.inputs[1].default_value = True
-    set_material.inputs[2].default_value = material
-
-    geometry_nodes.links.new(set_material.outputs[0], group_output.inputs[0])
-    geometry_nodes.links.new(group_input.outputs[0], trim_curve.inputs[0])
-    geometry_nodes.links.new(trim_curve.outputs[0], curve_to_mesh.inputs[0])
-    geometry_nodes.links.new(curve_circle.outputs[0], curve_to_mesh.inputs[1])
-    geometry_nodes.links.new(curve_to_mesh.outputs[0], set_material.inputs[0])
-    
-    fcurves = geometry_nodes.animation_data.action.fcurves
-    for fcurve in fcurves:
-        for kf in fcurve.keyframe_points:
-            kf.interpolation = 'LINEAR'
-            kf.easing = 'AUTO'
-
-    return geometry_nodes
-
-geometry_nodes = geometry_nodes_node_group(anim_start_frame, anim_end_frame, material_1)
-modifier = curve_path.modifiers.new("Geometry Nodes Temp", "NODES")
+# Sweep the curve with the shared tube node group and animate its trim end
+geometry_nodes = chart_mesh.line_tube_node_group()
+modifier = curve_path.modifiers.new("Line Graph Tube", "NODES")
 modifier.node_group = geometry_nodes
+chart_mesh.set_modifier_input(modifier, geometry_nodes, "Radius", 0.03)
+chart_mesh.set_modifier_input(modifier, geometry_nodes, "Resolution", 32)
+chart_mesh.set_modifier_input(modifier, geometry_nodes, "Material", material_1)
+trim = chart_mesh.set_modifier_input(modifier, geometry_nodes, "Trim", 0.0)
+keyframes.animate(curve_path, f'{modifier.path_from_id()}["{trim}"]', [anim_start_frame, anim_end_frame], [0.0, 1.0], 'LINEAR')
 
 # Create the text fields in a loop
 data_counter = 0
@@ -244,10 +172,7 @@ while (data_counter < number_of_data):
     bpy.ops.mesh.primitive_uv_sphere_add(radius = 0.15)
     sph = context.active_object
     sph.location = [graph_start_position+distance_bet_points*data_counter, 0, display_data[data_counter]]
-    sph.scale = [0,0,0]
-    sph.keyframe_insert(data_path="scale", frame = anim_curr_frame+4)
-    sph.scale = [1,1,1]
-    sph.keyframe_insert(data_path="scale", frame = anim_curr_frame+6)
+    keyframes.animate(sph, "scale", [anim_curr_frame+4, anim_curr_frame+6], [[0,0,0], [1,1,1]])
     
     # Assign the yellow material created above
     sph.data.materials.append(material_1)
@@ -264,13 +189,8 @@ while (data_counter < number_of_data):
     ob.rotation_euler = [math.radians(90),0,0]
     
     # Animate the caption horizontally
-    ob.scale = [0,0,0]
-    ob.keyframe_insert(data_path="scale", frame = anim_curr_frame-1)
-    ob.scale = [0,0.5,0.5]
-    ob.keyframe_insert(data_path="scale", frame = anim_curr_frame)
+    keyframes.animate(ob, "scale", [anim_curr_frame-1, anim_curr_frame, anim_curr_frame+anim_length_text], [[0,0,0], [0,0.5,0.5], [0.5,0.5,0.5]])
     anim_curr_frame += anim_length_text
-    ob.scale = [0.5,0.5,0.5]
-    ob.keyframe_insert(data_path="scale", frame = anim_curr_frame)
     
     # Assign the white material created above
     ob.data.materials.append(material_2)
@@ -289,13 +209,8 @@ while (data_counter < number_of_data):
     ob.rotation_euler = [math.radians(90),0,0]
 
     # Animate the caption horizontally
-    ob.scale = [0,0,0]
-    ob.keyframe_insert(data_path="scale", frame = anim_curr_frame-1)
-    ob.scale = [0,0.5,0.5]
-    ob.keyframe_insert(data_path="scale", frame = anim_curr_frame)
+    keyframes.animate(ob, "scale", [anim_curr_frame-1, anim_curr_frame, anim_curr_frame+anim_length_text], [[0,0,0], [0,0.5,0.5], [0.5,0.5,0.5]])
     anim_curr_frame += anim_length_text
-    ob.scale = [0.5,0.5,0.5]
-    ob.keyframe_insert(data_path="scale", frame = anim_curr_frame)
     
     # Assign the white material created above
     ob.data.materials.append(material_2)
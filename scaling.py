@@ -0,0 +1,130 @@
+# vectorised scaling shared by every chart type
+# each function takes an array (or Series) and returns a float array; pass out=values to scale
+# a float32 array in place. Statistics only look at finite values, NaN / Inf inputs come out as
+# `fill` (NaN unless the caller asks for something drawable) and constant columns never divide
+# by zero.
+
+from collections import namedtuple
+
+import numpy as np
+
+Stats = namedtuple('Stats', ['count', 'low', 'high', 'mean', 'std'])
+
+
+def prepare(values, out=None, dtype=np.float32):
+    # the array the result is written to: a float copy of values, or out (values itself when
+    # scaling in place)
+    if out is None:
+        return np.array(values, dtype=dtype)
+    if out is not values:
+        out[...] = np.asarray(values)
+    return out
+
+
+def finite_stats(values):
+    # count, min, max, mean and standard deviation of the finite values
+    values = np.asarray(values)
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return Stats(0, 0.0, 0.0, 0.0, 0.0)
+    return Stats(len(finite), float(finite.min()), float(finite.max()), float(finite.mean(dtype=np.float64)), float(finite.std(dtype=np.float64)))
+
+
+def finish(out, fill):
+    # replace whatever is not finite
+    if fill is not None and not np.isnan(fill):
+        out[~np.isfinite(out)] = fill
+    else:
+        out[np.isinf(out)] = np.nan
+    return out
+
+
+def linear(values, scale=1.0, offset=0.0, out=None, fill=np.nan):
+    # values * scale + offset
+    out = prepare(values, out)
+    np.multiply(out, scale, out=out)
+    np.add(out, offset, out=out)
+    return finish(out, fill)
+
+
+def minmax(values, low=0.0, high=1.0, out=None, fill=np.nan):
+    # finite minimum -> low, finite maximum -> high, a constant column lands halfway
+    stats = finite_stats(values)
+    out = prepare(values, out)
+    span = stats.high - stats.low
+    if span > 0:
+        return linear(out, (high - low) / span, low - stats.low * (high - low) / span, out=out, fill=fill)
+    out[np.isfinite(out)] = (low + high) / 2
+    return finish(out, fill)
+
+
+def mean_ratio(values, target=1.0, out=None, fill=np.nan):
+    # scale so the finite mean becomes target, unchanged when the mean is 0
+    mean = finite_stats(values).mean
+    return linear(values, target / mean if mean else 1.0, out=out, fill=fill)
+
+
+def log(values, base=np.e, out=None, fill=np.nan):
+    # logarithm, zero and negative values have none and come out as fill
+    out = prepare(values, out)
+    positive = out > 0
+    out[~positive] = np.nan
+    np.log(out, out=out, where=positive)
+    if base != np.e:
+        np.divide(out, np.log(base), out=out)
+    return finish(out, fill)
+
+
+def symlog(values, linthresh=1.0, out=None, fill=np.nan):
+    # sign(x) * log(1 + |x| / linthresh): linear around zero, logarithmic beyond, any sign
+    out = prepare(values, out)
+    sign = np.sign(out)
+    np.abs(out, out=out)
+    np.divide(out, linthresh, out=out)
+    np.log1p(out, out=out)
+    np.multiply(out, sign, out=out)
+    return finish(out, fill)
+
+
+def zscore(values, out=None, fill=np.nan):
+    # (x - mean) / std, all zero for a constant column
+    stats = finite_stats(values)
+    if stats.std > 0:
+        return linear(values, 1 / stats.std, -stats.mean / stats.std, out=out, fill=fill)
+    out = prepare(values, out)
+    out[np.isfinite(out)] = 0.0
+    return finish(out, fill)
+
+
+def robust(values, lower=5.0, upper=95.0, low=0.0, high=1.0, out=None, fill=np.nan):
+    # min-max between two percentiles, values beyond them are clipped, so outliers do not
+    # squash the rest of the data
+    values = np.asarray(values)
+    finite = values[np.isfinite(values)]
+    out = prepare(values, out)
+    if not len(finite):
+        return finish(out, fill)
+    p_low, p_high = np.percentile(finite, [lower, upper])
+    if p_high <= p_low:
+        out[np.isfinite(out)] = (low + high) / 2
+        return finish(out, fill)
+    np.clip(out, p_low, p_high, out=out)
+    return linear(out, (high - low) / (p_high - p_low), low - p_low * (high - low) / (p_high - p_low), out=out, fill=fill)
+
+
+METHODS = {
+    'linear': linear,
+    'minmax': minmax,
+    'mean': mean_ratio,
+    'log': log,
+    'symlog': symlog,
+    'zscore': zscore,
+    'robust': robust,
+}
+
+
+def scale(values, method='minmax', **kwargs):
+    # scale(values, 'robust', low=-5, high=5, fill=0.0)
+    if method not in METHODS:
+        raise ValueError(f"Unknown scaling method: {method}")
+    return METHODS[method](values, **kwargs)
@@ -1,4 +1,10 @@
 import bpy
+import os
+import sys
+
+# helper modules live next to this file
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import keyframes
 
 bl_info = {
     "name": "Scatter Plot Generator",
@@ -63,10 +69,7 @@ class ScatterPlot(bpy.types.Operator):
             # set material to the sphere
             context.object.data.materials.append(mat)
             # scale items from 0 to 1 scale using keyframes 0 to 100
-            context.object.scale = (0, 0, 0)
-            context.object.keyframe_insert(data_path="scale", frame=0)
-            context.object.scale = (1, 1, 1)
-            context.object.keyframe_insert(data_path="scale", frame=100)
+            keyframes.animate(context.object, "scale", [0, 100], [(0, 0, 0), (1, 1, 1)])
         
         # place text on each point with the coordinates
         
@@ -0,0 +1,259 @@
+# columnar sidecar cache
+# the first load of a column parses just that column (and the others requested with it) and
+# writes it as a raw binary array under config['upload_dir']; later loads memory-map those
+# arrays instead of parsing text. Numbers are stored as int32 or float32, text as int32 codes
+
+import os
+import json
+import time
+import shutil
+import hashlib
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+import loader
+from config import config
+
+SIDECAR_VERSION = 2
+HASH_BLOCK_SIZE = 1024 * 1024
+INT32 = np.iinfo(np.int32)
+
+# (path, mtime, size) -> content hash, so an unchanged file is hashed once per session
+_hash_memo = {}
+
+
+def cache_root():
+    root = config['upload_dir']
+    if not os.path.isabs(root):
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), root)
+    return os.path.join(root, 'sidecar')
+
+
+def sidecar_dir(filepath, sheet=None, cell_range=None):
+    # one sidecar folder per source path (and xlsx sheet / range), its content hash lives in meta.json
+    name = hashlib.sha1(os.path.abspath(filepath).encode('utf-8')).hexdigest()[:16]
+    if sheet or cell_range:
+        name += "_" + hashlib.sha1(f"{sheet}!{cell_range}".encode('utf-8')).hexdigest()[:8]
+    return os.path.join(cache_root(), name)
+
+
+def content_hash(filepath):
+    stat = os.stat(filepath)
+    key = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+    if key not in _hash_memo:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(filepath, 'rb') as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        _hash_memo[key] = digest.hexdigest()
+    return _hash_memo[key]
+
+
+def read_meta(folder):
+    try:
+        with open(os.path.join(folder, 'meta.json'), 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def new_meta(filepath, digest, sheet=None, cell_range=None):
+    # column names come from the header alone, the columns themselves are written on demand
+    names = loader.read_header(filepath, sheet=sheet, cell_range=cell_range)
+    return {
+        'version': SIDECAR_VERSION,
+        'source': os.path.abspath(filepath),
+        'hash': digest,
+        'sheet': sheet,
+        'range': cell_range,
+        'rows': None,
+        'columns': [{'name': str(name), 'kind': None, 'dtype': None, 'file': f"col_{i}.bin", 'categories': []}
+                    for i, name in enumerate(names)],
+    }
+
+
+def write_meta(folder, meta):
+    # replaced in one step, a reader never sees a half written meta.json
+    path = os.path.join(folder, 'meta.json')
+    with open(path + '.tmp', 'w') as file:
+        json.dump(meta, file)
+    os.replace(path + '.tmp', path)
+
+
+def storage_dtype(whole, low, high):
+    # int32 for columns of whole numbers that fit, float32 for everything else
+    if whole and low is not None and INT32.min <= low and high <= INT32.max:
+        return 'int32'
+    return 'float32'
+
+
+def iter_build(filepath, folder, meta, indices):
+    # parse only the given columns of the file (usecols) and write each to its own raw array
+    # yields (rows, elapsed) after every chunk and updates meta in place
+    # numbers are first written as float64 while their range is tracked, then narrowed to the
+    # smallest storage dtype; text is stored as int32 codes into a file-wide category list
+    indices = sorted(indices)
+    outputs = {}
+    lookups = {i: {} for i in indices}                      # per text column: value -> code
+    ranges = {i: [True, None, None] for i in indices}       # per numeric column: whole, min, max
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for chunk in loader.iter_chunks(filepath, usecols=indices, sheet=meta['sheet'], cell_range=meta['range']):
+            for position, i in enumerate(indices):
+                column = meta['columns'][i]
+                values = chunk.iloc[:, position]
+                if column['kind'] is None:
+                    column['kind'] = 'float' if pd.api.types.is_numeric_dtype(values) else 'category'
+                    column['categories'] = []
+                    outputs[i] = open(os.path.join(folder, column['file'] + ('.tmp' if column['kind'] == 'float' else '')), 'wb')
+                if column['kind'] == 'float':
+                    array = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+                    tracked = ranges[i]
+                    if len(array):
+                        tracked[0] = tracked[0] and bool(np.isfinite(array).all() and np.array_equal(array, np.floor(array)))
+                        if tracked[0]:
+                            low, high = float(array.min()), float(array.max())
+                            tracked[1] = low if tracked[1] is None else min(tracked[1], low)
+                            tracked[2] = high if tracked[2] is None else max(tracked[2], high)
+                else:
+                    # factorize the chunk, then map its codes onto the file-wide categories
+                    codes, uniques = pd.factorize(values.astype(str))
+                    lookup = lookups[i]
+                    remap = np.empty(len(uniques), dtype=np.int32)
+                    for k, value in enumerate(uniques):
+                        if value not in lookup:
+                            lookup[value] = len(lookup)
+                            column['categories'].append(value)
+                        remap[k] = lookup[value]
+                    array = remap[codes]
+                array.tofile(outputs[i])
+
+            rows += len(chunk)
+            yield rows, time.perf_counter() - start
+    finally:
+        for output in outputs.values():
+            output.close()
+
+    for i in indices:
+        column = meta['columns'][i]
+        path = os.path.join(folder, column['file'])
+        if column['kind'] is None:
+            # no data rows: an empty numeric column
+            column['kind'] = 'float'
+            open(path + '.tmp', 'wb').close()
+        if column['kind'] == 'float':
+            column['dtype'] = storage_dtype(*ranges[i])
+            with open(path, 'wb') as output:
+                if rows:
+                    wide = np.memmap(path + '.tmp', dtype=np.float64, mode='r', shape=(rows,))
+                    for offset in range(0, rows, loader.CHUNK_ROWS):
+                        wide[offset:offset + loader.CHUNK_ROWS].astype(column['dtype']).tofile(output)
+                    del wide
+            os.remove(path + '.tmp')
+        else:
+            column['dtype'] = 'int32'
+    meta['rows'] = rows
+    write_meta(folder, meta)
+    return meta
+
+
+def open_column(folder, meta, index):
+    # zero-copy view of one stored column
+    column = meta['columns'][index]
+    path = os.path.join(folder, column['file'])
+    rows = meta['rows']
+    if column['kind'] == 'float':
+        if rows == 0:
+            return pd.Series(np.empty(0, dtype=column['dtype']), name=column['name'])
+        return pd.Series(np.memmap(path, dtype=column['dtype'], mode='r', shape=(rows,)), name=column['name'], copy=False)
+    if rows == 0:
+        codes = np.empty(0, dtype=np.int32)
+    else:
+        codes = np.memmap(path, dtype=np.int32, mode='r', shape=(rows,))
+    return pd.Series(pd.Categorical.from_codes(codes, column['categories']), name=column['name'])
+
+
+@contextmanager
+def build_lock(folder):
+    # exclusive lock on <folder>.lock next to the sidecar folder: several blender processes
+    # (batch render workers, an open session) may load the same dataset, one of them builds
+    # the missing columns while the others wait and then map what it wrote
+    os.makedirs(os.path.dirname(folder), exist_ok=True)
+    with open(folder + '.lock', 'a+b') as file:
+        if os.name == 'nt':
+            import msvcrt
+
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after 10 seconds, keep waiting
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def iter_ensure(filepath, columns=None, sheet=None, cell_range=None):
+    # (folder, meta) of an up to date sidecar holding at least the given positional columns
+    # (every column when None). Missing columns are parsed from the file, only those
+    folder = sidecar_dir(filepath, sheet, cell_range)
+    digest = content_hash(filepath)
+    with build_lock(folder):
+        meta = read_meta(folder)
+        if meta is None or meta.get('version') != SIDECAR_VERSION or meta.get('hash') != digest:
+            if os.path.isdir(folder):
+                shutil.rmtree(folder)
+            os.makedirs(folder)
+            meta = new_meta(filepath, digest, sheet, cell_range)
+            write_meta(folder, meta)
+        if columns is None:
+            columns = range(len(meta['columns']))
+        loader.check_columns(columns, meta['columns'])
+        missing = [i for i in set(columns) if meta['columns'][i]['dtype'] is None]
+        if missing:
+            meta = yield from iter_build(filepath, folder, meta, missing)
+    return folder, meta
+
+
+def ensure(filepath, progress=None, columns=None, sheet=None, cell_range=None):
+    return loader.drain(iter_ensure(filepath, columns, sheet, cell_range), progress)
+
+
+def iter_load_columns(filepath, columns, sheet=None, cell_range=None):
+    # same contract as loader.iter_stream_columns: yields progress, returns the frame
+    folder, meta = yield from iter_ensure(filepath, columns, sheet, cell_range)
+    unique = sorted(set(columns))
+    frame = pd.concat([open_column(folder, meta, i) for i in unique], axis=1, copy=False)
+    return frame.iloc[:, [unique.index(c) for c in columns]]
+
+
+def load_columns(filepath, columns, progress=None, sheet=None, cell_range=None):
+    return loader.drain(iter_load_columns(filepath, columns, sheet, cell_range), progress)
+
+
+def clear(filepath=None):
+    # drop the sidecars of one file (every sheet / range of it), or every sidecar
+    if not filepath:
+        if os.path.isdir(cache_root()):
+            shutil.rmtree(cache_root())
+        return
+    name = os.path.basename(sidecar_dir(filepath))
+    if not os.path.isdir(cache_root()):
+        return
+    for entry in os.listdir(cache_root()):
+        if entry == name or entry.startswith(name + "_"):
+            shutil.rmtree(os.path.join(cache_root(), entry))
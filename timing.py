@@ -0,0 +1,121 @@
+# build timing spans
+# a Trace collects (name, start, duration, depth) spans while a chart build runs. Builders call
+# phase("geometry") to end the previous phase and start the next, or wrap a block in span("load").
+# Nothing is recorded when no trace is active, so the calls cost almost nothing outside a build.
+
+import json
+import time
+from contextlib import contextmanager
+
+# trace receiving spans, set by traced() while a build step runs
+active = None
+
+
+class Trace:
+    ## Spans of one build, timed on a clock that stops while the build is paused between steps
+
+    def __init__(self, name):
+        self.name = name
+        self.spans = []  # (name, start, duration, depth), seconds from the start of the build
+        self.depth = 0
+        self.origin = time.perf_counter()
+        self.paused = 0.0
+        self.paused_at = None
+        self.open_phase = None
+
+    def now(self):
+        return time.perf_counter() - self.origin - self.paused
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = time.perf_counter()
+
+    def resume(self):
+        if self.paused_at is not None:
+            self.paused += time.perf_counter() - self.paused_at
+            self.paused_at = None
+
+    def start_phase(self, name):
+        self.end_phase()
+        self.open_phase = (name, self.now(), self.depth)
+        self.depth += 1
+
+    def end_phase(self):
+        if self.open_phase is None:
+            return
+        name, start, depth = self.open_phase
+        self.open_phase = None
+        self.depth -= 1
+        self.spans.append((name, start, self.now() - start, depth))
+
+
+def phase(name):
+    # end the running phase of the active build and start the next one
+    if active is not None:
+        active.start_phase(name)
+
+
+@contextmanager
+def span(name):
+    # time a block, nested under the running phase
+    trace = active
+    if trace is None:
+        yield
+        return
+    start = trace.now()
+    depth = trace.depth
+    trace.depth += 1
+    try:
+        yield
+    finally:
+        trace.depth -= 1
+        trace.spans.append((name, start, trace.now() - start, depth))
+
+
+def traced(trace, steps):
+    # pass the steps of a build generator through with trace active while each step runs
+    # the time between steps (other UI work in a modal build) is not counted
+    global active
+    trace.depth = 1
+    try:
+        while True:
+            previous = active
+            active = trace
+            trace.resume()
+            try:
+                step = next(steps)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                trace.pause()
+                active = previous
+            yield step
+    finally:
+        steps.close()
+        trace.resume()
+        trace.end_phase()
+        trace.depth = 0
+        trace.spans.append((trace.name, 0.0, trace.now(), 0))
+        trace.pause()
+
+
+def chrome_trace(spans, pid=1, tid=1):
+    # Chrome trace event format, open in chrome://tracing or ui.perfetto.dev
+    # spans: (name, start, duration, depth) in seconds
+    events = []
+    for name, start, duration, depth in spans:
+        events.append({
+            'name': name,
+            'ph': 'X',
+            'ts': start * 1e6,
+            'dur': duration * 1e6,
+            'pid': pid,
+            'tid': tid,
+            'args': {'depth': depth},
+        })
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(filepath, spans):
+    with open(filepath, 'w') as f:
+        json.dump(chrome_trace(spans), f, indent=1)
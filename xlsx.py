@@ -0,0 +1,127 @@
+# read-only xlsx reader
+# streams worksheet rows with openpyxl in read-only mode (no cell objects, no full DOM) and
+# turns every chunk of rows straight into one typed numpy array per column: int64 for whole
+# numbers, float64 for numbers with booleans or empty cells, object arrays of strings otherwise.
+# A sheet name and an A1 range ("B2:F5000", "C:D") pick what is read.
+
+import numpy as np
+
+CHUNK_ROWS = 100000
+
+
+def parse_range(cell_range):
+    # (min_col, min_row, max_col, max_row), 1-based, None where the range is open
+    if not cell_range:
+        return None, None, None, None
+    from openpyxl.utils import range_boundaries
+    return range_boundaries(cell_range.replace('$', '').upper())
+
+
+def typed_column(values):
+    # int64 when every cell is an integer, float64 when every cell is a number, bool or empty,
+    # else strings with None for empty cells
+    if values and all(type(v) is int for v in values):
+        try:
+            return np.fromiter(values, dtype=np.int64, count=len(values))
+        except OverflowError:
+            pass
+    try:
+        return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(values))
+    except (TypeError, ValueError):
+        return np.array([None if v is None else str(v) for v in values], dtype=object)
+
+
+def sheet_names(filepath):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(filepath, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def header_names(filepath, sheet=None, cell_range=None):
+    # the names in the first row of the selection, without reading the rows below it
+    import openpyxl
+
+    min_col, min_row, max_col, max_row = parse_range(cell_range)
+    workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        if cell_range is None:
+            worksheet.reset_dimensions()
+        first = next(worksheet.iter_rows(min_row=min_row, max_row=min_row, min_col=min_col, max_col=max_col, values_only=True), None)
+    finally:
+        workbook.close()
+    if first is None:
+        return []
+    return [str(value) if value is not None else f"Unnamed: {i}" for i, value in enumerate(first)]
+
+
+def iter_column_chunks(filepath, sheet=None, cell_range=None, usecols=None, chunksize=CHUNK_ROWS, header=True):
+    # yield (names, arrays) for every chunksize rows; the first row of the selection holds the
+    # column names when header is set. usecols are positions inside the selection
+    import openpyxl
+
+    min_col, min_row, max_col, max_row = parse_range(cell_range)
+    workbook = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        if cell_range is None:
+            # the stored dimensions of files written by other tools are often wrong
+            worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True)
+
+        first = next(rows, None)
+        if first is None:
+            return
+        width = len(first)
+        if header:
+            names = [str(first[i]) if i < width and first[i] is not None else f"Unnamed: {i}" for i in range(width)]
+        else:
+            names = [f"Column {i + 1}" for i in range(width)]
+            rows = prepend_row(first, rows)
+        if usecols is None:
+            usecols = range(width)
+        usecols = list(usecols)
+        names = [names[i] if i < len(names) else f"Unnamed: {i}" for i in usecols]
+
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunksize:
+                yield names, row_columns(buffer, usecols)
+                buffer = []
+        if buffer:
+            yield names, row_columns(buffer, usecols)
+    finally:
+        workbook.close()
+
+
+def prepend_row(first, rows):
+    yield first
+    yield from rows
+
+
+def row_columns(buffer, usecols):
+    # rows of a read-only sheet stop at their last filled cell, short rows read as empty
+    return [typed_column([row[i] if i < len(row) else None for row in buffer]) for i in usecols]
+
+
+def iter_frames(filepath, sheet=None, cell_range=None, usecols=None, chunksize=CHUNK_ROWS):
+    # the chunks as DataFrames, built from the typed arrays without inferring types again
+    import pandas as pd
+
+    for names, arrays in iter_column_chunks(filepath, sheet, cell_range, usecols, chunksize):
+        yield pd.DataFrame(dict(enumerate(arrays)), copy=False).set_axis(names, axis=1)
+
+
+def read_columns(filepath, sheet=None, cell_range=None, usecols=None):
+    # the whole selection as (names, arrays)
+    names, parts = None, []
+    for names, arrays in iter_column_chunks(filepath, sheet, cell_range, usecols):
+        parts.append(arrays)
+    if names is None:
+        return [], []
+    return names, [np.concatenate(column) if len(column) > 1 else column[0] for column in zip(*parts)]